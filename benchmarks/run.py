@@ -0,0 +1,275 @@
+"""
+Offline benchmark suite for faker-cn.
+
+    python benchmarks/run.py                                  # run all, print a table
+    python benchmarks/run.py -o results.json                  # also save machine-readable results
+    python benchmarks/run.py --baseline results.json --max-slowdown 0.15
+                                                              # exit 1 if any metric regressed >15%
+    python benchmarks/run.py --storage sqlite --baseline results.json
+                                                              # SQLite reference store vs in-memory run
+
+Throughput cases report the best of several rounds in a warm process. Loader and
+memory cases each run in a fresh interpreter, so class-level caches start empty.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    # Benchmark the working tree, not an installed copy
+    sys.path.insert(0, ROOT)
+
+LOADERS = (
+    "_load_areas", "_load_area_index", "_load_prov_table", "_load_phones",
+    "_load_postcodes", "_load_villages", "_load_enterprises",
+)
+
+# (job, employment) per workplace address branch of _generate_full_address, plus the home addresses
+ADDRESS_JOBS = {
+    "tech": ("软件工程师", "在职"),
+    "service": ("外卖骑手", "在职"),
+    "factory": ("普工", "在职"),
+    "education": ("中学老师", "在职"),
+    "medical": ("医生", "在职"),
+    "government": ("公务员", "在职"),
+    "freelance": ("自由撰稿人", "自由职业"),
+    "office": ("会计", "在职"),
+    "home_urban": (None, None),
+    "home_any": (None, None),
+}
+
+
+def _fake(seed: int = 0):
+    from faker import Faker
+    from faker_cn import PersonaProvider
+    fake = Faker("zh_CN")
+    fake.add_provider(PersonaProvider)
+    fake.seed_instance(seed)
+    return fake
+
+
+def _provider(fake):
+    from faker_cn import PersonaProvider
+    return next(p for p in fake.get_providers() if isinstance(p, PersonaProvider))
+
+
+def _throughput(fn, number: int, rounds: int) -> float:
+    fn()  # warm up: loaders, compiled projections
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return number / best
+
+
+def throughput_cases(want, scale: float, rounds: int):
+    fake = _fake()
+    provider = _provider(fake)
+    n = lambda base: max(1, int(base * scale))
+
+    if want("persona.unconstrained"):
+        yield "persona.unconstrained", _throughput(fake.persona, n(300), rounds)
+    if want("persona.constrained"):
+        yield "persona.constrained", _throughput(lambda: fake.persona(
+            hometown_province="四川", hometown_city="成都",
+            work_province="广东", work_city="深圳", has_second_phone=True,
+        ), n(300), rounds)
+    if want("persona.fields_ssn_name"):
+        yield "persona.fields_ssn_name", _throughput(lambda: fake.persona(fields=["ssn", "name"]), n(2000), rounds)
+    if want("strict_ssn"):
+        yield "strict_ssn", _throughput(fake.strict_ssn, n(5000), rounds)
+
+    index = provider._load_area_index()
+    villages = provider._load_villages()
+    areas = [(p, c, a) for p in index.provinces for c in index.children(p) for a in index.children(c)]
+    rng = provider.generator.random
+    for name, (job, employment) in ADDRESS_JOBS.items():
+        if not want(f"address.{name}"):
+            continue
+
+        def address(job=job, employment=employment, urban=(name == "home_urban")):
+            p, c, a = rng.choice(areas)
+            provider._generate_full_address(p, c, a, villages, f_urban=urban, job=job, employment=employment)
+        yield f"address.{name}", _throughput(address, n(3000), rounds)
+
+
+def _child(case: str, cache_dir: str) -> dict:
+    env = dict(os.environ, FAKER_CN_CACHE_DIR=cache_dir)
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", case],
+        env=env, check=True, stdout=subprocess.PIPE, universal_newlines=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def process_cases(want, rounds: int):
+    best = lambda case, cache: min(_child(case, cache)["seconds"] for _ in range(rounds))
+    with tempfile.TemporaryDirectory() as warm_dir:
+        for loader in LOADERS:
+            name = loader.lstrip("_")
+            # Cold: empty cache directory, so compiled stores are rebuilt; warm: reuses them
+            if want(f"{name}.cold"):
+                with tempfile.TemporaryDirectory() as cold_dir:
+                    yield f"{name}.cold", min(_child(f"load:{loader}", tempfile.mkdtemp(dir=cold_dir))["seconds"]
+                                              for _ in range(rounds))
+            if want(f"{name}.warm"):
+                _child(f"load:{loader}", warm_dir)
+                yield f"{name}.warm", best(f"load:{loader}", warm_dir)
+        if want("import.faker_cn"):
+            yield "import.faker_cn", best("import", warm_dir)
+        if want("first_persona"):
+            yield "first_persona", best("first_persona", warm_dir)
+        if want("memory.*"):
+            # Measure a process reusing compiled caches, not one building them
+            _child("first_persona", warm_dir)
+            mem = _child("memory", warm_dir)
+            yield "memory.tracemalloc_peak_mb", mem["tracemalloc_peak_mb"]
+            if mem.get("max_rss_mb") is not None:
+                yield "memory.max_rss_mb", mem["max_rss_mb"]
+
+
+def run_child(case: str) -> dict:
+    if case == "import":
+        start = time.perf_counter()
+        import faker_cn  # noqa: F401
+        return {"seconds": time.perf_counter() - start}
+
+    fake = _fake()
+    provider = _provider(fake)
+    if case.startswith("load:"):
+        loader = getattr(provider, case[len("load:"):])
+        start = time.perf_counter()
+        loader()
+        return {"seconds": time.perf_counter() - start}
+    if case == "first_persona":
+        start = time.perf_counter()
+        fake.persona()
+        return {"seconds": time.perf_counter() - start}
+    if case == "memory":
+        import tracemalloc
+        tracemalloc.start()
+        for loader in LOADERS:
+            getattr(provider, loader)()
+        fake.persona()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        try:
+            import resource
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # Kilobytes on Linux, bytes on macOS
+            rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+        except ImportError:
+            rss_mb = None
+        return {"tracemalloc_peak_mb": peak / (1024 * 1024), "max_rss_mb": rss_mb}
+    raise ValueError(f"Unknown child case {case!r}")
+
+
+def _unit(name: str) -> tuple:
+    # (unit, whether a larger value is better)
+    if name.startswith("memory."):
+        return "MB", False
+    if name.startswith(("load_", "import.", "first_")):
+        return "s", False
+    return "ops/s", True
+
+
+def run(only=None, scale: float = 1.0, rounds: int = 5, storage: str = "memory") -> dict:
+    results = {}
+
+    def want(name):
+        return not only or any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(pattern, name) for pattern in only)
+
+    for cases in (throughput_cases(want, scale, rounds), process_cases(want, max(1, rounds // 2))):
+        for name, value in cases:
+            unit, higher = _unit(name)
+            results[name] = {"value": value, "unit": unit, "higher_is_better": higher}
+            print(f"  {name:<36} {value:>14.4f} {unit}", file=sys.stderr)
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": numpy_version,
+            "scale": scale,
+            "rounds": rounds,
+            "storage": storage,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, max_slowdown: float) -> list:
+    """
+    (name, baseline, current, slowdown) for every metric present in both runs;
+    slowdown > 0 means worse, e.g. 0.25 = 25% slower (or larger, for memory).
+    """
+    rows = []
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base or not base["value"] or not cur["value"]:
+            continue
+        if cur["higher_is_better"]:
+            slowdown = base["value"] / cur["value"] - 1
+        else:
+            slowdown = cur["value"] / base["value"] - 1
+        rows.append((name, base["value"], cur["value"], slowdown, slowdown > max_slowdown))
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="faker-cn benchmarks")
+    parser.add_argument("-o", "--output", help="write results JSON to this path")
+    parser.add_argument("--baseline", help="compare against a results JSON from an earlier run")
+    parser.add_argument("--max-slowdown", type=float, default=0.2,
+                        help="fail when a metric is worse than the baseline by more than this fraction (default 0.2)")
+    parser.add_argument("--only", action="append", help="run only metrics matching this glob (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, for smoke runs")
+    parser.add_argument("--storage", choices=("memory", "sqlite"),
+                        help="reference data backend (sets FAKER_CN_STORAGE, default: memory)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_child(args.child)))
+        return 0
+
+    if args.storage:
+        # Inherited by the child processes too
+        os.environ["FAKER_CN_STORAGE"] = args.storage
+    storage = os.environ.get("FAKER_CN_STORAGE") or "memory"
+    results = run(args.only, scale=0.1 if args.quick else 1.0, rounds=2 if args.quick else 5, storage=storage)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline, args.max_slowdown)
+    for name, base, cur, slowdown, failed in rows:
+        flag = "  REGRESSION" if failed else ""
+        print(f"{name:<36} {base:>12.4f} -> {cur:>12.4f}  {slowdown:+7.1%}{flag}")
+    failed = [row[0] for row in rows if row[4]]
+    if failed:
+        print(f"{len(failed)} metric(s) regressed by more than {args.max_slowdown:.0%}: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
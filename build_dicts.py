@@ -46,8 +46,7 @@ def build_phones():
     # In python implementation, it reads from phone.dat.
     # To reverse map it: Province -> City -> List[prefix]
     
-    # We will iterate through 1300000 to 1999999 (approx valid mobile prefixes)
-    # This might take a minute, so we sample known prefixes to speed it up
+    # We iterate through the known mobile heads (13x-19x), all 10000 prefixes each
     print("Generating phones.json...")
     mapping = {}
     
@@ -63,33 +62,27 @@ def build_phones():
         "190","191","192","193","195","196","197","198","199"
     ]
     
-    from collections import defaultdict
-    # Structure: mapping[province][city] = [list of 7-digit prefixes]
-    # Fast approach: loop 0000 to 9999 for each head
-    
-    # To avoid huge computation, let's just create a sparse but realistic map
-    # mapping structure: { "北京": ["1301011", "1301012"...] }
-    # Let's take a subset that is "good enough" for Faker
-    
-    cities_count = 0
+    # Structure: mapping[province][city] = [[first, last], ...]
+    # Every 7-digit prefix is looked up, and runs of consecutive prefixes that belong to
+    # the same city are stored as one inclusive number segment. The provider also still
+    # accepts the older sparse format (a list of "1301011"-style strings).
     prefixes_found = 0
     
     for head in head_list:
-        for mid in range(0, 10000, 111): # step by 111 to get some sparse subset (e.g. 0000, 0111, 0222)
-            prefix = f"{head}{mid:04d}"
+        for mid in range(0, 10000):
+            prefix = int(f"{head}{mid:04d}")
             try:
-                info = p.find(prefix)
-                if info and 'province' in info and 'city' in info:
-                    prov = info['province']
-                    city = info['city']
-                    if prov not in mapping:
-                        mapping[prov] = {}
-                    if city not in mapping[prov]:
-                        mapping[prov][city] = []
-                    mapping[prov][city].append(prefix)
-                    prefixes_found += 1
-            except:
-                pass
+                info = p.find(str(prefix))
+            except Exception:
+                continue
+            if not info or 'province' not in info or 'city' not in info:
+                continue
+            segments = mapping.setdefault(info['province'], {}).setdefault(info['city'], [])
+            if segments and segments[-1][1] == prefix - 1:
+                segments[-1][1] = prefix
+            else:
+                segments.append([prefix, prefix])
+            prefixes_found += 1
                 
     phones_file = os.path.join(target_dir, "phones.json")
     with open(phones_file, "w", encoding='utf-8') as f:
@@ -1,12 +1,25 @@
 import json
 import os
 import random
+import sys
+import time
 from datetime import date, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from textwrap import dedent
 
 from faker.providers import BaseProvider
 
+from .area_index import AreaIndex
+from .cache import digest, load_pickled
+from .checksums import BANK_BINS, luhn_check_digit, ssn_check_char
+from .enterprise_index import EnterpriseIndex
+from .export import COLUMNS, SECOND_PHONE_COLUMNS
+from .jobs import JobCatalog, JobClassifier, JobProfile
+from .phone_index import PhoneIndex
+from .postcode_index import PostcodeIndex
+from .sampling import AliasCache, AliasTable, build_tables
+from . import checksums, ssn_batch
+
 
 class PersonaProvider(BaseProvider):
     """
@@ -14,17 +27,47 @@ class PersonaProvider(BaseProvider):
     """
     _enterprises_db = None
 
-    def _load_enterprises(self):
+    def __init__(self, generator):
+        super().__init__(generator)
+        # One generator per persona stream, re-seeded for every persona, see _persona()
+        self._stage_randoms = [random.Random() for _ in self._PERSONA_STREAMS]
+        # {(group, name): [calls, seconds]} while profiling, see enable_profiling()
+        self._profile = None
+
+    def _load_enterprises(self) -> Union[EnterpriseIndex, "EnterpriseStore"]:
         if self.__class__._enterprises_db is None:
+            from .enterprises import EnterpriseStore, default_path
+            store_path = default_path()
+            if os.path.exists(store_path):
+                # Indexed SQLite store from enterprises.build(); companies are read per pick.
+                # Queries are keyed by (in-scope) province code, so scoping needs no filtering
+                self.__class__._enterprises_db = EnterpriseStore(store_path)
+                return self.__class__._enterprises_db
+
             db_path = os.path.join(os.path.dirname(__file__), 'data', 'enterprises.json')
+            db = {"_giants": [], "_sme": {}}
             if os.path.exists(db_path):
                 with open(db_path, 'r', encoding='utf-8') as f:
-                    self.__class__._enterprises_db = json.load(f)
-            else:
-                self.__class__._enterprises_db = {"_giants": [], "_sme": {}}
+                    db = json.load(f)
+            # Bucketed over the (possibly scoped) area index, so out-of-scope provinces drop out
+            self.__class__._enterprises_db = EnterpriseIndex(db, self._load_area_index())
         return self.__class__._enterprises_db
 
+    # Province names restricting every loaded dataset, see scoped()
+    _scope = None
+    # Where the reference data lives, see with_storage(); None defers to FAKER_CN_STORAGE
+    _storage = None
+    _STORAGES = ("memory", "sqlite")
+    _derived_classes = {}
+    # Loaded datasets, reset on every class built by scoped() / with_storage()
+    _DATASET_CACHES = (
+        "_enterprises_db", "_areas_data", "_area_index", "_prov_table",
+        "_phones_data", "_postcodes_data", "_villages_data",
+    )
+
     _areas_data = None
+    _area_index = None
+    _prov_table = None
     _phones_data = None
     _postcodes_data = None
     _villages_data = None
@@ -44,6 +87,144 @@ class PersonaProvider(BaseProvider):
         "英": "ying", "华": "hua", "秀": "xiu", "珍": "zhen", "娟": "juan"
     }
 
+    # 7th Census: Province Population Weighting
+    _prov_weights = {
+        "广东": 8.93, "山东": 7.19, "河南": 7.04, "江苏": 6.00, "四川": 5.93,
+        "河北": 5.28, "湖南": 4.71, "浙江": 4.57, "安徽": 4.32, "湖北": 4.09,
+        "广西": 3.55, "云南": 3.34, "江西": 3.20, "辽宁": 3.02, "福建": 2.94,
+        "陕西": 2.80, "贵州": 2.73, "新疆": 1.83, "甘肃": 1.77, "上海": 1.76,
+        "吉林": 1.71, "内蒙古": 1.70, "北京": 1.55, "重庆": 2.27, "黑龙江": 2.26,
+        "山西": 2.47, "天津": 0.98, "海南": 0.71, "宁夏": 0.51, "青海": 0.42,
+        "西藏": 0.26
+    }
+
+    # Vehicle Plate prefix mapping
+    _plate_prefixes = {
+        "北京": "京", "天津": "津", "上海": "沪", "重庆": "渝", "河北": "冀",
+        "山西": "晋", "辽宁": "辽", "吉林": "吉", "黑龙江": "黑", "江苏": "苏",
+        "浙江": "浙", "安徽": "皖", "福建": "闽", "江西": "赣", "山东": "鲁",
+        "河南": "豫", "湖北": "鄂", "湖南": "湘", "广东": "粤", "海南": "琼",
+        "四川": "川", "贵州": "贵", "云南": "云", "陕西": "陕", "甘肃": "甘",
+        "青海": "青", "台湾": "台", "内蒙古": "蒙", "广西": "桂", "西藏": "藏",
+        "宁夏": "宁", "新疆": "新", "香港": "港", "澳门": "澳"
+    }
+
+    # Salary constraint based on Job (first matching row wins)
+    _job_salary_mapping = [
+        # High priority specific overrides
+        (["车间主任", "护理主任", "护士长", "大堂经理", "客服经理", "物业经理", "前台", "迎宾", "钟点工"], (4000, 15000)),
+        (["洗碗", "清洁", "搬运", "杂工", "收废品", "足疗", "推拿", "按摩", "泥瓦工", "钢筋工", "纺织", "细纱"], (3000, 8000)),
+        (["护士", "护理", "药剂师"], (4000, 15000)),
+        (["医生", "医师", "主任医师", "法医"], (8000, 45000)),
+        (["教师", "老师", "教授", "讲师", "教员", "助教", "教练"], (4000, 25000)),
+        (["工程师", "开发", "程序员", "技术", "IT", "设计"], (8000, 45000)),
+        (["架构师", "专家", "科学家", "研究员"], (20000, 80000)),
+        (["客服", "行政", "文员", "专员", "出纳", "助理", "人事"], (3500, 10000)),
+        (["销售", "业务", "代理", "市场", "公关", "媒介", "采购"], (4000, 30000)),
+        (["司机", "快递", "外卖", "配送", "骑手", "乘务", "船员"], (5000, 12000)),
+        (["厨师", "服务员", "营业员", "保安", "店员", "导购", "促销", "理发", "美容"], (3000, 8000)),
+        (["保洁", "家政", "保姆", "月嫂"], (3000, 9000)),
+        (["工人", "普工", "操作工", "钳工", "焊工", "木工", "电工", "水管工", "维修", "机修", "制造"], (4000, 10000)),
+        (["总监", "CEO", "CTO", "CFO", "总裁", "总经理", "副总", "行长"], (30000, 150000)),
+        (["经理", "主管", "主任", "领班", "组长", "厂长"], (8000, 35000)),
+        (["会计", "审计", "金融", "投资", "分析师", "顾问", "律师", "法务"], (8000, 40000)),
+        (["翻译", "编辑", "记者", "策划", "编导", "导演"], (6000, 25000)),
+        (["演员", "模特", "歌手", "主播", "摄影", "后期", "剪辑"], (5000, 30000)),
+        (["公务员", "干事", "书记", "局长", "科长", "处长", "警", "官", "军", "检察", "法官"], (5000, 18000)),
+        (["退休"], (2500, 10000)),
+        (["学生", "小学", "初中", "高中", "幼儿", "无"], (0, 0))
+    ]
+
+    _bank_bins = BANK_BINS
+
+    _temp_mail_configs = {
+        'yopmail.com': 'https://yopmail.com/zh/?',
+        'yopmail.net': 'https://yopmail.com/zh/?',
+        'cool.fr.nf': 'https://yopmail.com/zh/?',
+        'jetable.fr.nf': 'https://yopmail.com/zh/?'
+    }
+
+    _mbti_list = [
+        "INTJ", "INTP", "ENTJ", "ENTP", "INFJ", "INFP", "ENFJ", "ENFP",
+        "ISTJ", "ISFJ", "ESTJ", "ESFJ", "ISTP", "ISFP", "ESTP", "ESFP"
+    ]
+
+    # Precompiled alias tables: every categorical draw below is O(1)
+    # 7th Census: General Sex Ratio 105.07 (Male 51.24%, Female 48.76%)
+    _gender_table = AliasTable(['男', '女'], [51.24, 48.76])
+    # 7th Census: Age Pyramid -> 0-14: 17.95%, 15-59: 63.35%, 60+: 18.70%
+    _age_bucket_table = AliasTable([(1, 14), (15, 59), (60, 90)], [17.95, 63.35, 18.70])
+
+    _marital_tables = build_tables({
+        # ~60% un-married, ~39% married, ~1% divorced
+        "22-29": [("未婚", 60), ("已婚", 39), ("离异", 1)],
+        # High marriage rate, some divorce
+        "30-49": [("未婚", 15), ("已婚", 75), ("离异", 9), ("丧偶", 1)],
+        # Older cohorts
+        "50+": [("未婚", 5), ("已婚", 75), ("离异", 5), ("丧偶", 15)],
+    })
+
+    _education_tables = build_tables({
+        "16-18": [("高中", 60), ("中专", 40)],
+        # College years: highly weighted to Highschool/Vocational/Associates
+        "19-22": [("初中", 10), ("高中", 15), ("中专", 10), ("职业技能培训", 15), ("大专", 30), ("本科", 20)],
+        # Core working population. Parity: Below Highschool ~50%, Highschool/Voc ~20%, Assoc 15%, Bach 12%, Mas/PhD 3%
+        "23-59": [("初中", 50), ("高中", 10), ("中专", 10), ("职业技能培训", 5), ("大专", 15), ("本科", 10), ("硕士", 2), ("MBA", 1), ("博士", 0.5)],
+        "60+": [("初中", 70), ("高中", 15), ("大专", 10), ("本科", 4), ("硕士", 0.8), ("博士", 0.2)],
+    })
+
+    _employment_tables = build_tables({
+        # College years: some are learning, some are working.
+        "19-22": [("在职", 40), ("待业", 5), ("在读", 55)],
+        # Employment: Employed 70%, Free 15%, Unem 15% (including housewives, disabled, etc.)
+        "23-59": [("在职", 70), ("待业", 15), ("自由职业", 15)],
+        "60+": [("退休", 95), ("自由职业", 5)],
+    })
+
+    # Blood types in China: O~32%, A~28%, B~30%, AB~10%
+    _blood_table = AliasTable(["O", "A", "B", "AB"], [32, 28, 30, 10])
+
+    _os_tables = build_tables({
+        # High income: iOS highly popular, Harmony strong, Android less dominant
+        "high": [("iOS 17", 0.45), ("HarmonyOS 4", 0.35), ("macOS Sonoma", 0.1), ("Android 14", 0.1)],
+        # Middle income: Android leading, Harmony and iOS balanced
+        "middle": [("Android 14", 0.50), ("HarmonyOS 4", 0.25), ("iOS 17", 0.20), ("Windows 11", 0.05)],
+        # Low income / Students: Android dominant (~75%), some HarmonyOS/iOS
+        "low": [("Android 13", 0.45), ("Android 14", 0.30), ("HarmonyOS 3", 0.15), ("iOS 16", 0.08), ("Windows 10", 0.02)],
+    })
+
+    # Email providers keyed by (age band, job allows international services)
+    _email_tables = build_tables({
+        # Young/Student: Extreme QQ dominance (approx 80%), some 163 (15%)
+        ("<25", True): [("qq.com", 0.80), ("163.com", 0.15), ("outlook.com", 0.04), ("gmail.com", 0.01)],
+        ("<25", False): [("qq.com", 0.80), ("163.com", 0.15), ("outlook.com", 0.04), ("126.com", 0.01)],
+        # Working age: Mixed. QQ heavily popular but 163/126 catches up for work.
+        ("<45", True): [("qq.com", 0.50), ("163.com", 0.35), ("126.com", 0.05), ("foxmail.com", 0.05), ("outlook.com", 0.03), ("gmail.com", 0.02)],
+        ("<45", False): [("qq.com", 0.50), ("163.com", 0.35), ("126.com", 0.05), ("foxmail.com", 0.05), ("outlook.com", 0.03), ("yeah.net", 0.02)],
+        # Older: 163, qq dominant
+        ("45+", True): [("163.com", 0.45), ("qq.com", 0.40), ("sina.com", 0.10), ("126.com", 0.03), ("hotmail.com", 0.02)],
+        ("45+", False): [("163.com", 0.45), ("qq.com", 0.40), ("sina.com", 0.10), ("126.com", 0.03), ("hotmail.com", 0.02)],
+    })
+
+    @staticmethod
+    def _ethnicity_weights(p_n: str):
+        # Geo-aware ethnicity distribution for a province
+        e_weights = {"汉族": 91}
+        if "西藏" in p_n: e_weights["藏族"] = 50
+        elif "新疆" in p_n: e_weights["维吾尔族"] = 45; e_weights["哈萨克族"] = 5
+        elif "内蒙古" in p_n: e_weights["蒙古族"] = 20
+        elif "宁夏" in p_n: e_weights["回族"] = 30
+        elif "广西" in p_n: e_weights["壮族"] = 35
+        elif "云南" in p_n: e_weights["傣族"] = 10; e_weights["彝族"] = 10; e_weights["白族"] = 5
+        elif "吉林" in p_n or "辽宁" in p_n: e_weights["满族"] = 15; e_weights["朝鲜族"] = 5
+
+        others = ["苗族", "回族", "土家族", "彝族", "满族", "壮族", "布依族"]
+        for o in others:
+            if o not in e_weights: e_weights[o] = 1
+        return list(e_weights.keys()), list(e_weights.values())
+
+    _ethnicity_tables = AliasCache(_ethnicity_weights.__func__)
+
     def _filter_by_fields(self, data: dict, fields: list) -> dict:
         """
         根据用户指定的 fields 列表过滤生成的画像字典，支持诸如 'hometown.postcode' 等嵌套路径。
@@ -76,55 +257,188 @@ class PersonaProvider(BaseProvider):
     @classmethod
     def _load_areas(cls) -> List[Dict]:
         if cls._areas_data is None:
-            path = os.path.join(os.path.dirname(__file__), 'areas.json')
-            with open(path, 'r', encoding='utf-8') as f:
-                cls._areas_data = json.load(f)
+            # The province list is the root of the (pickled) area index
+            cls._areas_data = cls._load_area_index().provinces
         return cls._areas_data
 
     @classmethod
-    def _load_phones(cls) -> Dict:
+    def _data_key(cls, path: str, index_cls: type, *extra) -> str:
+        # A compiled index depends on its data file, the indexing code and the scope
+        return digest(path, sys.modules[index_cls.__module__].__file__, cls._scope, *extra)
+
+    @classmethod
+    def _read_areas(cls, path: str) -> List[Dict]:
+        with open(path, 'r', encoding='utf-8') as f:
+            areas = json.load(f)
+        if cls._scope:
+            areas = AreaIndex.select(areas, cls._scope)
+            if not areas:
+                raise ValueError(f"No province matches scope {cls._scope!r}")
+        return areas
+
+    @classmethod
+    def _reference_store(cls):
+        """
+        The SQLite reference store in "sqlite" storage mode, else None.
+        """
+        storage = cls._storage or os.environ.get("FAKER_CN_STORAGE") or "memory"
+        if storage not in cls._STORAGES:
+            raise ValueError(f"Unknown storage {storage!r}, expected one of {cls._STORAGES}")
+        if storage != "sqlite":
+            return None
+        from .reference_store import open_store
+        return open_store()
+
+    @classmethod
+    def _load_area_index(cls) -> AreaIndex:
+        if cls._area_index is None:
+            store = cls._reference_store()
+            if store is not None:
+                cls._area_index = store.areas(cls._scope)
+                return cls._area_index
+            path = os.path.join(os.path.dirname(__file__), 'areas.json')
+            cls._area_index = load_pickled(
+                "areas", cls._data_key(path, AreaIndex), lambda: AreaIndex(cls._read_areas(path))
+            )
+        return cls._area_index
+
+    @classmethod
+    def _load_prov_table(cls) -> AliasTable:
+        if cls._prov_table is None:
+            index = cls._load_area_index()
+            cls._prov_table = AliasTable(index.provinces, index.province_weights(cls._prov_weights))
+        return cls._prov_table
+
+    @classmethod
+    def _load_phones(cls) -> PhoneIndex:
         if cls._phones_data is None:
+            store = cls._reference_store()
+            if store is not None:
+                cls._phones_data = store.phones()
+                return cls._phones_data
             path = os.path.join(os.path.dirname(__file__), 'phones.json')
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    cls._phones_data = json.load(f)
-            except FileNotFoundError:
-                cls._phones_data = {}
+
+            def build():
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        raw_data = json.load(f)
+                except FileNotFoundError:
+                    raw_data = {}
+                # Resolved per city / province code of the (possibly scoped) tree
+                return PhoneIndex(raw_data, cls._load_area_index())
+
+            areas_path = os.path.join(os.path.dirname(__file__), 'areas.json')
+            cls._phones_data = load_pickled("phones", cls._data_key(path, PhoneIndex, digest(areas_path)), build)
         return cls._phones_data
 
     @classmethod
-    def _load_postcodes(cls):
+    def _load_postcodes(cls) -> PostcodeIndex:
         if cls._postcodes_data is None:
-            import os, json
+            store = cls._reference_store()
+            if store is not None:
+                cls._postcodes_data = store.postcodes()
+                return cls._postcodes_data
             path = os.path.join(os.path.dirname(__file__), "postcodes.json")
-            if os.path.exists(path):
-                with open(path, "r", encoding="utf-8") as f:
-                    raw_data = json.load(f)
-                index = {}
-                for pc, addr in raw_data.items():
-                    index[addr] = pc
-                cls._postcodes_data = index
-            else:
-                cls._postcodes_data = {}
+
+            def build():
+                raw_data = {}
+                if os.path.exists(path):
+                    with open(path, "r", encoding="utf-8") as f:
+                        raw_data = json.load(f)
+                # Resolved per area code of the (possibly scoped) tree; raw_data is dropped
+                return PostcodeIndex(raw_data, cls._load_area_index())
+
+            areas_path = os.path.join(os.path.dirname(__file__), 'areas.json')
+            cls._postcodes_data = load_pickled(
+                "postcodes", cls._data_key(path, PostcodeIndex, digest(areas_path)), build
+            )
         return cls._postcodes_data
 
     @classmethod
-    def _load_villages(cls) -> Dict:
+    def _load_villages(cls):
         if cls._villages_data is None:
-            import gzip
+            # Memory-mapped store compiled once from villages.json.gz; lookups decode one town
+            from .villages import VillageStore, encode_villages, load_store
             path = os.path.join(os.path.dirname(__file__), 'villages.json.gz')
             try:
-                with gzip.open(path, 'rt', encoding='utf-8') as f:
-                    cls._villages_data = json.load(f)
+                store = cls._reference_store()
+                store = store.villages() if store is not None else load_store(path)
+                if cls._scope:
+                    store = store.restrict(p['code'] for p in cls._load_areas())
+                cls._villages_data = store
             except FileNotFoundError:
-                cls._villages_data = {}
+                cls._villages_data = VillageStore(encode_villages({}))
         return cls._villages_data
 
+    @classmethod
+    def scoped(cls, provinces: List[str]) -> type:
+        """
+        Build a provider class restricted to `provinces` (e.g. ["广东", "浙江省", "沪"]).
+        Only those subtrees and their postcode, phone, village and enterprise entries are
+        loaded and indexed, and every unconstrained draw stays inside them.
+        Usage: fake.add_provider(PersonaProvider.scoped(provinces=["广东", "浙江"]))
+        """
+        names = tuple(provinces)
+        if not names:
+            raise ValueError("scoped() needs at least one province")
+        return cls._derive(f"Scoped{cls.__name__}", _scope=names)
+
+    @classmethod
+    def with_storage(cls, storage: str) -> type:
+        """
+        Build a provider class keeping its reference data in `storage`: "memory" (the
+        default, indexes held per process) or "sqlite" (one read-only file compiled into
+        the cache directory and queried on demand, for many processes per host).
+        The FAKER_CN_STORAGE environment variable sets the default for every class.
+        Usage: fake.add_provider(PersonaProvider.with_storage("sqlite"))
+        """
+        if storage not in cls._STORAGES:
+            raise ValueError(f"Unknown storage {storage!r}, expected one of {cls._STORAGES}")
+        return cls._derive(f"{storage.capitalize()}{cls.__name__}", _storage=storage)
+
+    @classmethod
+    def _derive(cls, name: str, **attrs) -> type:
+        key = (cls, tuple(sorted(attrs.items())))
+        if key not in cls._derived_classes:
+            cls._derived_classes[key] = type(name, (cls,), {**dict.fromkeys(cls._DATASET_CACHES), **attrs})
+        return cls._derived_classes[key]
+
     def _ssn_checksum(self, s):
-        weight = [7, 9, 10, 5, 8, 4, 2, 1, 6, 3, 7, 9, 10, 5, 8, 4, 2]
-        check_code = ['1', '0', 'X', '9', '8', '7', '6', '5', '4', '3', '2']
-        sum_val = sum(int(s[i]) * weight[i] for i in range(17))
-        return check_code[sum_val % 11]
+        return ssn_check_char(s)
+
+    def _persona_plan(self, hometown_province: Optional[str] = None, work_province: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Resolve the constraint-dependent candidate lists once, so that a batch of
+        personas sharing the same constraints does not rebuild them on every call.
+        """
+        index = self._load_area_index()
+        areas = index.provinces
+        if hometown_province:
+            prov_list = index.match_provinces(hometown_province) or areas
+            prov_table = None
+        else:
+            prov_list = areas
+            prov_table = self._load_prov_table()
+
+        return {
+            "index": index,
+            "prov_list": prov_list,
+            "prov_table": prov_table,
+            "work_prov_list": index.match_provinces(work_province) if work_province else areas,
+            "t1_prov_list": index.match_any_provinces(("北京", "上海", "广东", "江苏", "浙江")) or areas,
+            "edu_prov_list": index.match_any_provinces(("湖北", "江苏", "四川", "陕西", "广东", "山东", "辽宁")) or areas,
+        }
+
+    def _pick_province(self, plan: Dict[str, Any]) -> Dict:
+        if plan["prov_table"] is None:
+            return self.random_element(plan["prov_list"])
+        return plan["prov_table"].sample(self.generator.random)
+
+    def _plate_prefix_for(self, p_name: str) -> str:
+        for k, v in self._plate_prefixes.items():
+            if k in p_name:
+                return v
+        return "京"
 
     def strict_ssn(
         self,
@@ -147,43 +461,110 @@ class PersonaProvider(BaseProvider):
         Returns:
             A mathematically correct 18-digit string matching the requested constraints.
         """
-        areas = self._load_areas()
+        plan = self._persona_plan(hometown_province=hometown_province)
+        return self._strict_ssn(plan, hometown_city, hometown_area, gender, birth_date, age_range)
 
-        # 1. Resolve Geography (First 6 digits)
-        prov_list = areas
-        if hometown_province:
-            filtered = [p for p in prov_list if hometown_province in p['name']]
-            prov_list = filtered if filtered else prov_list
-            prov_data = self.random_element(prov_list)
+    def strict_ssn_batch(
+        self,
+        n: int,
+        hometown_province: Optional[str] = None,
+        hometown_city: Optional[str] = None,
+        hometown_area: Optional[str] = None,
+        gender: Optional[str] = None,
+        birth_date: Optional[date] = None,
+        age_range: Optional[tuple] = None,
+        as_array: bool = False
+    ):
+        """
+        Generate `n` strictly valid 18-digit ID numbers with the same constraints and
+        distributions as `strict_ssn()`.
+        With numpy installed (pip install faker-cn[fast]) every digit column and the
+        Mod 11-2 check digit are computed as arrays; otherwise it falls back to a loop
+        over `strict_ssn()` sharing one constraint plan.
+        Parameters:
+            n: Number of ID numbers.
+            as_array: (Optional) Return a numpy str array instead of a list (numpy only).
+            Other parameters: see `strict_ssn()`.
+        Returns:
+            A list (or numpy array) of `n` 18-digit strings.
+        """
+        plan = self._persona_plan(hometown_province=hometown_province)
+        if not ssn_batch.available():
+            if as_array:
+                raise ImportError("strict_ssn_batch(as_array=True) requires numpy")
+            return [self._strict_ssn(plan, hometown_city, hometown_area, gender, birth_date, age_range) for _ in range(n)]
+
+        area_codes, area_probs = ssn_batch.area_distribution(plan, hometown_city, hometown_area)
+        if age_range and len(age_range) == 2:
+            age_buckets, age_probs = [tuple(age_range)], [1.0]
         else:
-            # Reusing the existing population weights for demographic parity fallback
-            prov_weights_dict = {
-                "广东": 8.93, "山东": 7.19, "河南": 7.04, "江苏": 6.00, "四川": 5.93,
-                "河北": 5.28, "湖南": 4.71, "浙江": 4.57, "安徽": 4.32, "湖北": 4.09,
-                "广西": 3.55, "云南": 3.34, "江西": 3.20, "辽宁": 3.02, "福建": 2.94,
-                "陕西": 2.80, "贵州": 2.73, "新疆": 1.83, "甘肃": 1.77, "上海": 1.76,
-                "吉林": 1.71, "内蒙古": 1.70, "北京": 1.55, "重庆": 2.27, "黑龙江": 2.26,
-                "山西": 2.47, "天津": 0.98, "海南": 0.71, "宁夏": 0.51, "青海": 0.42,
-                "西藏": 0.26
-            }
-            w_list = [prov_weights_dict.get(p['name'].replace("省", "").replace("市", "").replace("自治区", "").replace("壮族", "").replace("回族", "").replace("维吾尔", ""), 1.0) for p in prov_list]
-            prov_data = random.choices(prov_list, weights=w_list, k=1)[0]
+            age_buckets, age_probs = self._age_bucket_table.items, self._age_bucket_table.weights
+        if gender in ['男', 'M']:
+            male_prob = 1.0
+        elif gender in ['女', 'F']:
+            male_prob = 0.0
+        else:
+            weights = dict(zip(self._gender_table.items, self._gender_table.weights))
+            male_prob = weights['男'] / sum(weights.values())
+
+        ids = ssn_batch.generate(
+            self.generator.random.getrandbits(64), n, area_codes, area_probs,
+            age_buckets, age_probs, male_prob, birth_date=birth_date
+        )
+        return ids if as_array else ids.tolist()
+
+    def _batch_rng(self):
+        # numpy Generator seeded from the instance stream, or the instance Random itself
+        np = checksums.numpy()
+        if np is None:
+            return self.generator.random
+        return np.random.default_rng(self.generator.random.getrandbits(64))
+
+    def bank_cards(self, n: int, bank: Optional[str] = None) -> List[str]:
+        """
+        Generate `n` Luhn-valid 19-digit debit card numbers.
+        Parameters:
+            bank: (Optional) Issuing bank, e.g. '中国工商银行' or '工商'. Any catalog bank if omitted.
+        Returns:
+            A list of card number strings. Check digits are computed array-wise when numpy is installed.
+        """
+        if bank:
+            names = [b for b in BANK_BINS if bank in b]
+            if not names:
+                raise ValueError(f"Unknown bank {bank!r}, expected one of {list(BANK_BINS)}")
+        else:
+            names = list(BANK_BINS)
+        bins = [b for name in names for b in BANK_BINS[name]]
+        return checksums.bank_cards(self._batch_rng(), n, bins)
+
+    def uscc_codes(self, n: int, province: Optional[str] = None) -> List[str]:
+        """
+        Generate `n` GB 32100 valid unified social credit codes (统一社会信用代码).
+        Parameters:
+            province: (Optional) Registration province; the 6-digit area segment is drawn
+                      from its counties, weighted like strict_ssn().
+        Returns:
+            A list of 18-character codes. Check characters are computed array-wise when numpy is installed.
+        """
+        plan = self._persona_plan(hometown_province=province)
+        area_codes, area_probs = ssn_batch.area_distribution(plan)
+        return checksums.uscc_codes(self._batch_rng(), n, [f"{c:06d}" for c in area_codes], area_probs)
 
-        city_list = prov_data.get('children', [])
-        if not city_list: city_list = [prov_data]
+    def _strict_ssn(self, plan, hometown_city=None, hometown_area=None, gender=None, birth_date=None, age_range=None) -> str:
+        # 1. Resolve Geography (First 6 digits)
+        # Reusing the existing population weights for demographic parity fallback
+        index = plan["index"]
+        prov_data = self._pick_province(plan)
 
+        city_list = index.children(prov_data)
         if hometown_city:
-            filtered = [c for c in city_list if hometown_city in c['name']]
-            if filtered: city_list = filtered
+            city_list = index.match_children(prov_data, hometown_city) or city_list
         city_data = self.random_element(city_list)
 
-        area_list = city_data.get('children', [])
-        if not area_list: area_list = [city_data]
-            
+        area_list = index.children(city_data)
         if hometown_area:
-            filtered = [a for a in area_list if hometown_area in a['name']]
-            if filtered: area_list = filtered
-        
+            area_list = index.match_children(city_data, hometown_area) or area_list
+
         area_data = self.random_element(area_list)
         area_code = area_data.get('code', '110101') # Absolute fallback constraint
 
@@ -193,17 +574,14 @@ class PersonaProvider(BaseProvider):
         else:
             if not age_range or len(age_range) != 2:
                 # Same demographic pyramid fallback
-                age_bucket = random.choices(["0-14", "15-59", "60-90"], weights=[17.95, 63.35, 18.70], k=1)[0]
-                if age_bucket == "0-14": age_range = (1, 14)
-                elif age_bucket == "15-59": age_range = (15, 59)
-                else: age_range = (60, 90)
+                age_range = self._age_bucket_table.sample(self.generator.random)
             b_date = self._random_date_between(age_range[0], age_range[1])
             
         date_str = b_date.strftime('%Y%m%d')
 
         # 3. Resolve Gender (17th digit)
         if gender not in ['男', '女', 'M', 'F']:
-            gender_val = random.choices(['男', '女'], weights=[51.24, 48.76], k=1)[0]
+            gender_val = self._gender_table.sample(self.generator.random)
         else:
             gender_val = '男' if gender in ['男', 'M'] else '女'
             
@@ -227,17 +605,12 @@ class PersonaProvider(BaseProvider):
     def _generate_full_address(self, p_data, c_data, a_data, villages, f_urban=False, job=None, employment=None):
         # 7th Census: Urban vs Rural
         # Target: Urban 63.89%, Rural 36.11%
-        is_u = random.random() < 0.6389
+        is_u = self.generator.random.random() < 0.6389
         if f_urban: is_u = True
         
-        t_list = a_data.get('children', [])
-        
-        urban_t = []
-        rural_t = []
+        t_list = self._load_area_index().towns(a_data)
         if t_list:
-            urban_t = [t for t in t_list if any(kw in t['name'] for kw in ["街道", "区", "镇", "开发区"])]
-            rural_t = [t for t in t_list if any(kw in t['name'] for kw in ["乡", "村", "林场", "农场"])]
-            
+            urban_t, rural_t = self._load_area_index().town_split(a_data)
             if is_u and urban_t:
                 t_list = urban_t
             elif not is_u and rural_t:
@@ -249,12 +622,11 @@ class PersonaProvider(BaseProvider):
             t_obj = self.random_element(t_list)
             t_n, t_c = t_obj['name'], t_obj.get('code', '')
 
-        # Town-level villages logic
-        v_list = villages.get(t_c, []) if t_c else []
         if job is not None:
             # Generate Workplace specific address
-            job_v = str(job)
-            if any(kw in job_v for kw in ["总", "高管", "CEO", "CTO", "CFO", "总裁", "主任", "架构师", "专家", "研究员", "科学家", "开发", "程序员", "IT", "互联网", "软件", "系统"]):
+            profile = self._job_profile(job)
+            style = profile.address
+            if style == "tech":
                 suffix = self.random_element(["大厦", "国际中心", "科技园", "广场", "中心", "软件园", "CBD", "创新中心"])
                 c_name = self.random_element(["星河", "腾讯", "阿里", "百度", "字节", "华为", "小米", "美团", "京东", "网易", "新浪", "天猫", "搜狐", "360", "金山", "滴滴", "平安", "万达", "绿地", "保利", "恒大", "融创", "富力", "华润", "中海", "招商", "万科", "金地", "龙湖", "绿城", "世茂", "新城", "阳光城", "佳兆业", "中南", "阳光", "时代", "世纪", "国际", "理想", "滨江", "华府", "环球", "财富", "金融", "世贸", "国贸"])
                 if c_name not in suffix and suffix not in c_name: b_estate = f"{c_name}{suffix}"
@@ -269,9 +641,9 @@ class PersonaProvider(BaseProvider):
 
                 if self.random_int(0, 1) > 0: full_street = f"{final_t_n}{r_name}{self.random_int(1,500)}号{b_estate}{self.random_int(1,50)}层"
                 else: full_street = f"{final_t_n}{b_estate}{self.random_int(1,60)}楼{self.random_int(1,30)}0{self.random_int(1,9)}室"
-            elif any(kw in job_v for kw in ["司机", "快递", "外卖", "配送", "厨师", "服务员", "营业员", "保安", "保洁", "家政", "保姆", "销售", "业务", "店员", "前台", "客服", "收银"]):
+            elif style == "service":
                 # Distinguish a bit between pure sales and food service
-                if "销售" in job_v or "业务" in job_v:
+                if profile.sales:
                     suffix = self.random_element(["服务中心", "大卖场", "专卖店", "门店", "营业厅", "门店", "广场", "时代广场"])
                 else:
                     suffix = self.random_element(["商业街", "步行街", "购物中心", "百货", "广场", "商场", "超市", "连锁店", "餐饮", "酒店", "宾馆", "饭店", "餐馆", "快餐", "小吃", "面馆"])
@@ -283,20 +655,20 @@ class PersonaProvider(BaseProvider):
                 b_estate = f"{c_name}{suffix}"
                 r_name = self.random_element(["朝阳", "建设", "胜利", "解放", "中山", "人民", "新华", "和平", "文化", "青年", "红星", "光明", "幸福", "团结", "前进", "东风", "红旗", "五一", "八一", "长安", "北京", "南京", "广州", "上海", "商业", "步行", "小吃", "美食", "女人", "古玩", "花鸟", "电子"]) + self.random_element(["路", "街", "巷", "弄", "道"])
                 full_street = f"{t_n}{r_name}{self.random_int(1,500)}号{b_estate}"
-            elif any(kw in job_v for kw in ["工人", "厂", "制造", "生产", "流水线", "车间", "装配", "普工", "质检", "维修", "机修", "电工", "焊工", "钳工"]):
+            elif style == "factory":
                 suffix = self.random_element(["工业园", "制造厂", "加工厂", "机械厂", "服装厂", "电子厂", "塑料厂", "模具厂", "食品厂", "鞋厂", "玩具厂", "五金厂", "家具厂", "化工厂", "印刷厂", "纸箱厂", "包材厂", "纺织厂", "钢铁厂", "水泥厂", "砖厂"])
                 c_name = self.random_element(["富士康", "立讯", "比亚迪", "长城", "美的", "格力", "海尔", "海信", "TCL", "创维", "康佳", "长虹", "老板", "方太", "苏泊尔", "九阳", "华帝", "万和", "宏观", "格兰仕", "红牛", "康师傅", "统一", "娃哈哈", "农夫山泉"])
                 b_estate = f"{c_name}{suffix}"
                 r_name = self.random_element(["工业", "振兴", "创业", "发展", "腾飞", "开拓", "创新", "科技", "高新", "开发", "新村", "红星", "向阳", "东方", "迎宾", "世纪", "时代", "阳光", "星火", "火炬", "滨海", "沿海", "港口"]) + self.random_element(["路", "街", "大道", "园区", "二路", "三路"])
                 if self.random_int(0, 1) > 0: full_street = f"{t_n}{r_name}{self.random_int(1,500)}号{b_estate}{self.random_int(1,5)}车间"
                 else: full_street = f"{t_n}{b_estate}{self.random_int(1,10)}号厂房"
-            elif any(kw in job_v for kw in ["学校", "老师", "教授", "讲师", "教育", "培训"]):
+            elif style == "education":
                 suffix = self.random_element(["大学", "学院", "中学", "小学", "幼儿园", "培训中心", "教育机构", "重点高级中学", "职业技术学院"])
                 c_name = self.random_element(["第一", "第二", "第三", "第四", "第五", "实验", "外国语", "师范", "理工", "科技", "工商", "财经", "政法", "艺术", "体育", "医科", "农业", "林业", "联合", "交通", "星火"])
                 b_estate = f"{c_name}{suffix}"
                 r_name = self.random_element(["学院", "学府", "大学", "科教", "育才", "文化"]) + self.random_element(["路", "街"])
                 full_street = f"{t_n}{r_name}{self.random_int(1,200)}号{b_estate}"
-            elif any(kw in job_v for kw in ["医院", "医生", "护士", "医疗", "卫生", "保健"]):
+            elif style == "medical":
                 suffix = self.random_element(["人民医院", "中心医院", "妇幼保健院", "中医院", "附属医院", "协和医院", "第一医院", "第二医院", "骨科医院", "眼科医院", "口腔医院", "卫生院", "社区卫生服务中心", "仁爱医院", "博爱医院", "康复医院"])
                 if "中心医院" in suffix or "卫生院" in suffix or "服务中心" in suffix: b_estate = f"{a_data['name']}{suffix}"
                 elif "社区" in suffix: b_estate = f"{t_n}{suffix}"
@@ -315,7 +687,7 @@ class PersonaProvider(BaseProvider):
                         b_estate = f"{c_name}{b_estate}"
                     r_name = self.random_element(["朝阳", "建设", "中山", "人民", "新华", "创业", "创新"]) + self.random_element(["路", "街"])
                     full_street = f"{t_n}{r_name}{self.random_int(1,200)}号{b_estate}"
-                elif any(kw in job_v for kw in ["公务员", "行政", "局", "委", "办", "政府", "事业", "书记"]):
+                elif style == "government":
                     b_estate = self.random_element(["人民政府", "教育局", "公安局", "税务局", "工商局", "建设局", "环保局", "文化局", "卫健委", "发改委", "民政局", "财政局", "居委会", "街道办事处", "派出所", "法院", "检察院", "交警大队", "消防大队"])
                     if any(kw in b_estate for kw in ["局", "委", "政府", "处", "所", "院", "大队"]): b_estate = f"{c_data['name']}{a_data['name']}{b_estate}"
                     r_name = self.random_element(["朝阳", "建设", "胜利", "解放", "中山", "人民", "新华", "政法", "府前", "民主"]) + self.random_element(["路", "街", "大道"])
@@ -328,14 +700,12 @@ class PersonaProvider(BaseProvider):
                     r_name = self.random_element(["北京", "南京", "中山", "解放", "建国", "复兴", "和平", "新华", "人民"]) + self.random_element(["路", "街", "大道"])
                     full_street = f"{t_n}{r_name}{self.random_int(1,200)}号{b_estate}{self.random_int(1,30)}层{self.random_int(1,20)}0{self.random_int(1,9)}室"
         else:
+            # Town-level villages, cleaned when the village store was compiled
             if is_u:
                 b_estate = ""
-                if v_list:
-                    u_vp = [v for v in v_list if any(kw in v for kw in ["社区", "居委会"])]
-                    if not u_vp: u_vp = v_list
-                    b_estate = self.random_element(u_vp)
-                    for s in ["居民委员会", "社区居委会", "居委会", "社区", "村民委员会", "村委会"]:
-                        b_estate = b_estate.replace(s, "")
+                estates = villages.estates(t_c) if t_c else []
+                if estates:
+                    b_estate = self.random_element(estates)
                 if not b_estate or len(b_estate) < 2:
                     b_estate = self.random_element(["阳光", "时代", "世纪", "国际", "理想", "中心", "滨江", "华府", "万科", "金地"])
                 e_suffix = self.random_element(["小区", "花园", "苑", "家园", "新村", "府"])
@@ -344,31 +714,15 @@ class PersonaProvider(BaseProvider):
                 full_street = f"{t_n}{r_name}{e_name}{self.random_int(1,50)}号楼{self.random_int(1,5)}单元{self.random_int(1,30)}0{self.random_int(1,4)}室"
             else:
                 v_name = ""
-                if v_list:
-                    r_vp = [v.replace("村民委员会", "").replace("村委会", "").replace("居委会", "") for v in v_list]
-                    v_name = self.random_element(r_vp)
-                    if v_name and not any(v_name.endswith(s) for s in ["村", "庄", "队"]): v_name += "村"
+                rural = villages.rural(t_c) if t_c else []
+                if rural:
+                    v_name = self.random_element(rural)
                 if not v_name:
                     v_name = f"{self.random_element(['张家', '李家', '王家', '赵家', '大', '小', '新'])}{self.random_element(['村', '庄', '屯'])}"
                     if not v_name.endswith("村"): v_name += "村"
                 full_street = f"{t_n}{v_name}{self.random_int(1,100)}号"
 
-        # Vehicle Plate prefix mapping
-        plate_prefixes = {
-            "北京": "京", "天津": "津", "上海": "沪", "重庆": "渝", "河北": "冀",
-            "山西": "晋", "辽宁": "辽", "吉林": "吉", "黑龙江": "黑", "江苏": "苏",
-            "浙江": "浙", "安徽": "皖", "福建": "闽", "江西": "赣", "山东": "鲁",
-            "河南": "豫", "湖北": "鄂", "湖南": "湘", "广东": "粤", "海南": "琼",
-            "四川": "川", "贵州": "贵", "云南": "云", "陕西": "陕", "甘肃": "甘",
-            "青海": "青", "台湾": "台", "内蒙古": "蒙", "广西": "桂", "西藏": "藏",
-            "宁夏": "宁", "新疆": "新", "香港": "港", "澳门": "澳"
-        }
-        
-        plate_prefix = "京"
-        for k, v in plate_prefixes.items():
-            if k in p_data['name']:
-                plate_prefix = v
-                break
+        plate_prefix = self._plate_prefix_for(p_data['name'])
         
         # Simple random city letter (A-Z except I and O usually)
         city_letter = self.random_element("ABCDEFGHJKLMNPQRSTUVWXYZ")
@@ -403,82 +757,317 @@ class PersonaProvider(BaseProvider):
         Supports extensive detail fields via kwargs: 
         (height, weight, blood_type, username, password, education, job, salary, security_question, security_answer, etc.)
         """
-        areas = self._load_areas()
-        phones = self._load_phones()
+        plan = self._persona_plan(hometown_province=hometown_province, work_province=work_province)
+        return self._persona(
+            plan, gender=gender, age_range=age_range, hometown_province=hometown_province,
+            hometown_city=hometown_city, has_second_phone=has_second_phone, work_province=work_province,
+            work_city=work_city, use_ai=use_ai, ai_config=ai_config, fields=fields, **kwargs
+        )
 
-        # 1. Resolve geographic constraints (Hometown)
-        prov_list = areas
-        if hometown_province:
-            filtered = [p for p in prov_list if hometown_province in p['name']]
-            if filtered:
-                prov_list = filtered
-                prov_data = self.random_element(prov_list)
-            else:
-                prov_data = self.random_element(prov_list)
-        else:
-            # 7th Census: Province Population Weighting
-            prov_weights_dict = {
-                "广东": 8.93, "山东": 7.19, "河南": 7.04, "江苏": 6.00, "四川": 5.93,
-                "河北": 5.28, "湖南": 4.71, "浙江": 4.57, "安徽": 4.32, "湖北": 4.09,
-                "广西": 3.55, "云南": 3.34, "江西": 3.20, "辽宁": 3.02, "福建": 2.94,
-                "陕西": 2.80, "贵州": 2.73, "新疆": 1.83, "甘肃": 1.77, "上海": 1.76,
-                "吉林": 1.71, "内蒙古": 1.70, "北京": 1.55, "重庆": 2.27, "黑龙江": 2.26,
-                "山西": 2.47, "天津": 0.98, "海南": 0.71, "宁夏": 0.51, "青海": 0.42,
-                "西藏": 0.26
+    def personas(self, n: int, **constraints) -> List[Dict[str, Any]]:
+        """
+        Generate `n` personas sharing the same constraints (any `persona()` argument).
+        Constraint resolution and lookup tables are built once for the whole batch;
+        the output is identical to calling `persona(**constraints)` n times.
+        """
+        return list(self.iter_personas(n, **constraints))
+
+    def iter_personas(self, n: int, **constraints):
+        """
+        Lazily yield `n` personas sharing the same constraints. See `personas()`.
+        """
+        plan = self._persona_plan(
+            hometown_province=constraints.get("hometown_province"),
+            work_province=constraints.get("work_province")
+        )
+        for _ in range(n):
+            yield self._persona(plan, **constraints)
+
+    # Methods timed while profiling: (group, method); all are called through self
+    _PROFILED_CALLS = (
+        ("loaders", "_load_areas"), ("loaders", "_load_area_index"), ("loaders", "_load_prov_table"),
+        ("loaders", "_load_phones"), ("loaders", "_load_postcodes"), ("loaders", "_load_villages"),
+        ("loaders", "_load_enterprises"),
+        ("helpers", "_persona_plan"), ("helpers", "_strict_ssn"), ("helpers", "_generate_full_address"),
+        ("helpers", "_get_realistic_job"), ("helpers", "_get_salary_by_job"), ("helpers", "_get_phone_number"),
+    )
+
+    def enable_profiling(self) -> None:
+        """
+        Record wall-clock time and call counts per persona stage, AI call, _load_* loader
+        and heavy helper until disable_profiling(). Read them with profiling_stats().
+        Disabled, the only cost is one attribute check per persona and stage.
+        """
+        if self._profile is not None:
+            return
+        self._profile = {}
+        for group, name in self._PROFILED_CALLS:
+            # Instance attributes shadow the methods, so nothing is wrapped while disabled
+            setattr(self, name, self._timed(group, name, getattr(self, name)))
+
+    def disable_profiling(self) -> None:
+        for _, name in self._PROFILED_CALLS:
+            self.__dict__.pop(name, None)
+        self._profile = None
+
+    def reset_profiling(self) -> None:
+        if self._profile is not None:
+            self._profile.clear()
+
+    def profiling_stats(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        {group: {name: {calls, total_s, mean_ms}}} since profiling was enabled or reset.
+        Groups: persona, stages, ai, loaders, helpers. Timings nest: a loader called
+        from a stage is counted in both.
+        """
+        stats = {}
+        for (group, name), (calls, total) in sorted((self._profile or {}).items()):
+            stats.setdefault(group, {})[name] = {
+                "calls": calls, "total_s": total, "mean_ms": total * 1000 / calls
             }
-            # Fallback weight for missing provinces
-            w_list = [prov_weights_dict.get(p['name'].replace("省", "").replace("市", "").replace("自治区", "").replace("壮族", "").replace("回族", "").replace("维吾尔", ""), 1.0) for p in prov_list]
-            prov_data = random.choices(prov_list, weights=w_list, k=1)[0]
-            
-        prov_name = prov_data['name']
+        return stats
 
-        city_list = prov_data.get('children', [])
-        if not city_list:
-            city_list = [prov_data]
+    def _record(self, group: str, name: str, elapsed: float) -> None:
+        entry = self._profile.get((group, name))
+        if entry is None:
+            self._profile[(group, name)] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
 
-        if hometown_city:
-            filtered = [c for c in city_list if hometown_city in c['name']]
-            if filtered:
-                city_list = filtered
+    def _timed(self, group: str, name: str, method):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                if self._profile is not None:
+                    self._record(group, name, time.perf_counter() - start)
+        timed.__name__ = name
+        return timed
+
+    def _persona(
+        self,
+        plan: Dict[str, Any],
+        gender: Optional[str] = None,
+        age_range: Optional[tuple] = None,
+        hometown_province: Optional[str] = None,
+        hometown_city: Optional[str] = None,
+        has_second_phone: bool = False,
+        work_province: Optional[str] = None,
+        work_city: Optional[str] = None,
+        use_ai: bool = False,
+        ai_config: Optional[Dict] = None,
+        fields: Optional[List[str]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        stages, paths = self._compile_fields(fields, has_second_phone, use_ai)
+        ctx = {
+            "plan": plan, "index": plan["index"], "kwargs": kwargs,
+            "gender": gender, "age_range": age_range, "hometown_city": hometown_city,
+            "work_province": work_province, "work_city": work_city,
+        }
+        out = {}
+        profile = self._profile
+        if profile is not None:
+            persona_start = time.perf_counter()
+
+        # Stages draw from per-persona streams seeded from one draw of the instance RNG,
+        # so a stage's values do not depend on which other stages ran (see _PERSONA_STAGES)
+        generator = self.generator
+        shared_random = generator.random
+        persona_seed = shared_random.getrandbits(64)
+        streams = self._stage_randoms
+        try:
+            for salt, reseed, resolve in stages:
+                stream = streams[salt]
+                if reseed:
+                    stream.seed(persona_seed + salt)
+                generator.random = stream
+                if profile is None:
+                    resolve(self, ctx, out)
+                else:
+                    start = time.perf_counter()
+                    resolve(self, ctx, out)
+                    self._record("stages", resolve.__name__[len("_resolve_"):], time.perf_counter() - start)
+        finally:
+            generator.random = shared_random
+
+        if paths is not None:
+            result = {}
+            for path, section, key in paths:
+                if section:
+                    result.setdefault(section, {})[key] = out[path]
+                else:
+                    result[key] = out[path]
+            if profile is not None:
+                self._record("persona", "persona", time.perf_counter() - persona_start)
+            return result
+
+        # AI enrichment reads the full persona, and may add keys of its own
+        result = {}
+        for path in self._persona_layout(has_second_phone):
+            section, _, key = path.rpartition(".")
+            if section:
+                result.setdefault(section, {})[key] = out[path]
+            else:
+                result[key] = out[path]
+
+        from .ai_story import generate_ai_story, generate_ai_image
+        config = ai_config or {}
+        if profile is not None:
+            start = time.perf_counter()
+        ai_data = generate_ai_story(result, config)
+        if profile is not None:
+            self._record("ai", "story", time.perf_counter() - start)
+        if ai_data:
+            result.update(ai_data)
+
+        # Optional: Generate AI Avatar Image
+        img_key = config.get("image_api_key")
+        if img_key and "image_prompt" in result:
+            if profile is not None:
+                start = time.perf_counter()
+            img_url = generate_ai_image(result["image_prompt"], img_key, config)
+            if profile is not None:
+                self._record("ai", "image", time.perf_counter() - start)
+            if img_url:
+                result["avatar_url"] = img_url
 
-        city_data = self.random_element(city_list)
-        city_name = city_data['name']
+        if fields:
+            result = self._filter_by_fields(result, fields)
+        if profile is not None:
+            self._record("persona", "persona", time.perf_counter() - persona_start)
+        return result
 
-        area_list = city_data.get('children', [])
-        if not area_list:
-            area_list = [city_data]
+    @staticmethod
+    def _persona_layout(has_second_phone: bool) -> tuple:
+        return COLUMNS + SECOND_PHONE_COLUMNS if has_second_phone else COLUMNS
 
-        area_data = self.random_element(area_list)
-        area_code = area_data['code']
-        area_name = area_data['name']
-
-        town_list = area_data.get('children', [])
-        if town_list:
-            town_data = self.random_element(town_list)
-            town_name = town_data['name']
-            town_code = town_data.get('code', '')
+    def _compile_fields(self, fields: Optional[List[str]], has_second_phone: bool, use_ai: bool) -> tuple:
+        """
+        Resolve a `fields` projection once into (stages, paths): the resolvers that must
+        run, in dependency order with their stream, and the output paths as
+        (path, section, key). `paths` is None when the AI stage runs, which needs the whole
+        persona. Memoized per (fields, has_second_phone, use_ai).
+        """
+        key = (tuple(fields) if fields else None, bool(has_second_phone), bool(use_ai))
+        compiled = self._compiled_fields.get(key)
+        if compiled is not None:
+            return compiled
+
+        layout = self._persona_layout(has_second_phone)
+        needs_ai = use_ai
+        if fields:
+            paths = []
+            needs_ai = False
+            for f in fields:
+                f = f.strip()
+                if not f:
+                    continue
+                matched = [p for p in layout if p == f or p.startswith(f + ".")]
+                if matched:
+                    paths += [p for p in matched if p not in paths]
+                elif use_ai:
+                    # Only the model knows which extra keys it returns
+                    needs_ai = True
+        else:
+            paths = list(layout)
+
+        producers = {p: name for name, _, _, outputs in self._PERSONA_STAGES for p in outputs}
+        if needs_ai:
+            wanted = {name for name, _, _, _ in self._PERSONA_STAGES}
         else:
-            town_name = ""
-            town_code = ""
+            wanted = set().union(*(self._stage_closure(producers[p]) for p in paths))
+        if not has_second_phone:
+            wanted.discard("second_phone")
+
+        stages, started = [], set()
+        for name, stream, _, _ in self._PERSONA_STAGES:
+            if name in wanted:
+                salt = self._PERSONA_STREAMS.index(stream)
+                stages.append((salt, stream not in started, getattr(type(self), f"_resolve_{name}")))
+                started.add(stream)
+        compiled = (tuple(stages), None if needs_ai else tuple((p,) + p.rpartition(".")[::2] for p in paths))
+        self._compiled_fields[key] = compiled
+        return compiled
 
+    @classmethod
+    def _stage_closure(cls, name: str) -> set:
+        # The stage plus everything it transitively reads from
+        deps = {n: d for n, _, d, _ in cls._PERSONA_STAGES}
+        closure, todo = set(), [name]
+        while todo:
+            n = todo.pop()
+            if n not in closure:
+                closure.add(n)
+                todo.extend(deps[n])
+        return closure
+
+    # Persona resolvers in dependency order: (stage, stream, stages it reads from, output paths).
+    # Stages of one stream share a random stream in this order, which only holds because
+    # each of them reads from all the earlier ones; any projection then runs a prefix of
+    # every stream and gets the same values as the full persona.
+    _PERSONA_STAGES = (
+        ("geo", "place", (), ()),
+        ("demographics", "life", (), ("gender", "birth_date", "social.marital_status")),
+        ("ssn", "ssn", ("demographics",), ("ssn",)),
+        ("hometown", "place", ("geo",), (
+            "hometown.province", "hometown.city", "hometown.area", "hometown.address", "hometown.postcode")),
+        ("career", "life", ("demographics",), ("age", "social.education", "social.employment", "social.job")),
+        ("workplace", "life", ("geo", "hometown", "career"), (
+            "workplace.province", "workplace.city", "workplace.area", "workplace.address",
+            "workplace.company_name", "workplace.company_uscc")),
+        ("primary_phone", "primary_phone", ("workplace",), ("primary_phone.number", "primary_phone.location")),
+        ("name", "identity", ("demographics",), ("name",)),
+        ("ethnicity", "ethnicity", ("geo",), ("ethnicity",)),
+        ("physical", "physical", ("demographics", "career"), ("physical.height", "physical.weight", "physical.blood_type")),
+        ("account", "identity", ("demographics", "name"), (
+            "username", "password", "strong_password", "common_password", "common_password_upper",
+            "yopmail", "yopmail_url")),
+        ("salary", "life", ("career", "workplace"), ("social.salary",)),
+        ("email", "identity", ("career", "account"), ("email",)),
+        ("mbti", "mbti", (), ("mbti",)),
+        ("bank", "bank", ("career",), ("bank_card", "bank_name")),
+        ("vehicle", "life", ("career", "salary", "workplace", "hometown"), ("asset.vehicle_plate",)),
+        ("internet", "internet", ("career", "salary", "account"), (
+            "internet.guid", "internet.user_agent", "internet.os", "internet.web_home")),
+        ("security", "place", ("hometown",), ("social.security_question", "social.security_answer")),
+        ("second_phone", "second_phone", ("geo",), SECOND_PHONE_COLUMNS),
+    )
+    # Stream salts, in order of first use
+    _PERSONA_STREAMS = tuple(dict.fromkeys(stream for _, stream, _, _ in _PERSONA_STAGES))
+    _compiled_fields: Dict[tuple, tuple] = {}
+
+    def _resolve_geo(self, ctx, out):
+        # 1. Resolve geographic constraints (Hometown)
+        # 7th Census: Province Population Weighting unless the province is constrained
+        index = ctx["index"]
+        prov_data = self._pick_province(ctx["plan"])
+
+        city_list = index.children(prov_data)
+        if ctx["hometown_city"]:
+            city_list = index.match_children(prov_data, ctx["hometown_city"]) or city_list
+        city_data = self.random_element(city_list)
+
+        ctx["prov_data"] = prov_data
+        ctx["city_data"] = city_data
+        ctx["area_data"] = self.random_element(index.children(city_data))
+
+    def _resolve_demographics(self, ctx, out):
         # 2. Resolve Gender, Age and Marital Status
+        kwargs = ctx["kwargs"]
+        gender = ctx["gender"]
         if gender not in ['男', '女', 'M', 'F']:
             # 7th Census: General Sex Ratio 105.07 (Male 51.24%, Female 48.76%)
-            gender_val = random.choices(['男', '女'], weights=[51.24, 48.76], k=1)[0]
+            gender_val = self._gender_table.sample(self.generator.random)
         else:
             gender_val = '男' if gender in ['男', 'M'] else '女'
 
-        is_male = gender_val == '男'
-
+        age_range = ctx["age_range"]
         if not age_range or len(age_range) != 2:
             # 7th Census: Age Pyramid -> 0-14: 17.95%, 15-59: 63.35%, 60+: 18.70%
-            age_bucket = random.choices(["0-14", "15-59", "60-90"], weights=[17.95, 63.35, 18.70], k=1)[0]
-            if age_bucket == "0-14":
-                age_range = (1, 14)
-            elif age_bucket == "15-59":
-                age_range = (15, 59)
-            else:
-                age_range = (60, 90)
+            age_range = self._age_bucket_table.sample(self.generator.random)
 
         birth_date = self._random_date_between(age_range[0], age_range[1])
         age = date.today().year - birth_date.year - ((date.today().month, date.today().day) < (birth_date.month, birth_date.day))
@@ -487,30 +1076,42 @@ class PersonaProvider(BaseProvider):
         if age < 22:
             marital_status = "未婚"
         elif age < 30:
-            # ~60% un-married, ~39% married, ~1% divorced
-            marital_status = random.choices(["未婚", "已婚", "离异"], weights=[60, 39, 1], k=1)[0]
+            marital_status = self._marital_tables["22-29"].sample(self.generator.random)
         elif age < 50:
-            # High marriage rate, some divorce
-            marital_status = random.choices(["未婚", "已婚", "离异", "丧偶"], weights=[15, 75, 9, 1], k=1)[0]
+            marital_status = self._marital_tables["30-49"].sample(self.generator.random)
         else:
-            # Older cohorts
-            marital_status = random.choices(["未婚", "已婚", "离异", "丧偶"], weights=[5, 75, 5, 15], k=1)[0]
-        
-        marital_status = kwargs.get("marital_status") or marital_status
+            marital_status = self._marital_tables["50+"].sample(self.generator.random)
+
+        ctx["gender_val"] = gender_val
+        ctx["is_male"] = gender_val == '男'
+        ctx["birth_date"] = birth_date
+        ctx["birth_age"] = age
+        out["gender"] = gender_val
+        out["birth_date"] = birth_date.strftime("%Y-%m-%d")
+        out["social.marital_status"] = kwargs.get("marital_status") or marital_status
 
+    def _resolve_ssn(self, ctx, out):
         # 3. Generate Strict SSN
-        ssn = self.strict_ssn(
-            hometown_province=hometown_province,
-            hometown_city=hometown_city,
-            gender=gender_val,
-            birth_date=birth_date
+        out["ssn"] = self._strict_ssn(
+            ctx["plan"],
+            hometown_city=ctx["hometown_city"],
+            gender=ctx["gender_val"],
+            birth_date=ctx["birth_date"]
         )
 
-        # 4. Address Logic extracted to class method
+    def _resolve_hometown(self, ctx, out):
+        # 4. Generate Hometown address and postcode
+        hometown_data = self._generate_full_address(ctx["prov_data"], ctx["city_data"], ctx["area_data"], self._load_villages())
+        ctx["hometown_data"] = hometown_data
+        out["hometown.province"] = hometown_data['province']
+        out["hometown.city"] = hometown_data['city']
+        out["hometown.area"] = hometown_data['area']
+        out["hometown.address"] = hometown_data['address']
+        out["hometown.postcode"] = self._generate_realistic_postcode(self._load_postcodes(), ctx["area_data"]['code'])
 
-        # Generate Hometown
-        villages = self._load_villages()
-        hometown_data = self._generate_full_address(prov_data, city_data, area_data, villages)
+    def _resolve_career(self, ctx, out):
+        kwargs = ctx["kwargs"]
+        age = ctx["birth_age"]
 
         # Social / background with age constraints
         if age < 7:
@@ -523,26 +1124,19 @@ class PersonaProvider(BaseProvider):
             education = "初中"
             employment = "在读"
         elif age < 19:
-            education = random.choices(["高中", "中专"], weights=[60, 40], k=1)[0]
+            education = self._education_tables["16-18"].sample(self.generator.random)
             employment = "在读"
         elif age < 23:
             # College years: some are learning, some are working.
-            # Real world: highly weighted to Highschool/Vocational/Assosiates
-            education = random.choices(["初中", "高中", "中专", "职业技能培训", "大专", "本科"], weights=[10, 15, 10, 15, 30, 20], k=1)[0]
-            employment = random.choices(["在职", "待业", "在读"], weights=[40, 5, 55], k=1)[0]
+            education = self._education_tables["19-22"].sample(self.generator.random)
+            employment = self._employment_tables["19-22"].sample(self.generator.random)
         elif age < 60:
-            # Core working population. Parity: Below Highschool ~50%, Highschool/Voc ~20%, Assoc 15%, Bach 12%, Mas/PhD 3%
-            edu_opts = ["初中", "高中", "中专", "职业技能培训", "大专", "本科", "硕士", "MBA", "博士"]
-            edu_weights = [50, 10, 10, 5, 15, 10, 2, 1, 0.5]
-            education = random.choices(edu_opts, weights=edu_weights, k=1)[0]
-            
-            # Employment: Enployed 70%, Free 15%, Unem 15% (including housewives, disabled, etc.)
-            emp_opts = ["在职", "待业", "自由职业"]
-            emp_weights = [70, 15, 15]
-            employment = random.choices(emp_opts, weights=emp_weights, k=1)[0]
+            # Core working population
+            education = self._education_tables["23-59"].sample(self.generator.random)
+            employment = self._employment_tables["23-59"].sample(self.generator.random)
         else: # 60+
-            education = random.choices(["初中", "高中", "大专", "本科", "硕士", "博士"], weights=[70, 15, 10, 4, 0.8, 0.2], k=1)[0]
-            employment = random.choices(["退休", "自由职业"], weights=[95, 5], k=1)[0]
+            education = self._education_tables["60+"].sample(self.generator.random)
+            employment = self._employment_tables["60+"].sample(self.generator.random)
 
         education = kwargs.get("education") or education
         employment = kwargs.get("employment") or employment
@@ -551,7 +1145,6 @@ class PersonaProvider(BaseProvider):
             if not kwargs.get("employment"):
                 employment = "在职"
 
-
         # Job deduction based strictly on employment status
         if employment in ["在读", "全职学生"]:
             job_val = "无" if age < 7 else "学生"
@@ -560,18 +1153,14 @@ class PersonaProvider(BaseProvider):
         elif employment == "退休":
             job_val = "退休人员"
         else:
-            job_val = self._get_realistic_job()
+            # Logic Hardening: Age vs Title, nobody under 28 draws an elite title
+            job_val = self._get_realistic_job(junior=age < 28)
 
         job = kwargs.get("job") or job_val
-        
-        # Logic Hardening: Age vs Title
-        elite_kw = ["总监", "CEO", "CTO", "CFO", "总裁", "总经理", "副总", "行长", "首席", "科学家", "专家", "研究员", "架构师", "法官"]
-        while age < 28 and any(kw in job for kw in elite_kw) and not kwargs.get("job"):
-            job = self._get_realistic_job()
+        profile = self._job_profile(job)
 
         # Logic Hardening: Education Ceiling for Blue-Collar / Service
-        blue_collar_kw = ["普工", "操作", "车间", "流水线", "装配", "纺织", "细纱", "包装", "厨师", "服务员", "营业员", "保安", "保洁", "家政", "保姆", "洗碗", "店员", "前台", "收银", "司机", "快递", "外卖", "配送", "理发", "美容", "美发", "美体", "泥瓦工", "钢筋工", "搬运", "清洁", "维修", "机修", "钳工", "焊工", "木工", "电工", "水管工", "修理", "足疗", "推拿", "按摩", "传菜", "门卫", "导购", "促销", "保洁", "钟点工", "月嫂", "保安", "后厨", "切配", "迎宾", "收银", "杂工", "收发", "工人", "混凝土", "挖掘机", "砌筑", "抹灰", "水电工", "架子工", "电梯工", "钣金", "喷漆", "锅炉", "保安", "保洁", "环卫", "绿化", "搬运", "装卸", "分拣"]
-        if any(kw in job for kw in blue_collar_kw):
+        if profile.blue_collar:
             if education in ["博士", "硕士", "MBA"]:
                 education = self.random_element(["初中", "高中", "中专", "大专", "职业技能培训"])
             elif education == "本科" and self.random_int(1, 100) > 10:  # 90% chance to downgrade Bachelors in these roles
@@ -579,28 +1168,29 @@ class PersonaProvider(BaseProvider):
                 
         # Logic Hardening: Education/Age Door for Specific Jobs
         # Always fix '研究生' to be realistic
-        if "研究生" in job:
+        if profile.postgrad:
             if age > 35: age = self.random_int(22, 28)
             employment = "在读"
             job = "学生"
             education = "本科"
+            profile = self._job_profile(job)
         
         # Specific high-end jobs require older age and higher education
-        if any(kw in job for kw in ["总", "CEO", "CFO", "CTO", "总裁", "主任", "总监", "经理", "行长", "店长", "厂长"]):
+        if profile.manager:
             if education in ["幼儿", "小学", "初中", "高中", "中专", "大专", "职业技能培训"]: 
                 education = self.random_element(["本科", "硕士", "MBA"])
                 
-        if any(kw in job for kw in ["架构师", "专家", "研究员", "科学家", "教授", "算法"]):
+        if profile.senior_research:
             if age < 28: age = self.random_int(28, 50)
             if education in ["幼儿", "小学", "初中", "高中", "中专", "大专", "职业技能培训"]:
                 education = self.random_element(["本科", "硕士", "博士"])
                 
-        if any(kw in job for kw in ["医生", "医师", "法医", "法官", "检察"]):
+        if profile.doctor_legal:
             if age < 24: age = self.random_int(25, 45)
             if education in ["幼儿", "小学", "初中", "高中", "中专", "职业技能培训", "大专"]:
                 education = self.random_element(["本科", "硕士", "博士"])
                 
-        if any(kw in job for kw in ["工程师", "开发", "程序员", "律师"]):
+        if profile.engineer:
             if age < 22: age = self.random_int(22, 40)
             if education in ["幼儿", "小学", "初中", "高中", "中专"]:
                 education = self.random_element(["大专", "本科"])
@@ -621,9 +1211,27 @@ class PersonaProvider(BaseProvider):
         if education == "大专" and age < 21:
             education = self.random_element(["高中", "中专"])
 
+        ctx["education"] = education
+        ctx["employment"] = employment
+        ctx["job"] = job
+        ctx["age"] = age
+        out["age"] = age
+        out["social.education"] = education
+        out["social.employment"] = employment
+        out["social.job"] = job
+
+    def _resolve_workplace(self, ctx, out):
         # 5. Resolve Social/Job constraints to determine Workplace
+        index, plan = ctx["index"], ctx["plan"]
+        job, employment = ctx["job"], ctx["employment"]
+        work_province, work_city = ctx["work_province"], ctx["work_city"]
+        prov_data, city_data, area_data = ctx["prov_data"], ctx["city_data"], ctx["area_data"]
+        hometown_data = ctx["hometown_data"]
+        villages = self._load_villages()
+
         company_name = "无"
         company_uscc = "无"
+        work_city_code = None
         
         if employment in ["在读", "待业", "无业", "待就业", "退休"] or job in ["无", "幼儿", "学生", "退休人员"]:
             workplace_data = {
@@ -635,73 +1243,59 @@ class PersonaProvider(BaseProvider):
                 "company_uscc": company_uscc
             }
         else:
-            is_high_end = any(kw in job for kw in ["总", "CEO", "CTO", "高管", "总裁", "架构师", "专家"])
+            profile = self._job_profile(job)
+            is_high_end = profile.high_end
 
             if work_province:
-                w_prov_list = [p for p in areas if work_province in p['name']] if work_province else areas
-                wp_data = self.random_element(w_prov_list)
-                wc_list = wp_data.get('children', [wp_data])
-                wc_data = self.random_element([c for c in wc_list if work_city in c['name']]) if work_city else self.random_element(wc_list)
-                wa_list = wc_data.get('children', [wc_data])
+                wp_data = self.random_element(plan["work_prov_list"])
+                wc_data = self.random_element(index.match_children(wp_data, work_city)) if work_city else self.random_element(index.children(wp_data))
+                wa_list = index.children(wc_data)
                 wa_data = self.random_element(wa_list)
             elif is_high_end and not hometown_data['is_urban']:
-                t1_provs = ["北京", "上海", "广东", "江苏", "浙江"]
-                wp_data = self.random_element([p for p in areas if any(t1 in p['name'] for t1 in t1_provs)])
-                wc_data = self.random_element(wp_data.get('children', [wp_data]))
-                wa_data = self.random_element(wc_data.get('children', [wc_data]))
+                wp_data = self.random_element(plan["t1_prov_list"])
+                wc_data = self.random_element(index.children(wp_data))
+                wa_data = self.random_element(index.children(wc_data))
             else:
                 wp_data, wc_data, wa_data = prov_data, city_data, area_data
 
             # Match enterprise based on industry mapping
-            ent_db = self._load_enterprises()
+            enterprises = self._load_enterprises()
             matched_company = None
-            is_tech = any(kw in job for kw in ["架构师", "专家", "研究员", "研发", "科学家", "总监", "经理", "开发", "程序员", "IT", "互联网", "软件", "系统", "产品", "运营"])
-            is_finance = any(kw in job for kw in ["银行", "出纳", "财务", "金融", "投资", "风控", "保险", "理财", "资金", "信贷"])
-            is_manufacture = any(kw in job for kw in ["质量", "车间", "工人", "普工", "机修", "制造", "产线", "组装", "仓管", "包装", "纺织", "焊接", "操作"])
-            
             target_industry = ""
-            if is_tech: target_industry = "信息传输、软件和信息技术服务业"
-            elif is_finance: target_industry = "金融业"
-            elif is_manufacture: target_industry = "制造业"
+            if profile.tech: target_industry = "信息传输、软件和信息技术服务业"
+            elif profile.finance: target_industry = "金融业"
+            elif profile.manufacture: target_industry = "制造业"
                 
             # Try to catch a giant if high end or pure luck
-            if target_industry and random.random() < 0.05:
-                giant_cands = [c for c in ent_db.get("_giants", []) if c["industry"] == target_industry and c["province"] in wp_data["name"]]
-                if giant_cands:
-                    matched_company = random.choice(giant_cands)
+            if target_industry and self.generator.random.random() < 0.05:
+                matched_company = enterprises.pick_giant(wp_data["code"], target_industry, self.generator.random)
                     
             if not matched_company:
-                # Fallback to local SMEs
-                local_smes = ent_db.get("_sme", {}).get(wp_data["name"].replace("省", "").replace("市", "").replace("自治区", "").replace("壮族", "").replace("回族", "").replace("维吾尔", ""), [])
-                if local_smes:
-                    valid_smes = [c for c in local_smes if not target_industry or c["industry"] == target_industry]
-                    city_matched_smes = [c for c in valid_smes if c["city"] == wc_data["name"]]
-                    
-                    if city_matched_smes:
-                        matched_company = random.choice(city_matched_smes)
-                    elif valid_smes:
-                        matched_company = random.choice(valid_smes)
-                    else:
-                        matched_company = random.choice(local_smes)
+                # Fallback to local SMEs: same city and industry, then province and industry, then any
+                matched_company = enterprises.pick_sme(wp_data["code"], wc_data["name"], target_industry, self.generator.random)
             
             base_address = self._generate_full_address(wp_data, wc_data, wa_data, villages, f_urban=is_high_end, job=job, employment=employment)
             
             if matched_company:
                 company_name = matched_company["name"]
                 company_uscc = matched_company["uscc"]
-                if matched_company.get("address"):
+                # Companies from enterprises.build() carry their county and registered address
+                company_area = matched_company.get("area")
+                if matched_company.get("address") and not company_area:
                     # Giant company has hardcoded real address
                     workplace_address_str = matched_company["address"]
                 else:
                     # Sync city back from company so name matches the address if we had a fallback
-                    if matched_company["city"] != wc_data["name"]:
-                        wc_data = next((c for c in wp_data.get('children', [wp_data]) if c['name'] == matched_company["city"]), wc_data)
-                        wa_list = wc_data.get('children', [wc_data])
-                        wa_data = self.random_element(wa_list)
+                    if matched_company["city"] != wc_data["name"] or (company_area and company_area != wa_data["name"]):
+                        wc_data = index.child_by_name(wp_data, matched_company["city"]) or wc_data
+                        wa_list = index.children(wc_data)
+                        wa_data = (company_area and index.child_by_name(wc_data, company_area)) or self.random_element(wa_list)
                         base_address = self._generate_full_address(wp_data, wc_data, wa_data, villages, f_urban=is_high_end, job=job, employment=employment)
                         
-                    if any(kw in job for kw in ["医生", "护士", "老师", "教授", "公务员"]):
+                    if profile.public_service:
                         workplace_address_str = base_address["address"] # Keep logic for hospitals/schools
+                    elif company_area:
+                        workplace_address_str = f"{matched_company['address']}{company_name}"
                     else:
                         if "号" in base_address["address"]:
                             workplace_address_str = base_address["address"].split("号")[0] + f"号{company_name}"
@@ -710,6 +1304,7 @@ class PersonaProvider(BaseProvider):
             else:
                 workplace_address_str = base_address["address"]
 
+            work_city_code = wc_data['code']
             workplace_data = {
                 "province": wp_data['name'],
                 "city": wc_data['name'],
@@ -719,48 +1314,35 @@ class PersonaProvider(BaseProvider):
                 "company_uscc": company_uscc
             }
 
+        ctx["workplace_data"] = workplace_data
+        ctx["work_city_code"] = work_city_code
+        for key in ("province", "city", "area", "address", "company_name", "company_uscc"):
+            out[f"workplace.{key}"] = workplace_data[key]
+
+    def _resolve_primary_phone(self, ctx, out):
         # 6. Generate Primary Phone based on Workplace
-        primary_phone = self._get_phone_number(self._load_phones(), str(workplace_data['province']), str(workplace_data['city']))
+        workplace_data = ctx["workplace_data"]
+        out["primary_phone.number"] = self._get_phone_number(self._load_phones(), ctx["work_city_code"])
+        out["primary_phone.location"] = workplace_data['city'] if workplace_data['city'] not in ["市辖区", "县", "省直辖县级行政区划"] else workplace_data['province']
 
+    def _resolve_name(self, ctx, out):
         # 7. Determine Name (Gender already known) with Era-based Probabilities
-        if kwargs.get("name"):
-            name = kwargs.get("name")
-        else:
-            name = self.era_name(birth_date.year, gender_val)
+        name = ctx["kwargs"].get("name")
+        if not name:
+            name = self.era_name(ctx["birth_date"].year, ctx["gender_val"])
+        ctx["name"] = name
+        out["name"] = name
 
+    def _resolve_ethnicity(self, ctx, out):
         # 8. Ethnicity and Identity (Geo-aware distribution)
-        ethnicity = kwargs.get("ethnicity")
+        ethnicity = ctx["kwargs"].get("ethnicity")
         if not ethnicity:
-            e_weights = {"汉族": 91}
-            p_n = str(prov_name)
-            if "西藏" in p_n: e_weights["藏族"] = 50
-            elif "新疆" in p_n: e_weights["维吾尔族"] = 45; e_weights["哈萨克族"] = 5
-            elif "内蒙古" in p_n: e_weights["蒙古族"] = 20
-            elif "宁夏" in p_n: e_weights["回族"] = 30
-            elif "广西" in p_n: e_weights["壮族"] = 35
-            elif "云南" in p_n: e_weights["傣族"] = 10; e_weights["彝族"] = 10; e_weights["白族"] = 5
-            elif "吉林" in p_n or "辽宁" in p_n: e_weights["满族"] = 15; e_weights["朝鲜族"] = 5
-            
-            others = ["苗族", "回族", "土家族", "彝族", "满族", "壮族", "布依族"]
-            for o in others:
-                if o not in e_weights: e_weights[o] = 1
-            
-            total_w = sum(e_weights.values())
-            r_val = random.uniform(0, total_w)
-            cursor = 0
-            for e_name, w in e_weights.items():
-                cursor += w
-                if r_val <= cursor:
-                    ethnicity = e_name
-                    break
-        
-        # Postcode Logic: Load Full Database
-        full_pc_index = self._load_postcodes()
-        
+            ethnicity = self._ethnicity_tables.sample(str(ctx["prov_data"]['name']), self.generator.random)
+        out["ethnicity"] = ethnicity
 
-        # 8. Physical attributes with realistic distributions
-        # Blood types in China: O~32%, A~28%, B~30%, AB~10%
-        # Rh- is rare in China: ~0.3%
+    def _resolve_physical(self, ctx, out):
+        kwargs = ctx["kwargs"]
+        age, is_male = ctx["age"], ctx["is_male"]
 
         # 8. Physical attributes with realistic distributions (分段式生长曲线)
         # Pediatric Growth Curve (18.5 - 27 BMI for adults, specific for minors)
@@ -781,63 +1363,42 @@ class PersonaProvider(BaseProvider):
             bmi_min, bmi_max = 18.5, 27
             
         h_val = self.random_int(min=h_min, max=h_max)
-        bmi = random.uniform(bmi_min, bmi_max)
+        bmi = self.generator.random.uniform(bmi_min, bmi_max)
         w_val = int(bmi * (h_val/100)**2)
             
         height = kwargs.get("height") or f"{h_val}cm"
         weight = kwargs.get("weight") or f"{w_val}kg"
         blood_type = kwargs.get("blood_type") or self._get_realistic_blood()
 
+        out["physical.height"] = height
+        out["physical.weight"] = weight
+        out["physical.blood_type"] = blood_type
+
+    def _resolve_account(self, ctx, out):
         # Web / Account attributes (姓名-账号耦合)
-        # Simple name-based username logic
+        kwargs = ctx["kwargs"]
+        name, birth_date = ctx["name"], ctx["birth_date"]
 
         username = kwargs.get("username") or self._get_linked_identity(name)
-        
+
         # 密码逻辑强化：区分强密码与真实常用密码 (Common Habits: BirthDate + Initials)
         initials = self._get_pinyin_initials(name).lower()
         common_password_base = f"{birth_date.strftime('%Y%m%d')}{initials}"
-        
-        common_password = kwargs.get("common_password") or common_password_base
-        common_password_upper = kwargs.get("common_password_upper") or common_password_base.upper()
         strong_password = kwargs.get("password") or self.generator.password()
-        
-        guid = kwargs.get("guid") or str(self.generator.uuid4())
-        
-        temp_mail_configs = {
-            'yopmail.com': 'https://yopmail.com/zh/?',
-            'yopmail.net': 'https://yopmail.com/zh/?',
-            'cool.fr.nf': 'https://yopmail.com/zh/?',
-            'jetable.fr.nf': 'https://yopmail.com/zh/?'
-        }
-        temp_domain = self.random_element(list(temp_mail_configs.keys()))
-        temp_email = kwargs.get("temp_email") or f"{username}@{temp_domain}"
-        # Dynamic Email Domain Weights based on Age and Job
-        
-        # New: Salary constraint based on Job
-        job_salary_mapping = [
-            # High priority specific overrides
-            (["车间主任", "护理主任", "护士长", "大堂经理", "客服经理", "物业经理", "前台", "迎宾", "钟点工"], (4000, 15000)),
-            (["洗碗", "清洁", "搬运", "杂工", "收废品", "足疗", "推拿", "按摩", "泥瓦工", "钢筋工", "纺织", "细纱"], (3000, 8000)),
-            (["护士", "护理", "药剂师"], (4000, 15000)),
-            (["医生", "医师", "主任医师", "法医"], (8000, 45000)),
-            (["教师", "老师", "教授", "讲师", "教员", "助教", "教练"], (4000, 25000)),
-            (["工程师", "开发", "程序员", "技术", "IT", "设计"], (8000, 45000)),
-            (["架构师", "专家", "科学家", "研究员"], (20000, 80000)),
-            (["客服", "行政", "文员", "专员", "出纳", "助理", "人事"], (3500, 10000)),
-            (["销售", "业务", "代理", "市场", "公关", "媒介", "采购"], (4000, 30000)),
-            (["司机", "快递", "外卖", "配送", "骑手", "乘务", "船员"], (5000, 12000)),
-            (["厨师", "服务员", "营业员", "保安", "店员", "导购", "促销", "理发", "美容"], (3000, 8000)),
-            (["保洁", "家政", "保姆", "月嫂"], (3000, 9000)),
-            (["工人", "普工", "操作工", "钳工", "焊工", "木工", "电工", "水管工", "维修", "机修", "制造"], (4000, 10000)),
-            (["总监", "CEO", "CTO", "CFO", "总裁", "总经理", "副总", "行长"], (30000, 150000)),
-            (["经理", "主管", "主任", "领班", "组长", "厂长"], (8000, 35000)),
-            (["会计", "审计", "金融", "投资", "分析师", "顾问", "律师", "法务"], (8000, 40000)),
-            (["翻译", "编辑", "记者", "策划", "编导", "导演"], (6000, 25000)),
-            (["演员", "模特", "歌手", "主播", "摄影", "后期", "剪辑"], (5000, 30000)),
-            (["公务员", "干事", "书记", "局长", "科长", "处长", "警", "官", "军", "检察", "法官"], (5000, 18000)),
-            (["退休"], (2500, 10000)),
-            (["学生", "小学", "初中", "高中", "幼儿", "无"], (0, 0))
-        ]
+
+        ctx["username"] = username
+        out["username"] = username
+        out["password"] = strong_password
+        out["strong_password"] = strong_password
+        out["common_password"] = kwargs.get("common_password") or common_password_base
+        out["common_password_upper"] = kwargs.get("common_password_upper") or common_password_base.upper()
+        out["yopmail"] = kwargs.get("yopmail") or f"{username}@yopmail.com"
+        out["yopmail_url"] = f"https://yopmail.com/zh/?login={username}"
+
+    def _resolve_salary(self, ctx, out):
+        kwargs = ctx["kwargs"]
+        age, job, employment = ctx["age"], ctx["job"], ctx["employment"]
+        workplace_data = ctx["workplace_data"]
 
         # New: Geo-Salary Multiplier based on Job Location
         tier1_cities = ["北京", "上海", "广州", "深圳"]
@@ -849,58 +1410,59 @@ class PersonaProvider(BaseProvider):
         loc_city = str(workplace_data.get('city', ''))
 
         if any(c in loc_prov or c in loc_city for c in tier1_cities):
-            city_factor = random.uniform(1.3, 1.6)
+            city_factor = self.generator.random.uniform(1.3, 1.6)
         elif any(c in loc_prov or c in loc_city for c in new_tier1_cities):
-            city_factor = random.uniform(1.1, 1.3)
+            city_factor = self.generator.random.uniform(1.1, 1.3)
         elif "省" in loc_prov or "自治区" in loc_prov:
-            city_factor = random.uniform(0.8, 1.0)
+            city_factor = self.generator.random.uniform(0.8, 1.0)
         else:
-            city_factor = random.uniform(0.6, 0.8)
+            city_factor = self.generator.random.uniform(0.6, 0.8)
 
         # Rural factor (based on workplace environment)
-        rural_factor = random.uniform(0.6, 0.8) if workplace_data.get('is_urban') is False else 1.0
+        rural_factor = self.generator.random.uniform(0.6, 0.8) if workplace_data.get('is_urban') is False else 1.0
 
 
         if "在读" in employment or "待业" in employment or job in ["无", "幼儿", "学生"]:
             salary = "￥0"
         else:
-            salary = kwargs.get("salary") or self._get_salary_by_job(job, job_salary_mapping, city_factor, rural_factor)
+            salary = kwargs.get("salary") or self._get_salary_by_job(job, self._job_salary_mapping, city_factor, rural_factor)
             # Logic Hardening: Age-based Salary Dampener
             if salary != "￥0" and not kwargs.get("salary"):
                 sal_val = float(salary.replace("￥", "").replace(",", ""))
                 if age < 25 and sal_val > 15000:
-                    sal_val *= random.uniform(0.4, 0.6)
+                    sal_val *= self.generator.random.uniform(0.4, 0.6)
                 elif age < 28 and sal_val > 30000:
-                    sal_val *= random.uniform(0.5, 0.7)
+                    sal_val *= self.generator.random.uniform(0.5, 0.7)
                 salary = f"￥{int(sal_val // 100 * 100)}"
-            
-        email = kwargs.get("email") or self._generate_weighted_email(username, age, job)
-        
-        yopmail_account = kwargs.get("yopmail") or f"{username}@yopmail.com"
-        yopmail_url = f"https://yopmail.com/zh/?login={username}"
-        
+
+        ctx["salary"] = salary
+        out["social.salary"] = salary
+
+    def _resolve_email(self, ctx, out):
+        out["email"] = ctx["kwargs"].get("email") or self._generate_weighted_email(ctx["username"], ctx["age"], ctx["job"])
+
+    def _resolve_mbti(self, ctx, out):
         # MBTI personality type
-        mbti_list = [
-            "INTJ", "INTP", "ENTJ", "ENTP", "INFJ", "INFP", "ENFJ", "ENFP",
-            "ISTJ", "ISFJ", "ESTJ", "ESFJ", "ISTP", "ISFP", "ESTP", "ESFP"
-        ]
-        mbti = kwargs.get("mbti") or self.random_element(mbti_list)
+        out["mbti"] = ctx["kwargs"].get("mbti") or self.random_element(self._mbti_list)
 
+    def _resolve_bank(self, ctx, out):
         # Bank Card (Luhn standard)
-
+        kwargs = ctx["kwargs"]
         bank_name = "无"
         bank_card = "无"
-        if age >= 10:
-            bank_bins = {
-                "中国工商银行": ["622202", "621226", "622208"],
-                "中国农业银行": ["622848", "622845", "622822"],
-                "中国银行": ["621661", "621660", "456350"],
-                "中国建设银行": ["621700", "621081", "623668"]
-            }
-            bank_name = self.random_element(list(bank_bins.keys()))
-            bin_val = self.random_element(bank_bins[bank_name])
+        if ctx["age"] >= 10:
+            bank_name = self.random_element(list(self._bank_bins.keys()))
+            bin_val = self.random_element(self._bank_bins[bank_name])
             bank_card = kwargs.get("bank_card") or self._generate_luhn(bin_val)
-            
+
+        out["bank_card"] = bank_card
+        out["bank_name"] = bank_name
+
+    def _resolve_vehicle(self, ctx, out):
+        plan = ctx["plan"]
+        age, employment, salary = ctx["age"], ctx["employment"], ctx["salary"]
+        workplace_data, hometown_data = ctx["workplace_data"], ctx["hometown_data"]
+
         # Vehicle Plates based on realistic Chinese socio-economic statistics
         # Statistically, 1 in 4 people in China owns a car (approx 25%).
         # Highly correlated with age (25-55 peak) and income.
@@ -920,49 +1482,36 @@ class PersonaProvider(BaseProvider):
             if any(t1 in str(workplace_data.get('city', '')) for t1 in ["北京", "上海", "广州", "深圳"]):
                 car_prob *= 0.7 
             
-            if random.random() < car_prob:
+            if self.generator.random.random() < car_prob:
                 # Plate location strictly tied to life trajectory:
                 # 60% chance it's registered in workplace city
                 # 30% chance it's registered in hometown city
                 # 10% chance it's registered in a random "education/other" city (simulating college/previous job)
-                loc_choice = random.random()
+                loc_choice = self.generator.random.random()
                 if loc_choice < 0.60:
                     plate_source = workplace_data
                 elif loc_choice < 0.90:
                     plate_source = hometown_data
                 else:
                     # Pick a completely random Tier 1/2 province to simulate college/previous work
-                    edu_prov = self.random_element([p for p in areas if any(name in p['name'] for name in ["湖北", "江苏", "四川", "陕西", "广东", "山东", "辽宁"])])
+                    edu_prov = self.random_element(plan["edu_prov_list"])
                     plate_source = {
                         "province": edu_prov['name'], 
                         "plate_prefix": edu_prov.get('children', [{'name': 'A'}])[0].get('name', 'A') # Fallback roughly
                     }
                     # Re-resolve the actual plate prefix for this random province
-                    plate_prefixes = {
-                        "北京": "京", "天津": "津", "上海": "沪", "重庆": "渝", "河北": "冀",
-                        "山西": "晋", "辽宁": "辽", "吉林": "吉", "黑龙江": "黑", "江苏": "苏",
-                        "浙江": "浙", "安徽": "皖", "福建": "闽", "江西": "赣", "山东": "鲁",
-                        "河南": "豫", "湖北": "鄂", "湖南": "湘", "广东": "粤", "海南": "琼",
-                        "四川": "川", "贵州": "贵", "云南": "云", "陕西": "陕", "甘肃": "甘",
-                        "青海": "青", "台湾": "台", "内蒙古": "蒙", "广西": "桂", "西藏": "藏",
-                        "宁夏": "宁", "新疆": "新", "香港": "港", "澳门": "澳"
-                    }
-                    p_prefix = "京"
-                    for k, v in plate_prefixes.items():
-                        if k in edu_prov['name']:
-                            p_prefix = v
-                            break
+                    p_prefix = self._plate_prefix_for(edu_prov['name'])
                     city_ltr = self.random_element("ABCDEFGHJKLMNPQRSTUVWXYZ")
                     plate_source['plate_prefix'] = f"{p_prefix}{city_ltr}"
                 
                 # New Energy Vehicles (Green Plates) account for roughly 10% currently, but growing.
-                is_nev = random.random() < 0.15
+                is_nev = self.generator.random.random() < 0.15
                 
                 if is_nev:
                     # NEV plates are 6 digits (e.g., 粤B·D12345 or 粤B·12345D)
                     # D means pure electric, F means hybrid
                     nev_type = self.random_element(["D", "F"])
-                    suffix = f"{nev_type}{self.random_int(10000, 99999)}" if random.random() > 0.5 else f"{self.random_int(10000, 99999)}{nev_type}"
+                    suffix = f"{nev_type}{self.random_int(10000, 99999)}" if self.generator.random.random() > 0.5 else f"{self.random_int(10000, 99999)}{nev_type}"
                 else:
                     # Standard 5 chars, omitting I and O
                     suffix = "".join(self.random_element("ABCDEFGHJKLMNPQRSTUVWXYZ0123456789") for _ in range(5))
@@ -971,61 +1520,57 @@ class PersonaProvider(BaseProvider):
                 if 'plate_prefix' in plate_source:
                     target_prefix = plate_source['plate_prefix']
                 else:
-                    plate_prefixes = {
-                        "北京": "京", "天津": "津", "上海": "沪", "重庆": "渝", "河北": "冀",
-                        "山西": "晋", "辽宁": "辽", "吉林": "吉", "黑龙江": "黑", "江苏": "苏",
-                        "浙江": "浙", "安徽": "皖", "福建": "闽", "江西": "赣", "山东": "鲁",
-                        "河南": "豫", "湖北": "鄂", "湖南": "湘", "广东": "粤", "海南": "琼",
-                        "四川": "川", "贵州": "贵", "云南": "云", "陕西": "陕", "甘肃": "甘",
-                        "青海": "青", "台湾": "台", "内蒙古": "蒙", "广西": "桂", "西藏": "藏",
-                        "宁夏": "宁", "新疆": "新", "香港": "港", "澳门": "澳"
-                    }
-                    p_prefix = "京"
-                    for k, v in plate_prefixes.items():
-                        if k in str(plate_source.get('province', '')):
-                            p_prefix = v
-                            break
+                    p_prefix = self._plate_prefix_for(str(plate_source.get('province', '')))
                     target_prefix = f"{p_prefix}{self.random_element('ABCDEFGHJKLMNPQRSTUVWXYZ')}"
                     
                 vehicle_plate = f"{target_prefix}·{suffix}"
             else:
                 vehicle_plate = "无"
 
+        out["asset.vehicle_plate"] = vehicle_plate
+
+    def _resolve_internet(self, ctx, out):
+        kwargs = ctx["kwargs"]
+        job, salary, username = ctx["job"], ctx["salary"], ctx["username"]
+
+        guid = kwargs.get("guid") or str(self.generator.uuid4())
+
         # Web Devices Based on Persona properties
         final_salary = float(salary.replace("￥", "").replace(",", "")) if salary != "￥0" else 0
-        if final_salary > 15000 or any(kw in job for kw in ["高管", "CEO", "总裁", "总监"]):
+        profile = self._job_profile(job)
+        if final_salary > 15000 or profile.executive:
             # High income: iOS highly popular, Harmony strong, Android less dominant
-            os_choices_weights = [("iOS 17", 0.45), ("HarmonyOS 4", 0.35), ("macOS Sonoma", 0.1), ("Android 14", 0.1)]
-            ua = "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1" if random.random() > 0.5 else "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15"
+            os_table = self._os_tables["high"]
+            ua = "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1" if self.generator.random.random() > 0.5 else "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15"
         elif final_salary > 6000:
             # Middle income: Android leading, Harmony and iOS balanced
-            os_choices_weights = [("Android 14", 0.50), ("HarmonyOS 4", 0.25), ("iOS 17", 0.20), ("Windows 11", 0.05)]
+            os_table = self._os_tables["middle"]
             ua = self.generator.user_agent()
         else:
             # Low income / Students: Android dominant (~75%), some HarmonyOS/iOS
-            os_choices_weights = [("Android 13", 0.45), ("Android 14", 0.30), ("HarmonyOS 3", 0.15), ("iOS 16", 0.08), ("Windows 10", 0.02)]
+            os_table = self._os_tables["low"]
             ua = self.generator.user_agent()
             
-        r_val = random.random()
-        upto = 0
-        os_name = os_choices_weights[-1][0]
-        for v, w in os_choices_weights:
-            if upto + w > r_val:
-                os_name = v
-                break
-            upto += w
-            
+        os_name = os_table.sample(self.generator.random)
         os_name = kwargs.get("os") or os_name
         ua = kwargs.get("user_agent") or ua
         
         # Only computer industry workers get a personal web home domain
-        is_tech = any(kw in job for kw in ["架构师", "程序员", "开发", "IT", "软件工程", "测试", "算法", "后端", "前端", "网络工程", "网络安全", "运维", "数据"])
-        if is_tech:
+        if profile.web_tech:
             web_home_domain = self.random_element(["github.io", "me", "com", "net", "org", "io"])
             web_home = kwargs.get("web_home") or f"https://{username}.{web_home_domain}"
         else:
             web_home = kwargs.get("web_home") or "无"
 
+        out["internet.guid"] = guid
+        out["internet.user_agent"] = ua
+        out["internet.os"] = os_name
+        out["internet.web_home"] = web_home
+
+    def _resolve_security(self, ctx, out):
+        kwargs = ctx["kwargs"]
+        hometown_data = ctx["hometown_data"]
+
         # Contextual Security Question/Answer
         sec_pairs = [
             ("你母亲的名字叫什么？", self.random_element(["王淑芳", "李美玲", "张爱华", "刘兰英"])),
@@ -1036,159 +1581,63 @@ class PersonaProvider(BaseProvider):
         chosen_pair = self.random_element(sec_pairs)
         sec_q = kwargs.get("security_question") or chosen_pair[0]
         sec_a = kwargs.get("security_answer") or chosen_pair[1]
+        out["social.security_question"] = sec_q
+        out["social.security_answer"] = sec_a
 
-        result = {
-            "name": name,
-            "gender": gender_val,
-            "age": age,
-            "birth_date": birth_date.strftime("%Y-%m-%d"),
-            "ssn": ssn,
-            "email": email,
-            "yopmail": yopmail_account,
-            "yopmail_url": yopmail_url,
-            "username": username,
-            "password": strong_password,
-            "strong_password": strong_password,
-            "common_password": common_password,
-            "common_password_upper": common_password_upper,
-            "ethnicity": ethnicity,
-            "bank_card": bank_card,
-            "bank_name": bank_name,
-            "mbti": mbti,
-            "physical": {
-                "height": height,
-                "weight": weight,
-                "blood_type": blood_type
-            },
-            "hometown": {
-                "province": hometown_data['province'],
-                "city": hometown_data['city'],
-                "area": hometown_data['area'],
-                "address": hometown_data['address'],
-                "postcode": self._generate_realistic_postcode(
-                    full_pc_index,
-                    hometown_data['province'], 
-                    hometown_data['city'], 
-                    hometown_data['area']
-                )
-            },
-            "workplace": {
-                "province": workplace_data['province'],
-                "city": workplace_data['city'],
-                "area": workplace_data['area'],
-                "address": workplace_data['address'],
-                "company_name": workplace_data.get('company_name', "无"),
-                "company_uscc": workplace_data.get('company_uscc', "无")
-            },
-            "asset": {
-                "vehicle_plate": vehicle_plate
-            },
-            "primary_phone": {
-                "number": primary_phone,
-                "location": workplace_data['city'] if workplace_data['city'] not in ["市辖区", "县", "省直辖县级行政区划"] else workplace_data['province']
-            },
-            "social": {
-                "education": education,
-                "employment": employment,
-                "job": job,
-                "salary": salary,
-                "marital_status": marital_status,
-                "security_question": sec_q,
-                "security_answer": sec_a
-            },
-            "internet": {
-                "guid": guid,
-                "user_agent": ua,
-                "os": os_name,
-                "web_home": web_home
-            }
-        }
-
+    def _resolve_second_phone(self, ctx, out):
         # 7. Secondary Phone / Work location
-        if has_second_phone:
-            if not work_province:
-                other_provs = [p for p in areas if p['name'] != prov_name]
-                if not other_provs:
-                    other_provs = areas
-                w_prov = self.random_element(other_provs)
-                work_prov_name = w_prov['name']
-                w_city_list = w_prov.get('children', [w_prov])
-                w_city = self.random_element(w_city_list)['name']
+        index, prov_data = ctx["index"], ctx["prov_data"]
+        work_province, work_city = ctx["work_province"], ctx["work_city"]
+        if not work_province:
+            other_provs = index.other_provinces(prov_data) or index.provinces
+            w_prov = self.random_element(other_provs)
+            work_prov_name = w_prov['name']
+            w_city_data = self.random_element(index.children(w_prov))
+            w_city = w_city_data['name']
+            w_phone_code = w_city_data['code']
+        else:
+            work_prov_name = work_province
+            matched_provs = index.match_provinces(work_province)
+            work_city_list = index.children(matched_provs[0]) if matched_provs else index.provinces
+            if work_city:
+                w_city = work_city
+                w_city_matches = index.match_children(matched_provs[0], work_city) if matched_provs else []
+                w_phone_code = w_city_matches[0]['code'] if w_city_matches else (matched_provs[0]['code'] if matched_provs else None)
             else:
-                work_prov_name = work_province
-                work_city_list = next((p.get('children', [p]) for p in areas if work_province in p['name']), areas)
-                w_city = work_city if work_city else self.random_element(work_city_list)['name']
-
-            w_addr_prov_key = work_prov_name.replace("市", "").replace("省", "").replace("自治区", "")
-            w_addr_city = w_city
-            if w_addr_prov_key in ["北京", "上海", "天津", "重庆"] and w_city in ["市辖区", "县"]:
-                w_addr_city = ""
-            elif w_city in ["省直辖县级行政区划", "自治区直辖县级行政区划"]:
-                w_addr_city = ""
-
-            secondary_phone = self._get_phone_number(phones, work_prov_name, w_city)
-            result["secondary_phone"] = {
-                "number": secondary_phone,
-                "location": f"{work_prov_name}{w_addr_city}" if w_addr_city else work_prov_name
-            }
-            result["work_location"] = {
-                "province": work_prov_name,
-                "city": w_city
-            }
-        elif not has_second_phone and "secondary_phone" in result:
-            del result["secondary_phone"]
-
-        # 8. Add AI story
-        if use_ai:
-            from .ai_story import generate_ai_story, generate_ai_image
-            config = ai_config or {}
-            ai_data = generate_ai_story(result, config)
-            if ai_data:
-                result.update(ai_data)
-                
-            # 9. Optional: Generate AI Avatar Image
-            img_key = config.get("image_api_key")
-            if img_key and "image_prompt" in result:
-                img_url = generate_ai_image(result["image_prompt"], img_key)
-                if img_url:
-                    result["avatar_url"] = img_url
-
-        if fields:
-            return self._filter_by_fields(result, fields)
-
-        return result
-
-    def _get_phone_number(self, phones, p_name: str, c_name: str):
-        p_key = p_name.replace("市", "").replace("省", "").replace("自治区", "")
-        matched_prov = next((k for k in phones.keys() if p_key in k or k in p_key), None)
-        if matched_prov:
-            city_dict = phones[matched_prov]
-            c_key = c_name.replace("市", "").replace("地区", "").replace("盟", "")
-            if p_key in ["北京", "上海", "天津", "重庆"] and c_key in ["辖区", "市辖区", "县"]:
-                c_key = p_key
-            matched_city = next((k for k in city_dict.keys() if c_key in k or k in c_key), None)
-            if matched_city:
-                prefixes = city_dict[matched_city]
-                if prefixes:
-                    prefix = self.random_element(prefixes)
-                    suffix = f"{self.random_int(min=0, max=9999):04d}"
-                    return f"{prefix}{suffix}"
+                w_city_data = self.random_element(work_city_list)
+                w_city = w_city_data['name']
+                w_phone_code = w_city_data['code']
+
+        w_addr_prov_key = work_prov_name.replace("市", "").replace("省", "").replace("自治区", "")
+        w_addr_city = w_city
+        if w_addr_prov_key in ["北京", "上海", "天津", "重庆"] and w_city in ["市辖区", "县"]:
+            w_addr_city = ""
+        elif w_city in ["省直辖县级行政区划", "自治区直辖县级行政区划"]:
+            w_addr_city = ""
+
+        out["secondary_phone.number"] = self._get_phone_number(self._load_phones(), w_phone_code)
+        out["secondary_phone.location"] = f"{work_prov_name}{w_addr_city}" if w_addr_city else work_prov_name
+        out["work_location.province"] = work_prov_name
+        out["work_location.city"] = w_city
+
+    def _get_phone_number(self, phones, code: Optional[str]):
+        # Prefix pool precomputed per city code (falling back to the province)
+        pool = phones.pool(code)
+        if pool:
+            prefix = pool.prefix_at(self.random_int(min=0, max=pool.total - 1))
+            suffix = f"{self.random_int(min=0, max=9999):04d}"
+            return f"{prefix}{suffix}"
         try: return self.generator.phone_number()
         except AttributeError: return f"13{self.random_int(min=0,max=9)}{self.random_int(min=0,max=99999999):08d}"
 
     def era_given_name(self, birth_year: Optional[int] = None, gender: Optional[str] = None) -> str:
         if not gender:
-            gender = random.choices(['男', '女'], weights=[51.24, 48.76], k=1)[0]
+            gender = self._gender_table.sample(self.generator.random)
         is_m = gender in ['男', 'M']
 
         if birth_year is None:
-            age_bucket = random.choices(["0-14", "15-59", "60-90"], weights=[17.95, 63.35, 18.70], k=1)[0]
-            if age_bucket == "0-14":
-                age = self.random_int(1, 14)
-            elif age_bucket == "15-59":
-                age = self.random_int(15, 59)
-            else:
-                age = self.random_int(60, 90)
+            min_age, max_age = self._age_bucket_table.sample(self.generator.random)
+            age = self.random_int(min_age, max_age)
             birth_year = date.today().year - age
 
         # 1. 性别与时代的特征字库 (Strict Era & Gender Separation)
@@ -1218,7 +1667,7 @@ class PersonaProvider(BaseProvider):
         else: # 2010+
             trad_prob, mid_prob, mil_prob = 0.01, 0.04, 0.15
 
-        r_val = random.random()
+        r_val = self.generator.random.random()
         if r_val < generic_prob:
              return self.generator.first_name_male() if is_m else self.generator.first_name_female()
         elif r_val < generic_prob + trad_prob:
@@ -1256,45 +1705,19 @@ class PersonaProvider(BaseProvider):
     def first_name_female(self) -> str:
         return self.era_given_name(gender='女')
 
-    def _generate_realistic_postcode(self, full_pc_index, p_n, c_n, a_n):
-        # Precision candidates (Specific to General)
-        # Handle Municipality redundancy (e.g., Beijing Beijing)
-        clean_p = p_n.replace('省','').replace('市','').replace('自治区','')
-        clean_c = c_n.replace('市','').replace('地区','').replace('盟','')
-        
-        candidates = [
-            f"{p_n}{c_n}{a_n}",
-            f"{clean_p}{c_n}{a_n}",
-            f"{c_n}{a_n}",
-            a_n, # Direct County/District match (vulnerable to duplicate names, but usually fine in context)
-            f"{p_n}{c_n}",
-            p_n
-        ]
-        for cand in candidates:
-            if cand in full_pc_index:
-                return full_pc_index[cand]
-        
-        # Fallback to prefix-based random generation if not in DB
-        prefix = "00"
-        postcode_map = {
-            "北京": "10", "上海": "20", "天津": "30", "重庆": "40",
-            "辽宁": "11", "吉林": "13", "黑龙江": "15", "江苏": "21",
-            "浙江": "31", "安徽": "23", "福建": "35", "内蒙古": "01",
-            "江西": "33", "山东": "25", "河南": "45", "湖北": "43",
-            "湖南": "41", "广东": "51", "广西": "53", "海南": "57",
-            "四川": "61", "贵州": "55", "云南": "65", "西藏": "85",
-            "陕西": "71", "甘肃": "73", "青海": "81", "宁夏": "75",
-            "新疆": "83", "河北": "05", "山西": "03"
-        }
-        for k, v in postcode_map.items():
-            if k in p_n:
-                prefix = v
-                break
-        return f"{prefix}{self.random_int(min=0, max=9999):04d}"
+    def _generate_realistic_postcode(self, full_pc_index, area_code):
+        # Precomputed per area code (falling back to city, then province)
+        pc = full_pc_index.get(area_code)
+        if pc:
+            return pc
+
+        # Fallback to a random postcode inside the province's prefix range
+        lo, hi = full_pc_index.fallback_range(area_code)
+        return f"{self.random_int(min=lo, max=hi):06d}"
 
     def _get_realistic_blood(self):
-        bt = self.random_element(["O"] * 32 + ["A"] * 28 + ["B"] * 30 + ["AB"] * 10)
-        rh = "-" if random.random() < 0.003 else "+"
+        bt = self._blood_table.sample(self.generator.random)
+        rh = "-" if self.generator.random.random() < 0.003 else "+"
         return f"{bt}{rh}"
 
     def _get_pinyin_initials(self, name: str) -> str:
@@ -1322,79 +1745,56 @@ class PersonaProvider(BaseProvider):
         return self.generator.user_name()
 
     def _generate_weighted_email(self, un: str, a: int, job_title: str):
-        r = random.random()
-        
         # Identify if the job requires/allows access to international services
-        is_tech_foreign = any(kw in job_title for kw in ["架构师", "程序员", "开发", "IT", "研究员", "科学家", "外贸", "外资"])
+        is_tech_foreign = self._job_profile(job_title).tech_foreign
         
-        if a < 25:
-            # Young/Student: Extreme QQ dominance (approx 80%), some 163 (15%)
-            providers = [("qq.com", 0.80), ("163.com", 0.15), ("outlook.com", 0.04)]
-            if is_tech_foreign: providers.append(("gmail.com", 0.01))
-            else: providers.append(("126.com", 0.01))
-        elif a < 45:
-            # Working age: Mixed. QQ heavily popular but 163/126 catches up for work.
-            providers = [("qq.com", 0.50), ("163.com", 0.35), ("126.com", 0.05), ("foxmail.com", 0.05), ("outlook.com", 0.03)]
-            if is_tech_foreign: providers.append(("gmail.com", 0.02))
-            else: providers.append(("yeah.net", 0.02))
-        else:
-            # Older: 163, qq dominant
-            providers = [("163.com", 0.45), ("qq.com", 0.40), ("sina.com", 0.10), ("126.com", 0.03), ("hotmail.com", 0.02)]
-        
-        total = sum(w for p, w in providers)
-        rand_val = random.uniform(0, total)
-        upto = 0
-        chosen_domain = providers[0][0]
-        for p, w in providers:
-            if upto + w >= rand_val:
-                chosen_domain = p
-                break
-            upto += w
+        band = "<25" if a < 25 else ("<45" if a < 45 else "45+")
+        chosen_domain = self._email_tables[(band, is_tech_foreign)].sample(self.generator.random)
         return f"{un}@{chosen_domain}"
 
-    def _get_realistic_job(self):
-        rare_keywords = [
-            "星探", "经纪人", "体验师", "鉴定师", "潜水", "飞行", "演艺", "教练", 
-            "CEO", "总裁", "总经理", "总监", "首席", "外交", "基金经理", "操盘手", 
-            "架构师", "科学家", "研究员", "高级", "专家", "舰长", "法官", "检察", "市长"
-        ]
-        # Statistically shift jobs to grassroots level
-        for _ in range(50):  # Prevent infinite loop, increased attempts to find normal jobs
-            candidate = self.generator.job()
-            if not any(kw in candidate for kw in rare_keywords):
-                # To enforce "70% < 5000", if it's a regular white-collar job, slightly decrease its chance compared to blue collar
-                # We skip this deep filtering logic here as salaries are bound directly, but keeping high-end role scarcity is enough
-                return candidate
-            if random.random() < 0.005:  # 0.5% drop rate for rare / elite jobs
-                return candidate
-        return "销售员" # Fallback to a very common job if loop fails
+    def _get_realistic_job(self, junior: bool = False):
+        # Statistically shift jobs to grassroots level: one draw from the rarity-weighted catalog
+        return self._job_catalog().sample(self.generator.random, junior)
+
+    _job_catalogs: Dict[type, JobCatalog] = {}
+    _job_classifier = None
+
+    def _job_catalog(self) -> JobCatalog:
+        # One catalog per job provider (i.e. per locale), built from its job list
+        job_provider = getattr(self.generator.job, "__self__", None)
+        key = type(job_provider)
+        catalog = self._job_catalogs.get(key)
+        if catalog is None:
+            catalog = JobCatalog(getattr(job_provider, "jobs", ()), self._load_job_classifier())
+            self._job_catalogs[key] = catalog
+        return catalog
+
+    @classmethod
+    def _load_job_classifier(cls) -> JobClassifier:
+        if cls._job_classifier is None:
+            cls._job_classifier = JobClassifier(cls._job_salary_mapping)
+        return cls._job_classifier
+
+    def _job_profile(self, job) -> JobProfile:
+        # Memoized per distinct title; job titles repeat heavily across personas
+        return self._load_job_classifier().profile(str(job))
 
     def _get_salary_by_job(self, job_name, job_salary_mapping, city_factor, rural_factor):
         base_val = 8000
-        for keywords, range_vals in job_salary_mapping:
-            if any(kw in job_name for kw in keywords):
-                base_val = self.random_int(min=range_vals[0], max=range_vals[1])
-                break
+        if job_salary_mapping is self._job_salary_mapping:
+            range_vals = self._job_profile(job_name).salary_band
+        else:
+            range_vals = next((band for keywords, band in job_salary_mapping if any(kw in job_name for kw in keywords)), None)
+        if range_vals:
+            base_val = self.random_int(min=range_vals[0], max=range_vals[1])
         
         # Apply multipliers
         final_val = float(base_val) * city_factor * rural_factor
         return f"￥{int(final_val // 100 * 100)}"
 
     def _generate_luhn(self, prefix, length=19):
-        digits = [int(d) for d in str(prefix)]
-        while len(digits) < length - 1:
-            digits.append(self.random_int(0, 9))
-        
-        # Luhn calculation
-        checksum = 0
-        for i, d in enumerate(reversed(digits)):
-            if i % 2 == 0:
-                d *= 2
-                if d > 9: d -= 9
-            checksum += d
-        check_digit = (10 - (checksum % 10)) % 10
-        digits.append(check_digit)
-        return "".join(map(str, digits))
+        body = str(prefix) + "".join(str(self.random_int(0, 9)) for _ in range(length - 1 - len(str(prefix))))
+        return body + luhn_check_digit(body)
 
 class Provider(PersonaProvider):
     pass
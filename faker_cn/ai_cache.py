@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .cache import cache_dir
+
+# Opened caches by path, so every caller sharing a file also shares its counters
+_caches: Dict[str, "AICache"] = {}
+_caches_lock = threading.Lock()
+
+
+class AICache:
+    """
+    On-disk cache of AI responses in SQLite, keyed by a hash of the full request
+    (endpoint, model, system prompt, temperature and persona fields).
+    Entries older than `max_age` seconds expire; past `max_entries` the least
+    recently used are evicted.
+    """
+
+    _EVICT_EVERY = 256
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 100000,
+                 max_age: Optional[float] = 30 * 86400):
+        self.path = path or os.path.join(cache_dir(), "ai-cache.sqlite3")
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self.evict()
+
+    @staticmethod
+    def key(url: str, payload: Dict[str, Any]) -> str:
+        blob = json.dumps([url, payload], ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Any:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or (self.max_age is not None and now - row[1] > self.max_age):
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            self._puts += 1
+            due = self._puts % self._EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def evict(self) -> None:
+        with self._lock:
+            if self.max_age is not None:
+                self._db.execute("DELETE FROM entries WHERE created < ?", (time.time() - self.max_age,))
+            if self.max_entries is not None:
+                self._db.execute(
+                    "DELETE FROM entries WHERE key IN "
+                    "(SELECT key FROM entries ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+                "path": self.path,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def open_cache(spec: Any = True) -> Optional[AICache]:
+    """
+    The cache selected by an ai_config "cache" value: an AICache, a file path,
+    True for the default file in the user cache directory, or None/False for none.
+    """
+    if not spec:
+        return None
+    if isinstance(spec, AICache):
+        return spec
+    path = os.path.abspath(spec if isinstance(spec, str) else os.path.join(cache_dir(), "ai-cache.sqlite3"))
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = AICache(path)
+        return cache
+
+
+def cached(config: Dict[str, Any], url: str, payload: Dict[str, Any], fetch) -> Any:
+    """
+    fetch() through the cache configured in `config`; failures (None) are not stored.
+    """
+    cache = open_cache(config.get("cache"))
+    if cache is None:
+        return fetch()
+    key = cache.key(url, payload)
+    value = cache.get(key)
+    if value is None:
+        value = fetch()
+        if value is not None:
+            cache.put(key, value)
+    return value
@@ -1,97 +1,217 @@
 import json
 import urllib.request
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from .ai_cache import cached, open_cache
 
-def generate_ai_story(persona: Dict[str, Any], config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    """
-    Generate an AI life story and image prompt based on the provided persona dictionary.
-    No extra dependencies: purely uses urllib.request to hit OpenAI-compatible endpoints.
-    """
-    api_key = config.get("api_key")
-    if not api_key:
-        print("Warning: use_ai=True but no api_key provided. Skipping AI generation.")
-        return None
 
-    base_url = config.get("base_url", "https://api.deepseek.com/chat/completions")
-    model = config.get("model", "deepseek-chat")
-
-    system_prompt = (
-        "你是一个极其严格的虚拟人物画像生成引擎的后台节点。请基于用户上传的核心设定字典（JSON形式），"
-        "为该人物生成一段符合社会发展客观规律的人生经历/故事（不多于200字）。"
-        "绝对规则："
-        "1. 绝不允许编造不存在的学校、公司、或者地理位置（例如不存在的街道）。"
-        "2. 不要出现时空错乱（如07年在北京奥运当旗手等违背物理规律的事件）。"
-        "3. 户籍地必须和人生早期轨迹或籍贯吻合。如果有主手机号（primary_phone）和所在地，必须体现出他在该地生活过。"
-        "如果有副手机号（secondary_phone）和工作地，必须让该地成为他人生的重要轨迹（如读大学或当前长期工作）。"
-        "4. 从故事中提取一段稳定的 midjourney 可用的英文 Prompt，描述其外貌风格（符合年龄和职业，不带复杂背景）。"
-        "**极其重要**：英文 Prompt 必须明确要求这是一张**极其写实的真人类照片 (photorealistic, raw photo, highly detailed skin texture, 8k uhd, cinematic lighting)**，"
-        "是一张**正式的、免冠的、正面看向镜头的证件照 (formal ID photo, passport photo, frontal face, facing camera)**，并且**背景必须是纯蓝色 (solid blue background, exact hex color code #438EDB)**。"
-        "5. 返回纯 JSON 格式（不带任何 markdown 标记如 ```json ），包含且仅包含两个字段：'life_story' (字符串), 'image_prompt' (字符串)。"
-    )
+DEFAULT_STORY_URL = "https://api.deepseek.com/chat/completions"
+DEFAULT_STORY_MODEL = "deepseek-chat"
+DEFAULT_IMAGE_URL = "https://api.siliconflow.cn/v1/images/generations"
+DEFAULT_IMAGE_MODEL = "black-forest-labs/FLUX.1-schnell"
 
-    user_prompt = json.dumps(persona, ensure_ascii=False)
+_PROMPT_RULES = (
+    "你是一个极其严格的虚拟人物画像生成引擎的后台节点。请基于用户上传的核心设定字典（JSON形式），"
+    "为该人物生成一段符合社会发展客观规律的人生经历/故事（不多于200字）。"
+    "绝对规则："
+    "1. 绝不允许编造不存在的学校、公司、或者地理位置（例如不存在的街道）。"
+    "2. 不要出现时空错乱（如07年在北京奥运当旗手等违背物理规律的事件）。"
+    "3. 户籍地必须和人生早期轨迹或籍贯吻合。如果有主手机号（primary_phone）和所在地，必须体现出他在该地生活过。"
+    "如果有副手机号（secondary_phone）和工作地，必须让该地成为他人生的重要轨迹（如读大学或当前长期工作）。"
+    "4. 从故事中提取一段稳定的 midjourney 可用的英文 Prompt，描述其外貌风格（符合年龄和职业，不带复杂背景）。"
+    "**极其重要**：英文 Prompt 必须明确要求这是一张**极其写实的真人类照片 (photorealistic, raw photo, highly detailed skin texture, 8k uhd, cinematic lighting)**，"
+    "是一张**正式的、免冠的、正面看向镜头的证件照 (formal ID photo, passport photo, frontal face, facing camera)**，并且**背景必须是纯蓝色 (solid blue background, exact hex color code #438EDB)**。"
+)
+SYSTEM_PROMPT = _PROMPT_RULES + (
+    "5. 返回纯 JSON 格式（不带任何 markdown 标记如 ```json ），包含且仅包含两个字段：'life_story' (字符串), 'image_prompt' (字符串)。"
+)
+# Several personas per request: the rules are sent once instead of once per persona
+BATCH_SYSTEM_PROMPT = _PROMPT_RULES + (
+    "5. 用户上传的是一个 JSON 数组，每个元素形如 {'index': 序号, 'persona': 核心设定字典}，请为每个人物分别独立生成，互不关联。"
+    "返回纯 JSON 对象（不带任何 markdown 标记如 ```json ），仅包含一个字段 'results'：数组，每个输入人物对应一个元素，"
+    "每个元素包含且仅包含三个字段：'index' (整数，与输入序号一致), 'life_story' (字符串), 'image_prompt' (字符串)。"
+)
 
+
+def story_request(persona: Dict[str, Any], config: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """
+    (url, JSON payload) of the chat completion request for one persona.
+    """
     payload = {
-        "model": model,
+        "model": config.get("model", DEFAULT_STORY_MODEL),
         "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": json.dumps(persona, ensure_ascii=False)}
         ],
         "temperature": 0.4,
         "response_format": {"type": "json_object"}
     }
+    return config.get("base_url", DEFAULT_STORY_URL), payload
 
-    try:
-        req = urllib.request.Request(
-            base_url,
-            data=json.dumps(payload).encode('utf-8'),
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}"
-            }
-        )
-        with urllib.request.urlopen(req, timeout=40) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            content = result["choices"][0]["message"]["content"]
-            # Basic cleanup in case the model returns markdown codeblocks anyway
-            content = content.replace("```json", "").replace("```", "").strip()
-            return json.loads(content)
-    except Exception as e:
-        print(f"Warning: AI generation failed request: {e}")
-        return None
 
+def _message_json(result: Dict[str, Any]) -> Any:
+    content = result["choices"][0]["message"]["content"]
+    # Basic cleanup in case the model returns markdown codeblocks anyway
+    content = content.replace("```json", "").replace("```", "").strip()
+    return json.loads(content)
 
-def generate_ai_image(prompt: str, api_key: str) -> Optional[str]:
+
+def parse_story(result: Dict[str, Any]) -> Dict[str, Any]:
+    return _message_json(result)
+
+
+def story_batch_request(personas: List[Dict[str, Any]], config: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
     """
-    Generate an AI image using SiliconFlow API with FLUX.1-schnell
+    (url, JSON payload) of one chat completion request covering several personas.
     """
-    if not api_key:
-        return None
-        
-    url = "https://api.siliconflow.cn/v1/images/generations"
+    items = [{"index": i, "persona": p} for i, p in enumerate(personas)]
+    url, payload = story_request({}, config)
+    payload["messages"] = [
+        {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+        {"role": "user", "content": json.dumps(items, ensure_ascii=False)}
+    ]
+    return url, payload
+
+
+def parse_story_batch(result: Dict[str, Any], n: int) -> Dict[int, Dict[str, Any]]:
+    """
+    {index: {life_story, image_prompt}} for the well-formed entries of a batched
+    reply; missing, duplicated or malformed entries are left out.
+    """
+    data = _message_json(result)
+    items = data.get("results") if isinstance(data, dict) else data
+    stories = {}
+    seen = set()
+    for item in items if isinstance(items, list) else ():
+        if not isinstance(item, dict):
+            continue
+        i = item.get("index")
+        story = {k: item.get(k) for k in ("life_story", "image_prompt")}
+        if not isinstance(i, int) or not 0 <= i < n or i in seen:
+            stories.pop(i, None)
+            continue
+        seen.add(i)
+        if all(isinstance(v, str) and v.strip() for v in story.values()):
+            stories[i] = story
+    return stories
+
+
+def story_batch(personas: List[Dict[str, Any]], config: Dict[str, Any], post, batch_size: int) -> List[Optional[Dict[str, Any]]]:
+    """
+    Stories for `personas`, `batch_size` per request through `post(url, payload, timeout)`.
+    Cached personas are skipped, and any persona the batched reply does not cover
+    is retried on its own. Failures come back as None.
+    """
+    cache = open_cache(config.get("cache"))
+    timeout = config.get("timeout", 40)
+    stories = [None] * len(personas)
+    keys = [None] * len(personas)
+    todo = []
+    for i, persona in enumerate(personas):
+        if cache is not None:
+            # Batched replies are stored under the single-persona request, so both modes share entries
+            keys[i] = cache.key(*story_request(persona, config))
+            stories[i] = cache.get(keys[i])
+        if stories[i] is None:
+            todo.append(i)
+
+    for start in range(0, len(todo), max(1, batch_size)):
+        chunk = todo[start:start + max(1, batch_size)]
+        if len(chunk) > 1:
+            try:
+                url, payload = story_batch_request([personas[i] for i in chunk], config)
+                # The reply grows with the batch, and so does the time to generate it
+                parsed = parse_story_batch(post(url, payload, timeout * len(chunk)), len(chunk))
+            except Exception as e:
+                print(f"Warning: batched AI generation failed, retrying one by one: {e}")
+                parsed = {}
+            for j, i in enumerate(chunk):
+                stories[i] = parsed.get(j)
+
+        for i in chunk:
+            if stories[i] is not None:
+                continue
+            try:
+                url, payload = story_request(personas[i], config)
+                stories[i] = parse_story(post(url, payload, timeout))
+            except Exception as e:
+                print(f"Warning: AI generation failed request: {e}")
+        if cache is not None:
+            for i in chunk:
+                if stories[i] is not None:
+                    cache.put(keys[i], stories[i])
+    return stories
+
+
+def image_request(prompt: str, config: Optional[Dict[str, Any]] = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    (url, JSON payload) of the image generation request for a prompt.
+    """
+    config = config or {}
     payload = {
-        "model": "black-forest-labs/FLUX.1-schnell",
+        "model": config.get("image_model", DEFAULT_IMAGE_MODEL),
         "prompt": prompt,
         "image_size": "768x1024"
     }
+    return config.get("image_base_url", DEFAULT_IMAGE_URL), payload
+
+
+def parse_image(result: Dict[str, Any]) -> Optional[str]:
+    if "images" in result and len(result["images"]) > 0:
+        return result["images"][0].get("url")
+    elif "data" in result and len(result["data"]) > 0:
+        return result["data"][0].get("url")
+    return None
+
+
+def _post(url: str, payload: Dict[str, Any], api_key: str, timeout: float) -> Dict[str, Any]:
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode('utf-8'),
+        headers={
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        }
+    )
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+def generate_ai_story(persona: Dict[str, Any], config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Generate an AI life story and image prompt based on the provided persona dictionary.
+    No extra dependencies: purely uses urllib.request to hit OpenAI-compatible endpoints.
+    For many personas use faker_cn.enrich.enrich(), which runs the requests concurrently.
+    """
+    return generate_ai_stories([persona], config, batch_size=1)[0]
+
+
+def generate_ai_stories(personas: List[Dict[str, Any]], config: Dict[str, Any], batch_size: int = 8) -> List[Optional[Dict[str, Any]]]:
+    """
+    generate_ai_story() for several personas, packing `batch_size` of them into
+    each request. None for the personas whose story could not be generated.
+    """
+    api_key = config.get("api_key")
+    if not api_key:
+        print("Warning: use_ai=True but no api_key provided. Skipping AI generation.")
+        return [None] * len(personas)
+
+    def post(url, payload, timeout):
+        return _post(url, payload, api_key, timeout)
+
+    return story_batch(personas, config, post, batch_size)
+
+
+def generate_ai_image(prompt: str, api_key: str, config: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """
+    Generate an AI image using SiliconFlow API with FLUX.1-schnell
+    """
+    if not api_key:
+        return None
 
     try:
-        req = urllib.request.Request(
-            url,
-            data=json.dumps(payload).encode('utf-8'),
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}"
-            }
-        )
-        with urllib.request.urlopen(req, timeout=60) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            if "images" in result and len(result["images"]) > 0:
-                return result["images"][0].get("url")
-            elif "data" in result and len(result["data"]) > 0:
-                return result["data"][0].get("url")
-            return None
+        url, payload = image_request(prompt, config)
+        return cached(config or {}, url, payload, lambda: parse_image(_post(url, payload, api_key, timeout=60)))
     except Exception as e:
         print(f"Warning: Image generation failed: {e}")
         return None
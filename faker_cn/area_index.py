@@ -0,0 +1,184 @@
+from typing import Dict, List, Optional, Tuple
+
+
+class AreaIndex:
+    """
+    Precomputed lookups over the nested administrative division tree (areas.json).
+
+    Nodes are the original ``{"code", "name", "children"}`` dicts, so callers can keep
+    reading ``node['name']`` and ``node['code']``. The index adds O(1) lookup by code,
+    by full / short name and by alias, child arrays with the "leaf falls back to itself"
+    rule already applied, and memoized substring matching for user constraints.
+    """
+
+    # Suffixes stripped to build the short province name, e.g. 广西壮族自治区 -> 广西
+    _SHORT_SUFFIXES = ("省", "市", "自治区", "壮族", "回族", "维吾尔")
+
+    # Common one-character abbreviations (简称) accepted as province aliases
+    _ABBREVIATIONS = {
+        "北京": "京", "天津": "津", "上海": "沪", "重庆": "渝", "河北": "冀",
+        "山西": "晋", "辽宁": "辽", "吉林": "吉", "黑龙江": "黑", "江苏": "苏",
+        "浙江": "浙", "安徽": "皖", "福建": "闽", "江西": "赣", "山东": "鲁",
+        "河南": "豫", "湖北": "鄂", "湖南": "湘", "广东": "粤", "海南": "琼",
+        "四川": "川", "贵州": "黔", "云南": "滇", "陕西": "陕", "甘肃": "甘",
+        "青海": "青", "内蒙古": "蒙", "广西": "桂", "西藏": "藏", "宁夏": "宁",
+        "新疆": "新"
+    }
+
+    # Town name markers of the urban / rural partition (a town may be in both)
+    _URBAN_TOWN_MARKERS = ("街道", "区", "镇", "开发区")
+    _RURAL_TOWN_MARKERS = ("乡", "村", "林场", "农场")
+
+    def __init__(self, areas: List[Dict]):
+        self.provinces = areas
+        self.by_code: Dict[str, Dict] = {}
+        self.parent: Dict[str, Dict] = {}
+        self.short_names: Dict[str, str] = {}
+        self._aliases: Dict[str, Dict] = {}
+        self._children: Dict[str, List[Dict]] = {}
+        self._child_by_name: Dict[str, Dict[str, Dict]] = {}
+        self._match_cache: Dict[tuple, List[Dict]] = {}
+        self._town_splits: Dict[str, Tuple[List[Dict], List[Dict]]] = {}
+
+        for prov in areas:
+            short = self.short_name(prov['name'])
+            self.short_names[prov['code']] = short
+            self._aliases[prov['name']] = prov
+            self._aliases.setdefault(short, prov)
+            abbr = self._ABBREVIATIONS.get(short)
+            if abbr:
+                self._aliases.setdefault(abbr, prov)
+            self._index(prov, None)
+
+        for prov in areas:
+            for city in self.children(prov):
+                for area in self.children(city):
+                    self.town_split(area)
+
+    def _index(self, node: Dict, parent: Optional[Dict]):
+        code = node.get('code', '')
+        self.by_code[code] = node
+        if parent is not None:
+            self.parent[code] = parent
+        kids = node.get('children')
+        if kids:
+            self._children[code] = kids
+            self._child_by_name[code] = {}
+            for kid in kids:
+                self._child_by_name[code].setdefault(kid['name'], kid)
+                self._index(kid, node)
+        else:
+            self._children[code] = [node]
+
+    @classmethod
+    def select(cls, areas: List[Dict], names) -> List[Dict]:
+        """
+        Provinces of `areas` named by any of `names` (full name, short name, abbreviation
+        or substring of the full name), in tree order.
+        """
+        wanted = []
+        for p in areas:
+            abbr = cls._ABBREVIATIONS.get(cls.short_name(p['name']))
+            if any(n in p['name'] or n == abbr for n in names):
+                wanted.append(p)
+        return wanted
+
+    @classmethod
+    def short_name(cls, name: str) -> str:
+        for s in cls._SHORT_SUFFIXES:
+            name = name.replace(s, "")
+        return name
+
+    def node(self, code: str) -> Optional[Dict]:
+        return self.by_code.get(code)
+
+    def lookup(self, name: str) -> Optional[Dict]:
+        """
+        Resolve a province by full name (广东省), short name (广东) or abbreviation (粤).
+        """
+        return self._aliases.get(name)
+
+    def children(self, node: Dict) -> List[Dict]:
+        """
+        Child divisions of `node`; a node without children stands in for its own child.
+        """
+        return self._children.get(node.get('code', ''), [node])
+
+    def towns(self, node: Dict) -> List[Dict]:
+        """
+        Town-level children of an area, or an empty list.
+        """
+        return node.get('children', [])
+
+    def town_split(self, node: Dict) -> Tuple[List[Dict], List[Dict]]:
+        """
+        (urban, rural) towns of an area, by town name; built with the index.
+        """
+        code = node.get('code', '')
+        split = self._town_splits.get(code)
+        if split is None:
+            split = self._town_splits[code] = self.split_towns(self.towns(node))
+        return split
+
+    @classmethod
+    def split_towns(cls, towns: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        return (
+            [t for t in towns if any(kw in t['name'] for kw in cls._URBAN_TOWN_MARKERS)],
+            [t for t in towns if any(kw in t['name'] for kw in cls._RURAL_TOWN_MARKERS)],
+        )
+
+    def child_by_name(self, node: Dict, name: str) -> Optional[Dict]:
+        return self._child_by_name.get(node.get('code', ''), {}).get(name)
+
+    def match_provinces(self, query: str) -> List[Dict]:
+        """
+        Provinces whose name contains `query`, falling back to alias resolution.
+        Results are memoized per query, so repeated constraints cost a dict hit.
+        """
+        key = (None, query)
+        hit = self._match_cache.get(key)
+        if hit is None:
+            hit = [p for p in self.provinces if query in p['name']]
+            if not hit and query in self._aliases:
+                hit = [self._aliases[query]]
+            self._match_cache[key] = hit
+        return hit
+
+    def match_children(self, node: Dict, query: str) -> List[Dict]:
+        """
+        Children of `node` whose name contains `query` (memoized, may be empty).
+        """
+        key = (node.get('code', ''), query)
+        hit = self._match_cache.get(key)
+        if hit is None:
+            hit = [c for c in self.children(node) if query in c['name']]
+            self._match_cache[key] = hit
+        return hit
+
+    def match_any_provinces(self, names: tuple) -> List[Dict]:
+        """
+        Provinces whose name contains any of `names`, in tree order (memoized).
+        """
+        key = ("any", names)
+        hit = self._match_cache.get(key)
+        if hit is None:
+            hit = [p for p in self.provinces if any(n in p['name'] for n in names)]
+            self._match_cache[key] = hit
+        return hit
+
+    def other_provinces(self, node: Dict) -> List[Dict]:
+        """
+        Every province except `node` (memoized per province).
+        """
+        key = ("other", node['name'])
+        hit = self._match_cache.get(key)
+        if hit is None:
+            hit = [p for p in self.provinces if p['name'] != node['name']]
+            self._match_cache[key] = hit
+        return hit
+
+    def province_weights(self, weights: Dict[str, float], default: float = 1.0) -> List[float]:
+        """
+        Per-province weights in tree order, keyed by short province name.
+        """
+        return [weights.get(self.short_names[p['code']], default) for p in self.provinces]
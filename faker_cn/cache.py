@@ -0,0 +1,86 @@
+import gc
+import hashlib
+import os
+import pickle
+import sys
+from typing import Any, Callable
+
+
+def cache_dir() -> str:
+    """
+    Per-user directory for files compiled from the bundled datasets.
+    Override with the FAKER_CN_CACHE_DIR environment variable.
+    """
+    env = os.environ.get("FAKER_CN_CACHE_DIR")
+    if env:
+        return env
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "faker_cn")
+
+
+def atomic_write(path: str, data: bytes):
+    """
+    Write `data` to `path` via a temporary file and rename, so concurrent
+    workers never observe a half-written cache file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+# Bump when the pickled classes change shape in a way their module digest does not catch
+_PICKLE_VERSION = 1
+
+
+def digest(*parts) -> str:
+    """
+    Short content hash over files (read in full; a missing file hashes as such) and
+    plain values, used to key compiled caches on everything they were built from.
+    """
+    h = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, str) and os.path.isabs(part):
+            try:
+                with open(part, "rb") as f:
+                    h.update(f.read())
+            except FileNotFoundError:
+                h.update(b"<missing>")
+        else:
+            h.update(repr(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+def load_pickled(name: str, key: str, build: Callable[[], Any]) -> Any:
+    """
+    build() once and pickle the result into the cache directory under `name` and
+    `key`; later processes unpickle it instead of parsing and indexing again.
+    An unreadable or stale cache file is rebuilt, an unwritable directory only
+    costs the rebuild.
+    """
+    path = os.path.join(cache_dir(), f"{name}-v{_PICKLE_VERSION}-{key}.pickle")
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        # Unpickling allocates ~10^5 containers; collections during that are pure overhead
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return pickle.loads(data)
+        finally:
+            if enabled:
+                gc.enable()
+    except Exception:
+        pass
+
+    value = build()
+    try:
+        atomic_write(path, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        pass
+    return value
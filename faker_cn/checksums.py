@@ -0,0 +1,128 @@
+from typing import Dict, List, Sequence
+
+_np = False  # Not looked up yet, see numpy()
+
+# Debit card BINs (first 6 digits) per issuing bank
+BANK_BINS: Dict[str, List[str]] = {
+    "中国工商银行": ["622202", "621226", "622208"],
+    "中国农业银行": ["622848", "622845", "622822"],
+    "中国银行": ["621661", "621660", "456350"],
+    "中国建设银行": ["621700", "621081", "623668"]
+}
+
+# GB 11643-1999 (ID card) Mod 11-2: weights of the first 17 digits, check character by remainder
+SSN_WEIGHTS = (7, 9, 10, 5, 8, 4, 2, 1, 6, 3, 7, 9, 10, 5, 8, 4, 2)
+SSN_CHECK_CODES = "10X98765432"
+
+# GB 32100-2015 (unified social credit code): 31-character alphabet and position weights
+USCC_CHARS = "0123456789ABCDEFGHJKLMNPQRTUWXY"
+USCC_WEIGHTS = (1, 3, 9, 27, 19, 26, 16, 17, 20, 29, 25, 13, 8, 24, 10, 30, 28)
+# Registration authority + entity type: 91 enterprise, 92 individual business, 93 farmers' cooperative
+USCC_ORG_TYPES = ("91", "92", "93")
+_USCC_VALUES = {c: i for i, c in enumerate(USCC_CHARS)}
+
+
+def numpy():
+    """
+    The numpy module, or None when it is not installed (optional: pip install faker-cn[fast]).
+    Imported on first use, so `import faker_cn` does not pay for it.
+    """
+    global _np
+    if _np is False:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        _np = np
+    return _np
+
+
+def ssn_check_char(body: str) -> str:
+    return SSN_CHECK_CODES[sum(int(body[i]) * SSN_WEIGHTS[i] for i in range(17)) % 11]
+
+
+def luhn_check_digit(body: str) -> str:
+    """
+    Luhn check digit for a card number body (every digit but the last).
+    """
+    checksum = 0
+    for i, ch in enumerate(reversed(body)):
+        d = int(ch)
+        if i % 2 == 0:
+            d *= 2
+            if d > 9: d -= 9
+        checksum += d
+    return str((10 - checksum % 10) % 10)
+
+
+def uscc_check_char(body: str) -> str:
+    """
+    GB 32100 check character for the first 17 characters of a USCC.
+    """
+    mod = sum(_USCC_VALUES[c] * w for c, w in zip(body, USCC_WEIGHTS)) % 31
+    return USCC_CHARS[(31 - mod) % 31]
+
+
+def bank_cards(rng, n: int, bins: Sequence[str], length: int = 19) -> List[str]:
+    """
+    `n` Luhn-valid card numbers with a uniformly drawn BIN from `bins`.
+    `rng` is a numpy Generator when numpy is available, else a random.Random.
+    """
+    np = numpy()
+    if np is None:
+        res = []
+        for _ in range(n):
+            body = rng.choice(bins) + "".join(str(rng.randint(0, 9)) for _ in range(length - 1 - len(bins[0])))
+            res.append(body + luhn_check_digit(body))
+        return res
+
+    bin_digits = np.array([[int(c) for c in b] for b in bins], dtype=np.int64)
+    digits = np.empty((n, length), dtype=np.int64)
+    digits[:, :bin_digits.shape[1]] = bin_digits[rng.integers(0, len(bins), size=n)]
+    digits[:, bin_digits.shape[1]:length - 1] = rng.integers(0, 10, size=(n, length - 1 - bin_digits.shape[1]))
+
+    # Double every second digit counting leftwards from the one before the check digit
+    body = digits[:, :length - 1]
+    doubled = body[:, length - 2::-2] * 2
+    checksum = (doubled - 9 * (doubled > 9)).sum(axis=1) + body[:, length - 3::-2].sum(axis=1)
+    digits[:, length - 1] = (10 - checksum % 10) % 10
+    return _to_strings((digits + ord("0")).astype(np.uint8))
+
+
+def uscc_codes(rng, n: int, area_codes: Sequence[str], area_probs: Sequence[float] = None) -> List[str]:
+    """
+    `n` GB 32100-valid unified social credit codes: entity type, a 6-digit registration
+    area drawn from `area_codes` (weighted by `area_probs`), a random 9-character
+    organization code and the check character.
+    `rng` is a numpy Generator when numpy is available, else a random.Random.
+    """
+    np = numpy()
+    if np is None:
+        res = []
+        for _ in range(n):
+            area = rng.choices(area_codes, weights=area_probs)[0] if area_probs else rng.choice(area_codes)
+            body = rng.choice(USCC_ORG_TYPES) + area + "".join(rng.choice(USCC_CHARS) for _ in range(9))
+            res.append(body + uscc_check_char(body))
+        return res
+
+    values = np.empty((n, 18), dtype=np.int64)
+    org_types = np.array([[int(c) for c in t] for t in USCC_ORG_TYPES], dtype=np.int64)
+    values[:, :2] = org_types[rng.integers(0, len(org_types), size=n)]
+    areas = np.array([[int(c) for c in a] for a in area_codes], dtype=np.int64)
+    if area_probs is None:
+        picks = rng.integers(0, len(areas), size=n)
+    else:
+        p = np.asarray(area_probs, dtype=np.float64)
+        picks = rng.choice(len(areas), size=n, p=p / p.sum())
+    values[:, 2:8] = areas[picks]
+    values[:, 8:17] = rng.integers(0, 31, size=(n, 9))
+    mod = (values[:, :17] * np.array(USCC_WEIGHTS, dtype=np.int64)).sum(axis=1) % 31
+    values[:, 17] = (31 - mod) % 31
+
+    alphabet = np.frombuffer(USCC_CHARS.encode("ascii"), dtype=np.uint8)
+    return _to_strings(alphabet[values])
+
+
+def _to_strings(chars) -> List[str]:
+    # (n, width) uint8 ASCII matrix -> list of str
+    return chars.view(f"S{chars.shape[1]}").ravel().astype(f"U{chars.shape[1]}").tolist()
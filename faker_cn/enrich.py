@@ -0,0 +1,229 @@
+import http.client
+import json
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+from .ai_cache import cached
+from .ai_story import image_request, parse_image, story_batch
+
+# Status codes worth another attempt: rate limited, or a transient server side failure
+RETRY_STATUS = (408, 409, 429, 500, 502, 503, 504)
+
+
+class RequestError(Exception):
+    def __init__(self, message: str, retryable: bool, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """
+    Spaces request starts at least 1/rate seconds apart across all threads.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class Client:
+    """
+    JSON-over-HTTP POSTs on keep-alive connections, one per (thread, host), with
+    per-request timeouts, optional rate limiting and retries with exponential backoff.
+    """
+
+    def __init__(self, timeout: float = 40, max_retries: int = 3, backoff: float = 0.5,
+                 rate_limit: Optional[float] = None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.limiter = RateLimiter(rate_limit) if rate_limit else None
+        self._local = threading.local()
+        self._all = []
+        self._all_lock = threading.Lock()
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        conn = conns.get((scheme, netloc))
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = conns[(scheme, netloc)] = cls(netloc, timeout=self.timeout)
+            with self._all_lock:
+                self._all.append(conn)
+        return conn
+
+    def _drop(self, scheme: str, netloc: str) -> None:
+        conn = self._local.conns.pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def _send(self, url: str, body: bytes, api_key: str, timeout: float) -> Dict[str, Any]:
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        conn = self._connection(parts.scheme, parts.netloc)
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        try:
+            conn.request("POST", path, body=body, headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {api_key}",
+                "Connection": "keep-alive",
+            })
+            response = conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            # Stale keep-alive socket, reset or timeout: reconnect on the next attempt
+            self._drop(parts.scheme, parts.netloc)
+            raise RequestError(f"{type(e).__name__}: {e}", retryable=True)
+        if response.will_close:
+            self._drop(parts.scheme, parts.netloc)
+
+        if response.status >= 400:
+            retry_after = response.getheader("Retry-After")
+            try:
+                retry_after = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None
+            raise RequestError(f"HTTP {response.status}: {data[:200]!r}",
+                               retryable=response.status in RETRY_STATUS, retry_after=retry_after)
+        return json.loads(data.decode("utf-8"))
+
+    def post(self, url: str, payload: Dict[str, Any], api_key: str,
+             timeout: Optional[float] = None) -> Dict[str, Any]:
+        body = json.dumps(payload).encode("utf-8")
+        timeout = timeout or self.timeout
+        attempt = 0
+        while True:
+            if self.limiter:
+                self.limiter.acquire()
+            try:
+                return self._send(url, body, api_key, timeout)
+            except RequestError as e:
+                if not e.retryable or attempt >= self.max_retries:
+                    raise
+                # Jitter keeps a burst of throttled threads from retrying in lockstep
+                delay = self.backoff * (2 ** attempt) * (0.5 + random.random())
+                time.sleep(max(delay, e.retry_after or 0))
+                attempt += 1
+
+    def close(self) -> None:
+        with self._all_lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+
+
+def _enrich_batch(client: Client, personas: List[Dict[str, Any]], config: Dict[str, Any],
+                  batch_size: int) -> List[Dict[str, Any]]:
+    # Same steps and failure handling as persona(use_ai=True)
+    def post(url, payload, timeout):
+        return client.post(url, payload, config["api_key"], timeout=timeout)
+
+    results = []
+    for persona, ai_data in zip(personas, story_batch(personas, config, post, batch_size)):
+        result = dict(persona)
+        results.append(result)
+        if not ai_data:
+            continue
+        result.update(ai_data)
+
+        img_key = config.get("image_api_key")
+        if img_key and "image_prompt" in result:
+            try:
+                url, payload = image_request(result["image_prompt"], config)
+                img_url = cached(config, url, payload, lambda: parse_image(
+                    client.post(url, payload, img_key, timeout=config.get("image_timeout", 60))))
+            except Exception as e:
+                print(f"Warning: Image generation failed: {e}")
+                img_url = None
+            if img_url:
+                result["avatar_url"] = img_url
+    return results
+
+
+def enrich(
+    personas: Iterable[Dict[str, Any]],
+    config: Dict[str, Any],
+    concurrency: int = 32,
+    ordered: bool = False,
+    batch_size: int = 1,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Add the AI life story (and avatar) to many personas with up to `concurrency`
+    requests in flight, yielding each enriched copy as soon as it is done
+    (input order if `ordered`). A persona whose requests fail is yielded unchanged.
+    With `batch_size` > 1 each story request covers that many personas; entries
+    missing from a batched reply are requested one by one.
+
+    config keys, besides those of persona(use_ai=True): timeout (40s, per persona
+    of a batch), image_timeout (60s), max_retries (3), backoff (0.5s, doubled per
+    retry), rate_limit (requests/s).
+    """
+    if not config.get("api_key"):
+        print("Warning: use_ai=True but no api_key provided. Skipping AI generation.")
+        for p in personas:
+            yield dict(p)
+        return
+
+    client = Client(
+        timeout=config.get("timeout", 40),
+        max_retries=config.get("max_retries", 3),
+        backoff=config.get("backoff", 0.5),
+        rate_limit=config.get("rate_limit"),
+    )
+    batch_size = max(1, batch_size)
+    # Bound the personas in flight, so a lazy iterator is not drained up front
+    window = max(1, concurrency) * 2
+    pending = {}
+    done = {}
+    next_out = 0
+
+    def collect(finished):
+        nonlocal next_out
+        for future in finished:
+            start = pending.pop(future)
+            for k, result in enumerate(future.result()):
+                done[start + k] = result
+        if not ordered:
+            yield from done.values()
+            done.clear()
+        while next_out in done:
+            yield done.pop(next_out)
+            next_out += 1
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            source = iter(personas)
+            start = 0
+            while True:
+                chunk = list(islice(source, batch_size))
+                if not chunk:
+                    break
+                pending[pool.submit(_enrich_batch, client, chunk, config, batch_size)] = start
+                start += len(chunk)
+                if len(pending) >= window:
+                    yield from collect(wait(pending, return_when=FIRST_COMPLETED).done)
+            for future in as_completed(list(pending)):
+                yield from collect((future,))
+    finally:
+        client.close()
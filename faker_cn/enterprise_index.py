@@ -0,0 +1,63 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from .area_index import AreaIndex
+
+
+class EnterpriseIndex:
+    """
+    Enterprises of enterprises.json bucketed by province code, city name and GB industry
+    category, built once at load time.
+
+    Every bucket is a list in file order, and the workplace fallback chain
+    (same city and industry -> same industry in the province -> anything in the province)
+    is a fixed sequence of dict hits, so matching a company does not depend on the
+    size of the database.
+    """
+
+    def __init__(self, db: Dict, index: AreaIndex):
+        # (province code, industry) -> giants
+        self._giants: Dict[tuple, List[Dict]] = defaultdict(list)
+        # (province code, city name or None, industry or None) -> SMEs
+        self._smes: Dict[tuple, List[Dict]] = defaultdict(list)
+
+        giants = db.get("_giants", [])
+        sme_db = db.get("_sme", {})
+        for prov in index.provinces:
+            p_code = prov['code']
+            for c in giants:
+                if c["province"] in prov['name']:
+                    self._giants[(p_code, c["industry"])].append(c)
+            for c in sme_db.get(index.short_names[p_code], []):
+                self._smes[(p_code, None, None)].append(c)
+                self._smes[(p_code, None, c["industry"])].append(c)
+                self._smes[(p_code, c["city"], None)].append(c)
+                self._smes[(p_code, c["city"], c["industry"])].append(c)
+
+        self._giants = dict(self._giants)
+        self._smes = dict(self._smes)
+
+    def giants(self, prov_code: str, industry: str) -> List[Dict]:
+        """
+        Well-known companies of `industry` headquartered in the province.
+        """
+        return self._giants.get((prov_code, industry), [])
+
+    def smes(self, prov_code: str, city: str, industry: Optional[str] = None) -> List[Dict]:
+        """
+        Local SMEs for a workplace: the city's companies of `industry`, else the
+        province's of `industry`, else any of the province's. Empty if the province has none.
+        """
+        industry = industry or None
+        smes = self._smes
+        return (smes.get((prov_code, city, industry))
+                or smes.get((prov_code, None, industry))
+                or smes.get((prov_code, None, None), []))
+
+    def pick_giant(self, prov_code: str, industry: str, rng) -> Optional[Dict]:
+        giants = self.giants(prov_code, industry)
+        return rng.choice(giants) if giants else None
+
+    def pick_sme(self, prov_code: str, city: str, industry: Optional[str], rng) -> Optional[Dict]:
+        smes = self.smes(prov_code, city, industry)
+        return rng.choice(smes) if smes else None
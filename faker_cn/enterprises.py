@@ -0,0 +1,304 @@
+import multiprocessing
+import os
+import random
+import sqlite3
+import threading
+from bisect import bisect
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from . import checksums
+
+# Well-known companies, preferred for a small share of matching white-collar workplaces
+REAL_GIANTS = [
+    {"name": "深圳市腾讯计算机系统有限公司", "uscc": "91440300708461136T", "province": "广东", "city": "深圳市", "address": "深圳市南山区深南大道10000号腾讯大厦", "industry": "信息传输、软件和信息技术服务业"},
+    {"name": "华为技术有限公司", "uscc": "91440300192203821Y", "province": "广东", "city": "深圳市", "address": "深圳市龙岗区坂田华为总部办公楼", "industry": "制造业"},
+    {"name": "北京字节跳动科技有限公司", "uscc": "91110108592343242X", "province": "北京", "city": "北京市", "address": "北京市海淀区紫金数码园4号楼", "industry": "信息传输、软件和信息技术服务业"},
+    {"name": "阿里巴巴（中国）有限公司", "uscc": "91330100799655058B", "province": "浙江", "city": "杭州市", "address": "杭州市滨江区网商路699号", "industry": "信息传输、软件和信息技术服务业"},
+    {"name": "网易（杭州）网络有限公司", "uscc": "91330108653130541C", "province": "浙江", "city": "杭州市", "address": "杭州市滨江区长河街道网商路599号", "industry": "信息传输、软件和信息技术服务业"},
+    {"name": "北京三快在线科技有限公司 (美团)", "uscc": "91110108575152342J", "province": "北京", "city": "北京市", "address": "北京市朝阳区望京东路6号望京国际研发园", "industry": "信息传输、软件和信息技术服务业"},
+    {"name": "杭州海康威视数字技术股份有限公司", "uscc": "9133000073600620X", "province": "浙江", "city": "杭州市", "address": "杭州市滨江区阡陌路555号", "industry": "制造业"},
+    {"name": "中国工商银行股份有限公司", "uscc": "91100000100003962T", "province": "北京", "city": "北京市", "address": "北京市西城区复兴门内大街55号", "industry": "金融业"},
+    {"name": "中国建设银行股份有限公司", "uscc": "911000001000044477", "province": "北京", "city": "北京市", "address": "北京市西城区金融大街25号", "industry": "金融业"},
+    {"name": "国家电网有限公司", "uscc": "91110000710920838N", "province": "北京", "city": "北京市", "address": "北京市西城区西长安街86号", "industry": "电力、热力、燃气及水生产和供应业"},
+    {"name": "中国石油天然气集团有限公司", "uscc": "91110000100010433L", "province": "北京", "city": "北京市", "address": "北京市东城区东直门北大街9号", "industry": "采矿业"},
+    {"name": "中国移动通信集团有限公司", "uscc": "91110000710925032P", "province": "北京", "city": "北京市", "address": "北京市西城区金融大街29号", "industry": "信息传输、软件和信息技术服务业"},
+    {"name": "上海汽车集团股份有限公司", "uscc": "91310000132260250X", "province": "上海", "city": "上海市", "address": "上海市静安区威海路489号", "industry": "制造业"},
+    {"name": "中国平安保险（集团）股份有限公司", "uscc": "91440300192189148B", "province": "广东", "city": "深圳市", "address": "深圳市福田区益田路5033号平安金融中心", "industry": "金融业"},
+    {"name": "招商银行股份有限公司", "uscc": "9144030010001686XA", "province": "广东", "city": "深圳市", "address": "深圳市福田区深南大道7088号招商银行大厦", "industry": "金融业"},
+    {"name": "格力电器股份有限公司", "uscc": "91440400192548256N", "province": "广东", "city": "珠海市", "address": "珠海市前山金鸡西路", "industry": "制造业"},
+    {"name": "美的集团股份有限公司", "uscc": "91440606722473344C", "province": "广东", "city": "佛山市", "address": "佛山市顺德区北滘镇美的大道6号", "industry": "制造业"},
+    {"name": "比亚迪股份有限公司", "uscc": "91440300192317458F", "province": "广东", "city": "深圳市", "address": "深圳市坪山新区比亚迪路3009号", "industry": "制造业"},
+    {"name": "内蒙古伊利实业集团股份有限公司", "uscc": "91150000114093082R", "province": "内蒙古", "city": "呼和浩特市", "address": "呼和浩特市金川开发区金四路8号", "industry": "制造业"},
+    {"name": "贵州茅台酒股份有限公司", "uscc": "91520000714304481T", "province": "贵州", "city": "遵义市", "address": "贵州省仁怀市茅台镇", "industry": "制造业"}
+]
+
+# GB/T 4754 sections SMEs are registered under: name keywords and relative share
+INDUSTRIES = {
+    "批发和零售业": (("贸易", "百货", "商贸", "进出口", "物资", "供应链", "贸易发展"), 28),
+    "租赁和商务服务业": (("商务咨询", "企业管理", "广告", "人力资源", "会展服务", "商务服务"), 12),
+    "制造业": (("制造", "机械", "精密仪器", "五金", "塑胶", "新材料", "电子科技", "服装", "纺织"), 12),
+    "信息传输、软件和信息技术服务业": (("信息系统", "软件技术", "网络科技", "数字科技", "云数据", "智能科技", "信息技术", "互联网服务"), 9),
+    "建筑业": (("建筑工程", "建设", "装饰工程", "工程", "建设集团"), 8),
+    "科学研究和技术服务业": (("技术服务", "检测技术", "工程设计", "生物科技", "环保科技"), 7),
+    "住宿和餐饮业": (("餐饮管理", "大酒店", "饮食", "酒楼", "餐饮服务"), 6),
+    "交通运输、仓储和邮政业": (("物流", "运输", "仓储", "货运代理", "供应链管理"), 5),
+    "房地产业": (("房地产开发", "置业", "物业管理", "房地产经纪"), 4),
+    "文化、体育和娱乐业": (("文化传媒", "文化传播", "影视传媒", "体育发展", "娱乐"), 4),
+    "教育": (("教育科技", "教育咨询", "培训学校"), 3),
+    "金融业": (("投资管理", "资产管理", "融资租赁", "金融服务", "保险代理"), 2),
+}
+
+_BRAND_CHARS = "泰星阳华耀鑫源信光宏瑞祥丰顺伟昌成康盛聚发联利科"
+_SUFFIXES = ("有限公司", "有限责任公司", "股份有限公司", "合伙企业")
+_ROAD_STEMS = ("朝阳", "建设", "胜利", "解放", "中山", "人民", "新华", "和平", "文化", "工业", "创业", "发展", "科技", "滨江", "世纪", "长江", "黄河", "迎宾", "新城", "高新")
+# City-level placeholders in the division tree; companies there are named after the province
+_PLACEHOLDER_CITIES = ("市辖区", "县", "省直辖县级行政区划")
+
+# Upper bound on the companies generated by one worker task
+_TASK_SIZE = 20000
+_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE provinces (code TEXT PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE giants (
+    province_code TEXT NOT NULL, industry TEXT NOT NULL, name TEXT NOT NULL, uscc TEXT NOT NULL,
+    city TEXT NOT NULL, address TEXT NOT NULL
+);
+CREATE TABLE smes (
+    id INTEGER PRIMARY KEY, province_code TEXT NOT NULL, city TEXT NOT NULL, industry TEXT NOT NULL,
+    area TEXT NOT NULL, name TEXT NOT NULL, uscc TEXT NOT NULL, street TEXT NOT NULL
+);
+CREATE TABLE by_industry (seq INTEGER PRIMARY KEY, sme_id INTEGER NOT NULL);
+CREATE TABLE buckets (
+    province_code TEXT NOT NULL, city TEXT NOT NULL, industry TEXT NOT NULL,
+    first INTEGER NOT NULL, count INTEGER NOT NULL, by_industry INTEGER NOT NULL,
+    PRIMARY KEY (province_code, city, industry)
+) WITHOUT ROWID;
+"""
+
+
+def default_path() -> str:
+    """
+    Where build() writes and the provider looks for the enterprise store:
+    $FAKER_CN_ENTERPRISES, else data/enterprises.sqlite3 inside the package.
+    """
+    return os.environ.get("FAKER_CN_ENTERPRISES") or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "data", "enterprises.sqlite3"
+    )
+
+
+def _plan(index, total: int, weights: Dict[str, float], seed: Optional[int]) -> List[tuple]:
+    # Provinces get companies by population weight, their cities by number of counties
+    shares = []
+    prov_weights = index.province_weights(weights)
+    prov_total = sum(prov_weights)
+    for prov, w in zip(index.provinces, prov_weights):
+        cities = index.children(prov)
+        city_sizes = [len(index.children(c)) for c in cities]
+        for city, size in zip(cities, city_sizes):
+            shares.append((prov, city, w / prov_total * size / sum(city_sizes)))
+
+    master = random.Random(seed)
+    tasks = []
+    done = 0.0
+    for prov, city, share in shares:
+        # Cumulative rounding, so the counts add up to exactly `total`
+        start = round(done * total)
+        done += share
+        count = round(done * total) - start
+        areas = [(a['code'][:6].ljust(6, "0"), a['name']) for a in index.children(city)]
+        place = index.short_names[prov['code']] if city['name'] in _PLACEHOLDER_CITIES else city['name']
+        for offset in range(0, count, _TASK_SIZE):
+            tasks.append((
+                master.getrandbits(64), prov['code'], prov['name'], city['name'], place, areas,
+                min(_TASK_SIZE, count - offset),
+            ))
+    return tasks
+
+
+def _generate(task) -> List[tuple]:
+    """
+    Companies of one city: (province_code, city, industry, area, name, uscc, street) rows.
+    """
+    seed, prov_code, prov_name, city_name, place, areas, count = task
+    rng = random.Random(seed)
+    np = checksums.numpy()
+    batch_rng = np.random.default_rng(seed) if np is not None else rng
+    # The registration area embedded in each code picks the company's county
+    codes = checksums.uscc_codes(batch_rng, count, [code for code, _ in areas])
+    area_names: Dict[str, List[str]] = {}
+    for code, name in areas:
+        # Towns directly under a city share the city's county code
+        area_names.setdefault(code, []).append(name)
+
+    industries = list(INDUSTRIES)
+    cum_weights = list(accumulate(INDUSTRIES[i][1] for i in industries))
+    rows = []
+    for uscc in codes:
+        industry = industries[bisect(cum_weights, rng.random() * cum_weights[-1])]
+        name = f"{place}{''.join(rng.choices(_BRAND_CHARS, k=2))}{rng.choice(INDUSTRIES[industry][0])}{rng.choice(_SUFFIXES)}"
+        area = rng.choice(area_names[uscc[2:8]])
+        road = rng.choice(_ROAD_STEMS) + rng.choice(("路", "街", "大道"))
+        street = f"{road}{rng.randint(1, 500)}号"
+        rows.append((prov_code, city_name, industry, area, name, uscc, street))
+    return rows
+
+
+def build(
+    path: Optional[str] = None,
+    total: int = 1000000,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    provinces: Optional[List[str]] = None,
+) -> str:
+    """
+    Generate `total` SMEs over every city (or only `provinces`) on `workers` processes
+    (default: all cores) and write them, with REAL_GIANTS, to an indexed SQLite store
+    at `path` (default: default_path()). Returns the path.
+
+    Every company has a GB 32100 valid USCC registered in its county, a GB/T 4754
+    industry section and an address in that county. The file is replaced atomically,
+    and the same `seed` produces the same store whatever the worker count.
+    """
+    from . import PersonaProvider
+    provider = PersonaProvider.scoped(provinces) if provinces else PersonaProvider
+    index = provider._load_area_index()
+    tasks = _plan(index, total, provider._prov_weights, seed)
+
+    path = os.path.abspath(path or default_path())
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    workers = workers or os.cpu_count() or 1
+    pool = multiprocessing.Pool(workers) if workers > 1 and len(tasks) > 1 else None
+    db = sqlite3.connect(tmp_path, isolation_level=None)
+    try:
+        db.execute("PRAGMA journal_mode=OFF")
+        db.execute("PRAGMA synchronous=OFF")
+        db.executescript(_SCHEMA)
+        # Rows land in a temporary database first, then are copied over sorted
+        db.execute("ATTACH DATABASE '' AS stage")
+        db.execute(
+            "CREATE TABLE stage.rows (province_code, city, industry, area, name, uscc, street)"
+        )
+        db.execute("BEGIN")
+        # imap keeps task order, so the row order does not depend on scheduling
+        results = pool.imap(_generate, tasks) if pool else map(_generate, tasks)
+        for rows in results:
+            db.executemany("INSERT INTO stage.rows VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+        # Sorted by (province, city, industry), so every city and city+industry bucket is
+        # one id range; by_industry orders the same ids by (province, industry)
+        db.execute(
+            "INSERT INTO smes (province_code, city, industry, area, name, uscc, street) "
+            "SELECT province_code, city, industry, area, name, uscc, street FROM stage.rows "
+            "ORDER BY province_code, city, industry, rowid"
+        )
+        db.execute(
+            "INSERT INTO by_industry (sme_id) SELECT id FROM smes ORDER BY province_code, industry, id"
+        )
+        for statement in (
+            "INSERT INTO buckets SELECT province_code, city, industry, MIN(id), COUNT(*), 0 "
+            "FROM smes GROUP BY province_code, city, industry",
+            "INSERT INTO buckets SELECT province_code, city, '', MIN(id), COUNT(*), 0 "
+            "FROM smes GROUP BY province_code, city",
+            "INSERT INTO buckets SELECT province_code, '', '', MIN(id), COUNT(*), 0 "
+            "FROM smes GROUP BY province_code",
+            "INSERT INTO buckets SELECT s.province_code, '', s.industry, MIN(b.seq), COUNT(*), 1 "
+            "FROM by_industry b JOIN smes s ON s.id = b.sme_id GROUP BY s.province_code, s.industry",
+        ):
+            db.execute(statement)
+        db.executemany("INSERT INTO provinces VALUES (?, ?)", [(p['code'], p['name']) for p in index.provinces])
+        for c in REAL_GIANTS:
+            for prov in index.provinces:
+                if c["province"] in prov['name']:
+                    db.execute(
+                        "INSERT INTO giants VALUES (?, ?, ?, ?, ?, ?)",
+                        (prov['code'], c["industry"], c["name"], c["uscc"], c["city"], c["address"]),
+                    )
+        db.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("version", str(_VERSION)), ("total", str(total)), ("seed", repr(seed)),
+        ])
+        db.execute("COMMIT")
+        db.execute("DETACH DATABASE stage")
+    except BaseException:
+        db.close()
+        os.remove(tmp_path)
+        raise
+    finally:
+        db.close()
+        if pool:
+            pool.terminate()
+    os.replace(tmp_path, path)
+    return path
+
+
+class EnterpriseStore:
+    """
+    Read-only view over a store written by build(), with the same workplace fallback
+    chain as EnterpriseIndex. Only the bucket directory and the giants are held in
+    memory; each pick reads a single company row by id.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        db = self._db()
+        version = db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if version is None or int(version[0]) != _VERSION:
+            raise ValueError(f"{path} is not a faker_cn enterprise store (or an incompatible version)")
+        # (province code, city or '', industry or '') -> (first id or seq, count, by_industry)
+        self._buckets: Dict[Tuple[str, str, str], Tuple[int, int, int]] = {
+            (p, c, i): (first, count, by_industry)
+            for p, c, i, first, count, by_industry in db.execute("SELECT * FROM buckets")
+        }
+        self._provinces: Dict[str, str] = dict(db.execute("SELECT code, name FROM provinces"))
+        self._giants: Dict[Tuple[str, str], List[Dict]] = {}
+        for p, industry, name, uscc, city, address in db.execute("SELECT * FROM giants ORDER BY rowid"):
+            self._giants.setdefault((p, industry), []).append({
+                "name": name, "uscc": uscc, "city": city, "address": address, "industry": industry,
+            })
+
+    def _db(self) -> sqlite3.Connection:
+        # One connection per thread and process: sqlite handles must not cross a fork
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(f"file:{quote(self.path)}?mode=ro", uri=True, check_same_thread=False)
+            # Page reads straight from the OS cache, shared by every process using the store
+            db.execute("PRAGMA mmap_size = 1073741824")
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    def pick_giant(self, prov_code: str, industry: str, rng) -> Optional[Dict]:
+        giants = self._giants.get((prov_code, industry))
+        return rng.choice(giants) if giants else None
+
+    def pick_sme(self, prov_code: str, city: str, industry: Optional[str], rng) -> Optional[Dict]:
+        """
+        A random SME of the city and industry, else of the province and industry,
+        else of the province; None if the province has none.
+        """
+        industry = industry or ""
+        buckets = self._buckets
+        hit = (buckets.get((prov_code, city, industry))
+               or buckets.get((prov_code, "", industry))
+               or buckets.get((prov_code, "", "")))
+        if hit is None:
+            return None
+        first, count, by_industry = hit
+        key = first + rng.randrange(count)
+        if by_industry:
+            sql = ("SELECT s.name, s.uscc, s.city, s.area, s.street, s.industry "
+                   "FROM by_industry b JOIN smes s ON s.id = b.sme_id WHERE b.seq = ?")
+        else:
+            sql = "SELECT name, uscc, city, area, street, industry FROM smes WHERE id = ?"
+        name, uscc, city, area, street, industry = self._db().execute(sql, (key,)).fetchone()
+        return {
+            "name": name, "uscc": uscc, "city": city, "area": area, "industry": industry,
+            "address": f"{self._provinces[prov_code]}{city}{area}{street}",
+        }
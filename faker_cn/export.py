@@ -0,0 +1,178 @@
+import csv
+import gzip as _gzip
+import io
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+# Flattened CSV columns, in persona() key order. Nested sections become dotted names
+# ("hometown.postcode"), the same paths `fields=` accepts.
+COLUMNS = (
+    "name", "gender", "age", "birth_date", "ssn", "email", "yopmail", "yopmail_url",
+    "username", "password", "strong_password", "common_password", "common_password_upper",
+    "ethnicity", "bank_card", "bank_name", "mbti",
+    "physical.height", "physical.weight", "physical.blood_type",
+    "hometown.province", "hometown.city", "hometown.area", "hometown.address", "hometown.postcode",
+    "workplace.province", "workplace.city", "workplace.area", "workplace.address",
+    "workplace.company_name", "workplace.company_uscc",
+    "asset.vehicle_plate",
+    "primary_phone.number", "primary_phone.location",
+    "social.education", "social.employment", "social.job", "social.salary",
+    "social.marital_status", "social.security_question", "social.security_answer",
+    "internet.guid", "internet.user_agent", "internet.os", "internet.web_home",
+)
+
+# Only present with has_second_phone=True
+SECOND_PHONE_COLUMNS = (
+    "secondary_phone.number", "secondary_phone.location",
+    "work_location.province", "work_location.city",
+)
+
+# Only present with use_ai=True
+AI_COLUMNS = ("life_story", "image_prompt", "avatar_url")
+
+FORMATS = ("jsonl", "csv")
+
+
+def columns(fields: Optional[List[str]] = None, has_second_phone: bool = False, use_ai: bool = False) -> List[str]:
+    """
+    CSV header for a run. Without `fields` this is every column the persona can have;
+    with `fields`, each entry is kept in order and whole sections ("hometown") are
+    expanded to their columns.
+    """
+    available = list(COLUMNS)
+    if has_second_phone:
+        available += SECOND_PHONE_COLUMNS
+    if use_ai:
+        available += AI_COLUMNS
+    if not fields:
+        return available
+
+    header = []
+    for f in fields:
+        f = f.strip()
+        if not f:
+            continue
+        section = [c for c in available if c.startswith(f + ".")]
+        for c in section or [f]:
+            if c not in header:
+                header.append(c)
+    return header
+
+
+def flatten(persona: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """
+    {"hometown": {"city": ...}} -> {"hometown.city": ...}
+    """
+    flat = {}
+    for k, v in persona.items():
+        if isinstance(v, dict):
+            flat.update(flatten(v, f"{prefix}{k}."))
+        else:
+            flat[f"{prefix}{k}"] = v
+    return flat
+
+
+def _open(path_or_stream, compress: Optional[bool]):
+    """
+    Text stream for the target plus a close callback that leaves caller-owned streams open.
+    """
+    if isinstance(path_or_stream, str):
+        if compress is None:
+            compress = path_or_stream.endswith(".gz")
+        if path_or_stream == "-":
+            path_or_stream = sys.stdout
+        elif compress:
+            f = _gzip.open(path_or_stream, "wt", encoding="utf-8", newline="")
+            return f, f.close
+        else:
+            f = open(path_or_stream, "w", encoding="utf-8", newline="")
+            return f, f.close
+
+    stream = path_or_stream
+    if compress:
+        raw = getattr(stream, "buffer", stream)
+        gz = _gzip.GzipFile(fileobj=raw, mode="wb")
+        f = io.TextIOWrapper(gz, encoding="utf-8", newline="")
+
+        def close():
+            f.flush()
+            f.detach()
+            gz.close()
+            raw.flush()
+        return f, close
+    if not isinstance(stream, io.TextIOBase):
+        f = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+
+        def close():
+            f.flush()
+            f.detach()
+        return f, close
+    return stream, stream.flush
+
+
+def _chunks(rows: Iterable[Dict[str, Any]], chunk_size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write(
+    path_or_stream,
+    n: int,
+    format: str = "jsonl",
+    fields: Optional[List[str]] = None,
+    chunk_size: int = 1000,
+    gzip: Optional[bool] = None,
+    fake=None,
+    **constraints
+) -> int:
+    """
+    Stream `n` personas to a file, "-" (stdout) or an open stream as JSON Lines or CSV.
+    Personas are pulled from `iter_personas()` and written `chunk_size` rows at a time,
+    so memory stays flat whatever `n` is. Paths ending in ".gz" (or gzip=True) are
+    gzip-compressed. Any other keyword is a persona() constraint.
+    Returns the number of rows written.
+    Usage: export.write("people.csv.gz", 1000000, format="csv", hometown_province="广东")
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown export format {format!r}, expected one of {FORMATS}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if fake is None:
+        from faker import Faker
+        from . import PersonaProvider
+        fake = Faker("zh_CN")
+        fake.add_provider(PersonaProvider)
+
+    rows = fake.iter_personas(n, fields=fields, **constraints)
+    out, close = _open(path_or_stream, gzip)
+    written = 0
+    try:
+        if format == "jsonl":
+            for chunk in _chunks(rows, chunk_size):
+                out.write("".join(json.dumps(p, ensure_ascii=False) + "\n" for p in chunk))
+                written += len(chunk)
+        else:
+            header = columns(fields, constraints.get("has_second_phone", False), constraints.get("use_ai", False))
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(header)
+            for chunk in _chunks(rows, chunk_size):
+                for p in chunk:
+                    flat = flatten(p)
+                    writer.writerow([flat.get(c, "") for c in header])
+                out.write(buf.getvalue())
+                buf.seek(0)
+                buf.truncate()
+                written += len(chunk)
+            if not written:
+                out.write(buf.getvalue())
+    finally:
+        close()
+    return written
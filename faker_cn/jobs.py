@@ -0,0 +1,153 @@
+import functools
+import operator
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .sampling import AliasTable
+
+# Titles kept scarce: drawn at RARE_WEIGHT relative to an ordinary job
+RARE_KEYWORDS = (
+    "星探", "经纪人", "体验师", "鉴定师", "潜水", "飞行", "演艺", "教练",
+    "CEO", "总裁", "总经理", "总监", "首席", "外交", "基金经理", "操盘手",
+    "架构师", "科学家", "研究员", "高级", "专家", "舰长", "法官", "检察", "市长"
+)
+# 0.5% acceptance of a rare candidate, as the old rejection loop did
+RARE_WEIGHT = 0.005
+
+# Titles nobody under 28 holds
+ELITE_KEYWORDS = ("总监", "CEO", "CTO", "CFO", "总裁", "总经理", "副总", "行长", "首席", "科学家", "专家", "研究员", "架构师", "法官")
+
+# Blue-collar / service roles, whose holders rarely have a degree
+BLUE_COLLAR_KEYWORDS = (
+    "普工", "操作", "车间", "流水线", "装配", "纺织", "细纱", "包装", "厨师", "服务员", "营业员", "保安", "保洁",
+    "家政", "保姆", "洗碗", "店员", "前台", "收银", "司机", "快递", "外卖", "配送", "理发", "美容", "美发", "美体",
+    "泥瓦工", "钢筋工", "搬运", "清洁", "维修", "机修", "钳工", "焊工", "木工", "电工", "水管工", "修理", "足疗",
+    "推拿", "按摩", "传菜", "门卫", "导购", "促销", "钟点工", "月嫂", "后厨", "切配", "迎宾", "杂工", "收发",
+    "工人", "混凝土", "挖掘机", "砌筑", "抹灰", "水电工", "架子工", "电梯工", "钣金", "喷漆", "锅炉", "环卫",
+    "绿化", "装卸", "分拣"
+)
+
+# Employer sectors, see _resolve_workplace
+TECH_KEYWORDS = ("架构师", "专家", "研究员", "研发", "科学家", "总监", "经理", "开发", "程序员", "IT", "互联网", "软件", "系统", "产品", "运营")
+FINANCE_KEYWORDS = ("银行", "出纳", "财务", "金融", "投资", "风控", "保险", "理财", "资金", "信贷")
+MANUFACTURE_KEYWORDS = ("质量", "车间", "工人", "普工", "机修", "制造", "产线", "组装", "仓管", "包装", "纺织", "焊接", "操作")
+
+# Workplace address styles, first match wins, see _generate_full_address. "government"
+# only applies to non-freelancers; everything unmatched is "office".
+ADDRESS_KEYWORDS = (
+    ("tech", ("总", "高管", "CEO", "CTO", "CFO", "总裁", "主任", "架构师", "专家", "研究员", "科学家", "开发", "程序员", "IT", "互联网", "软件", "系统")),
+    ("service", ("司机", "快递", "外卖", "配送", "厨师", "服务员", "营业员", "保安", "保洁", "家政", "保姆", "销售", "业务", "店员", "前台", "客服", "收银")),
+    ("factory", ("工人", "厂", "制造", "生产", "流水线", "车间", "装配", "普工", "质检", "维修", "机修", "电工", "焊工", "钳工")),
+    ("education", ("学校", "老师", "教授", "讲师", "教育", "培训")),
+    ("medical", ("医院", "医生", "护士", "医疗", "卫生", "保健")),
+    ("government", ("公务员", "行政", "局", "委", "办", "政府", "事业", "书记")),
+)
+
+# Keyword sets the persona stages test a job title against, by JobProfile flag.
+# JobClassifier also matches ADDRESS_KEYWORDS and the provider's salary rows.
+JOB_FLAGS = (
+    ("rare", RARE_KEYWORDS),
+    ("elite", ELITE_KEYWORDS),
+    ("blue_collar", BLUE_COLLAR_KEYWORDS),
+    ("postgrad", ("研究生",)),
+    # Education floors, see _resolve_career
+    ("manager", ("总", "CEO", "CFO", "CTO", "总裁", "主任", "总监", "经理", "行长", "店长", "厂长")),
+    ("senior_research", ("架构师", "专家", "研究员", "科学家", "教授", "算法")),
+    ("doctor_legal", ("医生", "医师", "法医", "法官", "检察")),
+    ("engineer", ("工程师", "开发", "程序员", "律师")),
+    # Workplace and employer, see _resolve_workplace
+    ("high_end", ("总", "CEO", "CTO", "高管", "总裁", "架构师", "专家")),
+    ("tech", TECH_KEYWORDS),
+    ("finance", FINANCE_KEYWORDS),
+    ("manufacture", MANUFACTURE_KEYWORDS),
+    ("public_service", ("医生", "护士", "老师", "教授", "公务员")),
+    ("sales", ("销售", "业务")),
+    # Devices and accounts, see _resolve_internet and _generate_weighted_email
+    ("executive", ("高管", "CEO", "总裁", "总监")),
+    ("web_tech", ("架构师", "程序员", "开发", "IT", "软件工程", "测试", "算法", "后端", "前端", "网络工程", "网络安全", "运维", "数据")),
+    ("tech_foreign", ("架构师", "程序员", "开发", "IT", "研究员", "科学家", "外贸", "外资")),
+)
+
+
+class JobProfile:
+    """
+    Everything the persona stages derive from a job title: one bool per JOB_FLAGS
+    entry, the rarity weight, the salary band and the workplace address style.
+    """
+    __slots__ = ("title", "weight", "salary_band", "address") + tuple(name for name, _ in JOB_FLAGS)
+
+    def __init__(self, title: str, mask: int, salary_bands: Sequence[tuple]):
+        self.title = title
+        for bit, (name, _) in enumerate(JOB_FLAGS):
+            setattr(self, name, bool(mask >> bit & 1))
+        self.weight = RARE_WEIGHT if self.rare else 1.0
+        # Address styles, then salary rows, follow the flags in the mask; first match wins
+        offset = len(JOB_FLAGS)
+        self.address = next(
+            (name for i, (name, _) in enumerate(ADDRESS_KEYWORDS) if mask >> (offset + i) & 1), "office"
+        )
+        offset += len(ADDRESS_KEYWORDS)
+        # (min, max) monthly salary of the first matching row, None for the default
+        self.salary_band: Optional[tuple] = next(
+            (band for i, band in enumerate(salary_bands) if mask >> (offset + i) & 1), None
+        )
+
+
+class JobClassifier:
+    """
+    Matches a title against every keyword set at once with one compiled regex, and
+    memoizes the resulting JobProfile per distinct title in a bounded LRU.
+    """
+
+    def __init__(self, salary_mapping: Sequence[Tuple[Sequence[str], tuple]], maxsize: int = 4096):
+        groups = [keywords for _, keywords in JOB_FLAGS]
+        groups += [keywords for _, keywords in ADDRESS_KEYWORDS]
+        groups += [keywords for keywords, _ in salary_mapping]
+        self._salary_bands = [tuple(band) for _, band in salary_mapping]
+
+        masks: Dict[str, int] = {}
+        for bit, keywords in enumerate(groups):
+            for kw in keywords:
+                masks[kw] = masks.get(kw, 0) | 1 << bit
+        # A keyword found in the title brings along every keyword inside it (总监 -> 总)
+        self._masks = {
+            kw: functools.reduce(operator.or_, (m for other, m in masks.items() if other in kw))
+            for kw in masks
+        }
+        # The lookahead reports, at every position, the longest keyword starting there;
+        # shorter ones starting at the same place are substrings of it, covered above
+        alternation = "|".join(re.escape(kw) for kw in sorted(masks, key=len, reverse=True))
+        self._pattern = re.compile(f"(?=({alternation}))")
+        self.profile = functools.lru_cache(maxsize=maxsize)(self._classify)
+
+    def _classify(self, title: str) -> JobProfile:
+        mask = 0
+        masks = self._masks
+        for match in self._pattern.finditer(title):
+            mask |= masks[match.group(1)]
+        return JobProfile(title, mask, self._salary_bands)
+
+
+class JobCatalog:
+    """
+    A locale's job list with alias tables to draw from, built once. A draw costs one
+    rng.random() call, unlike rejection sampling from job().
+    """
+
+    def __init__(self, titles: Sequence[str], classifier: JobClassifier):
+        titles = list(titles) or ["销售员"]
+        self.jobs: Dict[str, JobProfile] = {t: classifier.profile(t) for t in titles}
+        # Duplicate titles stay in the tables, so they keep their extra share as in job()
+        profiles: List[JobProfile] = [self.jobs[t] for t in titles]
+        self._table = AliasTable(titles, [p.weight for p in profiles])
+        junior = [p for p in profiles if not p.elite]
+        self._junior_table = AliasTable([p.title for p in junior], [p.weight for p in junior]) if junior else self._table
+
+    def sample(self, rng, junior: bool = False) -> str:
+        """
+        A job title weighted by rarity; `junior` excludes elite titles (age < 28).
+        """
+        return (self._junior_table if junior else self._table).sample(rng)
+
+    def get(self, title: str) -> Optional[JobProfile]:
+        return self.jobs.get(title)
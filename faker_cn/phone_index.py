@@ -0,0 +1,115 @@
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Union
+
+from .area_index import AreaIndex
+
+
+class PrefixPool:
+    """
+    Mobile number prefixes of one region, stored as contiguous number segments.
+
+    phones.json entries are either single 7-digit prefixes ("1380013") or inclusive
+    ranges ([1380000, 1380999]). Single prefixes are segments of length one, in which
+    case a draw is a plain array index.
+    """
+    __slots__ = ("_starts", "_cum", "_unit", "total")
+
+    def __init__(self, entries: List[Union[str, list]]):
+        self._starts = array("I")
+        self._cum = array("I")
+        total = 0
+        for e in entries:
+            if isinstance(e, (list, tuple)):
+                lo, hi = int(e[0]), int(e[1])
+            else:
+                lo = hi = int(e)
+            self._starts.append(lo)
+            total += hi - lo + 1
+            self._cum.append(total)
+        self.total = total
+        self._unit = total == len(self._starts)
+
+    @classmethod
+    def from_bytes(cls, starts: bytes, cum: bytes) -> "PrefixPool":
+        """
+        Rebuild a pool from the arrays of to_bytes().
+        """
+        pool = cls([])
+        pool._starts.frombytes(starts)
+        pool._cum.frombytes(cum)
+        pool.total = pool._cum[-1] if pool._cum else 0
+        pool._unit = pool.total == len(pool._starts)
+        return pool
+
+    def to_bytes(self) -> tuple:
+        return self._starts.tobytes(), self._cum.tobytes()
+
+    def extend(self, other: "PrefixPool"):
+        for i, start in enumerate(other._starts):
+            size = other._cum[i] - (other._cum[i - 1] if i else 0)
+            self._starts.append(start)
+            self.total += size
+            self._cum.append(self.total)
+        self._unit = self._unit and other._unit
+
+    def __bool__(self) -> bool:
+        return self.total > 0
+
+    def prefix_at(self, k: int) -> int:
+        """
+        The k-th prefix (0 <= k < total) across all segments.
+        """
+        if self._unit:
+            return self._starts[k]
+        i = bisect_right(self._cum, k)
+        return self._starts[i] + k - (self._cum[i - 1] if i else 0)
+
+
+class PhoneIndex:
+    """
+    Mobile prefixes resolved once per city / province code of an AreaIndex.
+
+    The fuzzy name matching between phones.json keys (济南, 北京 ...) and division names
+    (济南市, 市辖区 ...) happens here at load time, so a phone lookup is one dict hit
+    and one indexed draw.
+    """
+
+    _MUNICIPALITIES = ("北京", "上海", "天津", "重庆")
+
+    def __init__(self, raw: Dict[str, Dict[str, list]], index: AreaIndex):
+        self.by_code: Dict[str, PrefixPool] = {}
+        for prov in index.provinces:
+            p_key = prov['name'].replace("市", "").replace("省", "").replace("自治区", "")
+            matched_prov = next((k for k in raw.keys() if p_key in k or k in p_key), None)
+            if not matched_prov:
+                continue
+            city_dict = raw[matched_prov]
+            prov_pool = PrefixPool([])
+            for city in index.children(prov):
+                c_key = self._city_key(p_key, city['name'])
+                matched_city = next((k for k in city_dict.keys() if c_key in k or k in c_key), None)
+                if matched_city and city_dict[matched_city]:
+                    pool = PrefixPool(city_dict[matched_city])
+                    self.by_code[city['code']] = pool
+                    prov_pool.extend(pool)
+            if not prov_pool:
+                for prefixes in city_dict.values():
+                    prov_pool.extend(PrefixPool(prefixes))
+            if prov_pool:
+                self.by_code[prov['code']] = prov_pool
+
+    @classmethod
+    def _city_key(cls, p_key: str, c_name: str) -> str:
+        c_key = c_name.replace("市", "").replace("地区", "").replace("盟", "")
+        if p_key in cls._MUNICIPALITIES and c_key in ["辖区", "市辖区", "县"]:
+            c_key = p_key
+        return c_key
+
+    def pool(self, code: Optional[str]) -> Optional[PrefixPool]:
+        """
+        Prefixes for a city code, falling back to its province.
+        """
+        if not code:
+            return None
+        return self.by_code.get(code) or self.by_code.get(code[:2])
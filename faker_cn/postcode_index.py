@@ -0,0 +1,84 @@
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+from .area_index import AreaIndex
+
+# Leading two postcode digits per province, used when a division has no known postcode
+_PROVINCE_PREFIXES = {
+    "北京": "10", "上海": "20", "天津": "30", "重庆": "40",
+    "辽宁": "11", "吉林": "13", "黑龙江": "15", "江苏": "21",
+    "浙江": "31", "安徽": "23", "福建": "35", "内蒙古": "01",
+    "江西": "33", "山东": "25", "河南": "45", "湖北": "43",
+    "湖南": "41", "广东": "51", "广西": "53", "海南": "57",
+    "四川": "61", "贵州": "55", "云南": "65", "西藏": "85",
+    "陕西": "71", "甘肃": "73", "青海": "81", "宁夏": "75",
+    "新疆": "83", "河北": "05", "山西": "03"
+}
+
+
+class PostcodeIndex:
+    """
+    Postcode per administrative division code, resolved once at load time.
+
+    postcodes.json maps postcode -> bare division name, and names such as 朝阳区 or
+    市中区 exist in several provinces. Each division's candidates are ranked by how
+    well they share digits with the parent city's postcodes and how common their
+    two-digit prefix is inside the province, so every area code gets the postcode of
+    its own region. Areas without a match inherit the city's, then the province's.
+    """
+
+    def __init__(self, raw: Dict[str, str], index: AreaIndex):
+        by_name: Dict[str, List[str]] = defaultdict(list)
+        for pc, name in raw.items():
+            by_name[name].append(pc)
+
+        self.codes: Dict[str, str] = {}
+        # Random fallback range (lo, hi) per province code
+        self.ranges: Dict[str, tuple] = {}
+
+        for prov in index.provinces:
+            votes = Counter(
+                pc[:2]
+                for city in index.children(prov)
+                for node in [city] + index.children(city)
+                for pc in by_name.get(node['name'], ())
+            )
+            prov_pc = self._pick(by_name.get(prov['name'], []), votes, [])
+            if prov_pc:
+                self.codes[prov['code']] = prov_pc
+
+            prefix = next((v for k, v in _PROVINCE_PREFIXES.items() if k in prov['name']), "00")
+            self.ranges[prov['code']] = (int(prefix) * 10000, int(prefix) * 10000 + 9999)
+
+            top = max(votes.values()) if votes else 0
+            for city in index.children(prov):
+                city_refs = [pc for pc in by_name.get(city['name'], ()) if votes[pc[:2]] * 10 >= top]
+                city_pc = self._pick(city_refs, votes, []) or prov_pc
+                if city_pc:
+                    self.codes[city['code']] = city_pc
+                for area in index.children(city):
+                    area_pc = self._pick(by_name.get(area['name'], []), votes, city_refs) or city_pc
+                    if area_pc:
+                        self.codes[area['code']] = area_pc
+
+    @staticmethod
+    def _pick(candidates: List[str], votes: Counter, refs: List[str]) -> Optional[str]:
+        if not candidates:
+            return None
+        # Affinity with the parent city: same 3-digit postal district, or same 2-digit region
+        ref3 = {r[:3] for r in refs}
+        ref2 = {r[:2] for r in refs}
+
+        def score(i):
+            pc = candidates[i]
+            affinity = 2 if pc[:3] in ref3 else (1 if pc[:2] in ref2 else 0)
+            # Later entries win ties, matching the old "last one in the file" behaviour
+            return affinity, votes[pc[:2]], i
+
+        return candidates[max(range(len(candidates)), key=score)]
+
+    def get(self, code: str) -> Optional[str]:
+        return self.codes.get(code)
+
+    def fallback_range(self, code: str) -> tuple:
+        return self.ranges.get(code[:2], (0, 9999))
@@ -0,0 +1,284 @@
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from .area_index import AreaIndex
+from .cache import cache_dir, digest
+from .phone_index import PhoneIndex, PrefixPool
+from .postcode_index import PostcodeIndex
+from .villages import ScopedVillageStore, estate_names, rural_names
+
+# Bundled datasets compiled into the store, relative to the package
+_SOURCES = ("areas.json", "phones.json", "postcodes.json", "villages.json.gz")
+_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE areas (
+    parent TEXT NOT NULL, seq INTEGER NOT NULL, code TEXT NOT NULL, name TEXT NOT NULL,
+    PRIMARY KEY (parent, seq)
+) WITHOUT ROWID;
+CREATE UNIQUE INDEX areas_code ON areas (code);
+CREATE TABLE postcodes (code TEXT PRIMARY KEY, postcode TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE postcode_ranges (province_code TEXT PRIMARY KEY, lo INTEGER NOT NULL, hi INTEGER NOT NULL) WITHOUT ROWID;
+CREATE TABLE phone_prefixes (code TEXT PRIMARY KEY, starts BLOB NOT NULL, cum BLOB NOT NULL) WITHOUT ROWID;
+CREATE TABLE villages (
+    town INTEGER NOT NULL, kind INTEGER NOT NULL, names TEXT NOT NULL,
+    PRIMARY KEY (town, kind)
+) WITHOUT ROWID;
+"""
+
+# villages.kind: the raw names, estate stems and rural names of a town (see villages.NAME_LISTS)
+_RAW, _ESTATES, _RURAL = 0, 1, 2
+
+# Opened stores by path, shared by every provider class in the process
+_stores: Dict[str, "ReferenceStore"] = {}
+_stores_lock = threading.Lock()
+
+
+def _data_path(name: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+
+
+def compile_store(path: str) -> None:
+    """
+    Resolve the bundled datasets exactly as the in-memory indexes do and write them
+    to a SQLite file at `path` (replaced atomically).
+    """
+    with open(_data_path("areas.json"), "r", encoding="utf-8") as f:
+        index = AreaIndex(json.load(f))
+    try:
+        with open(_data_path("phones.json"), "r", encoding="utf-8") as f:
+            phones = PhoneIndex(json.load(f), index)
+    except FileNotFoundError:
+        phones = PhoneIndex({}, index)
+    try:
+        with open(_data_path("postcodes.json"), "r", encoding="utf-8") as f:
+            postcodes = PostcodeIndex(json.load(f), index)
+    except FileNotFoundError:
+        postcodes = PostcodeIndex({}, index)
+    try:
+        with gzip.open(_data_path("villages.json.gz"), "rt", encoding="utf-8") as f:
+            villages = json.load(f)
+    except FileNotFoundError:
+        villages = {}
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    db = sqlite3.connect(tmp_path, isolation_level=None)
+    try:
+        db.execute("PRAGMA journal_mode=OFF")
+        db.execute("PRAGMA synchronous=OFF")
+        db.executescript(_SCHEMA)
+        db.execute("BEGIN")
+
+        def insert_children(parent: str, nodes: List[Dict]):
+            db.executemany("INSERT INTO areas VALUES (?, ?, ?, ?)",
+                           [(parent, i, n['code'], n['name']) for i, n in enumerate(nodes)])
+            for n in nodes:
+                if n.get('children'):
+                    insert_children(n['code'], n['children'])
+
+        insert_children("", index.provinces)
+        db.executemany("INSERT INTO postcodes VALUES (?, ?)", postcodes.codes.items())
+        db.executemany("INSERT INTO postcode_ranges VALUES (?, ?, ?)",
+                       [(code, lo, hi) for code, (lo, hi) in postcodes.ranges.items()])
+        db.executemany("INSERT INTO phone_prefixes VALUES (?, ?, ?)",
+                       [(code, *pool.to_bytes()) for code, pool in phones.by_code.items()])
+        for town, names in villages.items():
+            if names:
+                db.executemany("INSERT INTO villages VALUES (?, ?, ?)", [
+                    (int(town), _RAW, "\n".join(names)),
+                    (int(town), _ESTATES, "\n".join(estate_names(names))),
+                    (int(town), _RURAL, "\n".join(rural_names(names))),
+                ])
+        db.execute("COMMIT")
+    except BaseException:
+        db.close()
+        os.remove(tmp_path)
+        raise
+    db.close()
+    os.replace(tmp_path, path)
+
+
+class ReferenceStore:
+    """
+    Read-only SQLite file holding every bundled dataset, already resolved: the area
+    tree by (parent, position), postcodes per area code, phone prefixes per city /
+    province code and the (cleaned) villages per town. The table classes below
+    answer the in-memory indexes' queries from it, with small LRU caches in front.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def query(self, sql: str, args: tuple = ()) -> list:
+        # One connection per thread and process: sqlite handles must not cross a fork
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(f"file:{quote(self.path)}?mode=ro", uri=True, check_same_thread=False)
+            # Page reads straight from the OS cache, shared by every process using the store
+            db.execute("PRAGMA mmap_size = 268435456")
+            self._local.db, self._local.pid = db, os.getpid()
+        return db.execute(sql, args).fetchall()
+
+    def areas(self, scope=None) -> "AreaTable":
+        return AreaTable(self, scope)
+
+    def phones(self) -> "PhoneTable":
+        return PhoneTable(self)
+
+    def postcodes(self) -> "PostcodeTable":
+        return PostcodeTable(self)
+
+    def villages(self) -> "VillageTable":
+        return VillageTable(self)
+
+
+def open_store() -> ReferenceStore:
+    """
+    The store for the bundled datasets, compiled into the user cache directory on
+    first use and keyed by their content and the code that resolves them.
+    """
+    modules = [sys.modules[obj.__module__].__file__ for obj in (AreaIndex, PhoneIndex, PostcodeIndex, estate_names)]
+    key = digest(*[_data_path(name) for name in _SOURCES], *modules, os.path.abspath(__file__), _VERSION)
+    path = os.path.join(cache_dir(), f"reference-v{_VERSION}-{key}.sqlite3")
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            if not os.path.exists(path):
+                compile_store(path)
+            store = _stores[path] = ReferenceStore(path)
+        return store
+
+
+class AreaTable(AreaIndex):
+    """
+    AreaIndex over the store: provinces and aliases are held in memory, child lists
+    and town splits are queried on demand and kept in bounded LRU caches.
+    Nodes are plain {"code", "name"} dicts; use children() / towns() to descend.
+    """
+
+    def __init__(self, store: ReferenceStore, scope=None, cache_size: int = 1024):
+        self._store = store
+        provinces = self._kids("")
+        if scope:
+            provinces = self.select(provinces, scope)
+            if not provinces:
+                raise ValueError(f"No province matches scope {scope!r}")
+        self.provinces = provinces
+        self.short_names: Dict[str, str] = {}
+        self._aliases: Dict[str, Dict] = {}
+        self._match_cache: Dict[tuple, List[Dict]] = {}
+        for prov in provinces:
+            short = self.short_name(prov['name'])
+            self.short_names[prov['code']] = short
+            self._aliases[prov['name']] = prov
+            self._aliases.setdefault(short, prov)
+            abbr = self._ABBREVIATIONS.get(short)
+            if abbr:
+                self._aliases.setdefault(abbr, prov)
+        self._kids = lru_cache(maxsize=cache_size)(self._kids)
+        self._split = lru_cache(maxsize=cache_size)(self._split)
+
+    def _kids(self, code: str) -> List[Dict]:
+        rows = self._store.query("SELECT code, name FROM areas WHERE parent = ? ORDER BY seq", (code,))
+        return [{'code': c, 'name': n} for c, n in rows]
+
+    def _split(self, code: str) -> Tuple[List[Dict], List[Dict]]:
+        return self.split_towns(self._kids(code))
+
+    def node(self, code: str) -> Optional[Dict]:
+        rows = self._store.query("SELECT code, name FROM areas WHERE code = ?", (code,))
+        return {'code': rows[0][0], 'name': rows[0][1]} if rows else None
+
+    def children(self, node: Dict) -> List[Dict]:
+        return self._kids(node.get('code', '')) or [node]
+
+    def towns(self, node: Dict) -> List[Dict]:
+        return self._kids(node.get('code', ''))
+
+    def town_split(self, node: Dict) -> Tuple[List[Dict], List[Dict]]:
+        return self._split(node.get('code', ''))
+
+    def child_by_name(self, node: Dict, name: str) -> Optional[Dict]:
+        return next((c for c in self._kids(node.get('code', '')) if c['name'] == name), None)
+
+
+class PhoneTable:
+    """
+    PhoneIndex over the store.
+    """
+
+    def __init__(self, store: ReferenceStore, cache_size: int = 512):
+        self._store = store
+        self._lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def _lookup(self, code: str) -> Optional[PrefixPool]:
+        rows = self._store.query("SELECT starts, cum FROM phone_prefixes WHERE code = ?", (code,))
+        return PrefixPool.from_bytes(*rows[0]) if rows else None
+
+    def pool(self, code: Optional[str]) -> Optional[PrefixPool]:
+        if not code:
+            return None
+        return self._lookup(code) or self._lookup(code[:2])
+
+
+class PostcodeTable:
+    """
+    PostcodeIndex over the store.
+    """
+
+    def __init__(self, store: ReferenceStore, cache_size: int = 1024):
+        self._store = store
+        self.ranges: Dict[str, tuple] = {
+            code: (lo, hi) for code, lo, hi in store.query("SELECT * FROM postcode_ranges")
+        }
+        self.get = lru_cache(maxsize=cache_size)(self.get)
+
+    def get(self, code: str) -> Optional[str]:
+        rows = self._store.query("SELECT postcode FROM postcodes WHERE code = ?", (code,))
+        return rows[0][0] if rows else None
+
+    def fallback_range(self, code: str) -> tuple:
+        return self.ranges.get(code[:2], (0, 9999))
+
+
+class VillageTable:
+    """
+    VillageStore over the store; every lookup reads one row.
+    """
+
+    def __init__(self, store: ReferenceStore):
+        self._store = store
+
+    def _names(self, kind: int, town_code, default):
+        try:
+            town = int(town_code)
+        except (TypeError, ValueError):
+            return default
+        rows = self._store.query("SELECT names FROM villages WHERE town = ? AND kind = ?", (town, kind))
+        return rows[0][0].split("\n") if rows else default
+
+    def get(self, town_code, default=None) -> Optional[List[str]]:
+        return self._names(_RAW, town_code, default)
+
+    def estates(self, town_code) -> List[str]:
+        return self._names(_ESTATES, town_code, [])
+
+    def rural(self, town_code) -> List[str]:
+        return self._names(_RURAL, town_code, [])
+
+    def __contains__(self, town_code) -> bool:
+        return self.get(town_code) is not None
+
+    def restrict(self, prefixes) -> ScopedVillageStore:
+        return ScopedVillageStore(self, prefixes)
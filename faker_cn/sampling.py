@@ -0,0 +1,90 @@
+from typing import Any, Callable, Dict, Hashable, List, Sequence
+
+
+class AliasTable:
+    """
+    Vose alias table: O(n) to build, O(1) per draw from a fixed categorical distribution.
+
+    `sample(rng)` consumes exactly one `rng.random()` call, so any object exposing a
+    `random()` method (the `random` module, a `random.Random` instance) can drive it.
+    """
+    __slots__ = ("items", "weights", "_prob", "_alias", "_n")
+
+    def __init__(self, items: Sequence[Any], weights: Sequence[float]):
+        if len(items) != len(weights) or not items:
+            raise ValueError("AliasTable needs the same, non-zero number of items and weights")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("AliasTable weights must sum to a positive value")
+
+        n = len(items)
+        self.items = list(items)
+        self.weights = list(weights)
+        self._n = n
+        self._prob = [0.0] * n
+        self._alias = list(range(n))
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+        # Leftovers are 1.0 up to floating point error
+        for i in large + small:
+            self._prob[i] = 1.0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def sample(self, rng) -> Any:
+        u = rng.random() * self._n
+        i = int(u)
+        if i >= self._n:
+            i = self._n - 1
+        if u - i < self._prob[i]:
+            return self.items[i]
+        return self.items[self._alias[i]]
+
+    @classmethod
+    def from_pairs(cls, pairs: Sequence[tuple]) -> "AliasTable":
+        return cls([p[0] for p in pairs], [p[1] for p in pairs])
+
+    @classmethod
+    def from_dict(cls, weights: Dict[Any, float]) -> "AliasTable":
+        return cls(list(weights.keys()), list(weights.values()))
+
+
+class AliasCache:
+    """
+    Lazily built alias tables keyed by context (province, age band, ...).
+    `builder(key)` returns the (items, weights) pair for a key the first time it is seen.
+    """
+
+    def __init__(self, builder: Callable[[Hashable], tuple]):
+        self._builder = builder
+        self._tables: Dict[Hashable, AliasTable] = {}
+
+    def __getitem__(self, key: Hashable) -> AliasTable:
+        table = self._tables.get(key)
+        if table is None:
+            items, weights = self._builder(key)
+            table = self._tables[key] = AliasTable(items, weights)
+        return table
+
+    def sample(self, key: Hashable, rng) -> Any:
+        return self[key].sample(rng)
+
+
+def build_tables(spec: Dict[Hashable, List[tuple]]) -> Dict[Hashable, AliasTable]:
+    """
+    Compile a `{key: [(item, weight), ...]}` spec into `{key: AliasTable}`.
+    """
+    return {k: AliasTable.from_pairs(v) for k, v in spec.items()}
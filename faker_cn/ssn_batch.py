@@ -0,0 +1,110 @@
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .checksums import SSN_CHECK_CODES, SSN_WEIGHTS, numpy
+
+
+def available() -> bool:
+    return numpy() is not None
+
+
+def area_distribution(plan: Dict, hometown_city: Optional[str] = None,
+                      hometown_area: Optional[str] = None) -> Tuple[List[int], List[float]]:
+    """
+    Flatten strict_ssn()'s province -> city -> area draws into one distribution over
+    area codes: P(area) = P(province) / len(cities) / len(areas), with the same
+    constraint matching and fallbacks.
+    """
+    index = plan["index"]
+    if plan["prov_table"] is None:
+        provs = plan["prov_list"]
+        prov_p = [1.0 / len(provs)] * len(provs)
+    else:
+        provs = plan["prov_table"].items
+        total = float(sum(plan["prov_table"].weights))
+        prov_p = [w / total for w in plan["prov_table"].weights]
+
+    codes, probs = [], []
+    for prov, p in zip(provs, prov_p):
+        city_list = index.children(prov)
+        if hometown_city:
+            city_list = index.match_children(prov, hometown_city) or city_list
+        for city in city_list:
+            area_list = index.children(city)
+            if hometown_area:
+                area_list = index.match_children(city, hometown_area) or area_list
+            q = p / len(city_list) / len(area_list)
+            for area in area_list:
+                codes.append(int(area.get('code', '110101')))
+                probs.append(q)
+    return codes, probs
+
+
+def _day_ranges(age_buckets: Sequence[tuple]) -> List[Tuple[int, int]]:
+    # (first ordinal, number of days) per bucket, as in PersonaProvider._random_date_between
+    today = date.today()
+    ranges = []
+    for min_age, max_age in age_buckets:
+        start = today.replace(year=today.year - max_age)
+        end = today.replace(year=today.year - min_age)
+        ranges.append((start.toordinal(), (end - start).days + 1))
+    return ranges
+
+
+def generate(
+    seed: int,
+    n: int,
+    area_codes: Sequence[int],
+    area_probs: Sequence[float],
+    age_buckets: Sequence[tuple],
+    age_probs: Sequence[float],
+    male_prob: float,
+    birth_date: Optional[date] = None,
+):
+    """
+    `n` valid 18-digit ID numbers as a numpy array of str, every column drawn as a
+    vector: area code, birth date (bucket, then uniform day), sequence number and
+    gender digit, then the Mod 11-2 check character.
+    """
+    np = numpy()
+    rng = np.random.default_rng(seed)
+
+    area_p = np.asarray(area_probs, dtype=np.float64)
+    areas = np.asarray(area_codes, dtype=np.int64)[rng.choice(len(area_p), size=n, p=area_p / area_p.sum())]
+
+    if birth_date:
+        days = np.full(n, np.datetime64(birth_date, "D"))
+    else:
+        ranges = np.asarray(_day_ranges(age_buckets), dtype=np.int64)
+        age_p = np.asarray(age_probs, dtype=np.float64)
+        bucket = rng.choice(len(ranges), size=n, p=age_p / age_p.sum())
+        ordinals = ranges[bucket, 0] + rng.integers(0, ranges[bucket, 1])
+        # date.toordinal() of 1970-01-01 is 719163
+        days = (ordinals - 719163).astype("datetime64[D]")
+    months = days.astype("datetime64[M]")
+    years = months.astype("datetime64[Y]").astype(np.int64) + 1970
+    ymd = (years * 100 + months.astype(np.int64) % 12 + 1) * 100 + (days - months).astype(np.int64) + 1
+
+    seq = rng.integers(0, 100, size=n)
+    male = rng.random(n) < male_prob
+    gender_digit = 2 * rng.integers(0, 5, size=n) + male
+
+    ids = areas * 10 ** 11 + ymd * 1000 + seq * 10 + gender_digit
+    return encode(ids)
+
+
+def encode(ids17) -> "np.ndarray":
+    """
+    Append the Mod 11-2 check character to an int64 array of 17-digit bodies.
+    """
+    np = numpy()
+    n = len(ids17)
+    chars = np.empty((n, 18), dtype=np.uint8)
+    rest = np.asarray(ids17, dtype=np.int64).copy()
+    total = np.zeros(n, dtype=np.int64)
+    for pos in range(16, -1, -1):
+        rest, digit = np.divmod(rest, 10)
+        chars[:, pos] = digit + ord("0")
+        total += digit * SSN_WEIGHTS[pos]
+    chars[:, 17] = np.frombuffer(SSN_CHECK_CODES.encode("ascii"), dtype=np.uint8)[total % 11]
+    return chars.view("S18").ravel().astype("U18")
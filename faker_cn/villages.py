@@ -0,0 +1,233 @@
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+from .cache import atomic_write, cache_dir
+
+# On-disk layout (little endian):
+#   header        : magic b"FCNV", version u32, n_towns u32
+#   town codes    : n_towns x u64, sorted ascending
+#   then one section per entry of NAME_LISTS:
+#     n_names     : u32
+#     town starts : n_towns + 1 x u32, index of each town's first name
+#     name offsets: n_names + 1 x u32, byte offset of each name in the blob
+#     blob        : UTF-8 names, concatenated
+_MAGIC = b"FCNV"
+_VERSION = 2
+_HEADER = struct.Struct("<4sII")
+_COUNT = struct.Struct("<I")
+
+# Per town: the raw names, the urban estate names and the rural village names that
+# address generation draws from, cleaned once at compile time
+NAME_LISTS = ("villages", "estates", "rural")
+
+_ESTATE_SUFFIXES = ("居民委员会", "社区居委会", "居委会", "社区", "村民委员会", "村委会")
+_RURAL_SUFFIXES = ("村民委员会", "村委会", "居委会")
+
+
+def estate_names(villages: List[str]) -> List[str]:
+    """
+    Estate name stems of a town: its 社区/居委会 entries (all entries if it has none)
+    with the committee suffixes removed. Too-short stems are kept, so every entry
+    keeps its share of draws.
+    """
+    names = [v for v in villages if "社区" in v or "居委会" in v] or villages
+    for s in _ESTATE_SUFFIXES:
+        names = [name.replace(s, "") for name in names]
+    return names
+
+
+def rural_names(villages: List[str]) -> List[str]:
+    """
+    Village names of a town without the committee suffixes, ending in 村/庄/队.
+    """
+    names = villages
+    for s in _RURAL_SUFFIXES:
+        names = [name.replace(s, "") for name in names]
+    return [name + "村" if name and not name.endswith(("村", "庄", "队")) else name for name in names]
+
+
+def _section(names_per_town: List[List[str]]) -> List[bytes]:
+    town_starts = array("I", [0])
+    offsets = array("I", [0])
+    blob = bytearray()
+    for names in names_per_town:
+        for name in names:
+            blob += name.encode("utf-8")
+            offsets.append(len(blob))
+        town_starts.append(len(offsets) - 1)
+    if sys.byteorder == "big":
+        town_starts.byteswap()
+        offsets.byteswap()
+    return [_COUNT.pack(len(offsets) - 1), town_starts.tobytes(), offsets.tobytes(), bytes(blob)]
+
+
+def encode_villages(villages: Dict[str, List[str]]) -> bytes:
+    """
+    Serialize a `{town_code: [village, ...]}` mapping into the store format.
+    """
+    codes = sorted(villages, key=int)
+    town_codes = array("Q", (int(c) for c in codes))
+    if sys.byteorder == "big":
+        town_codes.byteswap()
+    raw = [villages[c] for c in codes]
+    parts = [_HEADER.pack(_MAGIC, _VERSION, len(codes)), town_codes.tobytes()]
+    for names_per_town in (raw, [estate_names(v) for v in raw], [rural_names(v) for v in raw]):
+        parts += _section(names_per_town)
+    return b"".join(parts)
+
+
+def _swapped(view: memoryview) -> array:
+    arr = array(view.format, view.tobytes())
+    arr.byteswap()
+    return arr
+
+
+class VillageStore:
+    """
+    Random-access, read-only view over the compiled village store.
+
+    Behaves like the `{town_code: [village, ...]}` dict it replaces for `get()`,
+    `in` and `len()`, but only decodes the villages of the town being looked up.
+    `estates()` and `rural()` return a town's precleaned names the same way.
+    """
+
+    def __init__(self, buf):
+        self._buf = buf
+        magic, version, n_towns = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a faker_cn village store (or an incompatible version)")
+        view = memoryview(buf)
+        pos = _HEADER.size
+        self._codes = view[pos:pos + 8 * n_towns].cast("Q")
+        pos += 8 * n_towns
+        # (town starts, name offsets, blob) per NAME_LISTS entry
+        self._lists = []
+        for _ in NAME_LISTS:
+            n_names, = _COUNT.unpack_from(buf, pos)
+            pos += _COUNT.size
+            starts = view[pos:pos + 4 * (n_towns + 1)].cast("I")
+            pos += 4 * (n_towns + 1)
+            offsets = view[pos:pos + 4 * (n_names + 1)].cast("I")
+            pos += 4 * (n_names + 1)
+            if sys.byteorder == "big":
+                # The format is little endian; big-endian hosts pay for a one-off copy
+                starts, offsets = _swapped(starts), _swapped(offsets)
+            blob = view[pos:pos + offsets[n_names]]
+            pos += offsets[n_names]
+            self._lists.append((starts, offsets, blob))
+        self._n_towns = n_towns
+        if sys.byteorder == "big":
+            self._codes = _swapped(self._codes)
+
+    @classmethod
+    def open(cls, path: str) -> "VillageStore":
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buf)
+
+    def _find(self, town_code) -> int:
+        try:
+            key = int(town_code)
+        except (TypeError, ValueError):
+            return -1
+        i = bisect_left(self._codes, key)
+        if i < self._n_towns and self._codes[i] == key:
+            return i
+        return -1
+
+    def _names(self, which: int, town_code, default):
+        i = self._find(town_code)
+        if i < 0:
+            return default
+        starts, offsets, blob = self._lists[which]
+        return [
+            str(blob[offsets[j]:offsets[j + 1]], "utf-8")
+            for j in range(starts[i], starts[i + 1])
+        ]
+
+    def get(self, town_code, default=None) -> Optional[List[str]]:
+        return self._names(0, town_code, default)
+
+    def estates(self, town_code) -> List[str]:
+        """
+        Estate name stems of a town (see estate_names), empty if unknown.
+        """
+        return self._names(1, town_code, [])
+
+    def rural(self, town_code) -> List[str]:
+        """
+        Cleaned village names of a town (see rural_names), empty if unknown.
+        """
+        return self._names(2, town_code, [])
+
+    def __contains__(self, town_code) -> bool:
+        return self._find(town_code) >= 0
+
+    def __len__(self) -> int:
+        return self._n_towns
+
+    def restrict(self, prefixes) -> "ScopedVillageStore":
+        """
+        View answering only for town codes starting with one of `prefixes`.
+        """
+        return ScopedVillageStore(self, prefixes)
+
+
+class ScopedVillageStore:
+    """
+    Province-restricted view over a VillageStore; out-of-scope towns look absent.
+    """
+
+    def __init__(self, store: VillageStore, prefixes):
+        self._store = store
+        self._prefixes = tuple(prefixes)
+
+    def get(self, town_code, default=None) -> Optional[List[str]]:
+        if not str(town_code).startswith(self._prefixes):
+            return default
+        return self._store.get(town_code, default)
+
+    def estates(self, town_code) -> List[str]:
+        if not str(town_code).startswith(self._prefixes):
+            return []
+        return self._store.estates(town_code)
+
+    def rural(self, town_code) -> List[str]:
+        if not str(town_code).startswith(self._prefixes):
+            return []
+        return self._store.rural(town_code)
+
+    def __contains__(self, town_code) -> bool:
+        return str(town_code).startswith(self._prefixes) and town_code in self._store
+
+
+def load_store(src_path: str) -> VillageStore:
+    """
+    Open the compiled store for `src_path` (villages.json.gz), compiling it into the
+    user cache directory on first use. Falls back to an in-memory store when the
+    cache directory is not writable.
+    """
+    with open(src_path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:16]
+    store_path = os.path.join(cache_dir(), f"villages-v{_VERSION}-{digest}.bin")
+    if os.path.exists(store_path):
+        try:
+            return VillageStore.open(store_path)
+        except (OSError, ValueError):
+            pass
+
+    with gzip.open(src_path, "rt", encoding="utf-8") as f:
+        data = encode_villages(json.load(f))
+    try:
+        atomic_write(store_path, data)
+        return VillageStore.open(store_path)
+    except OSError:
+        return VillageStore(data)
@@ -28,4 +28,8 @@ setup(
     install_requires=[
         "Faker>=30.0.0",
     ],
+    extras_require={
+        # Vectorized strict_ssn_batch()
+        "fast": ["numpy"],
+    },
 )